@@ -0,0 +1,131 @@
+"""
+All-pairs shortest paths for Graph.
+
+Two engines, picked automatically by edge density:
+    - Floyd-Warshall on a dense |V| x |V| weight matrix, O(|V|^3). With NumPy it is cache-blocked and vectorized:
+      pivots are processed a block at a time, first updating the pivot block's row and column panels, then every
+      other row block against the finished panels while that row block stays in cache.
+    - Johnson's algorithm for sparse graphs, O(|V||E| log |V|): one SPFA run from a virtual source gives potentials
+      h(v) that reweight every edge to w(u,v) + h(u) - h(v) >= 0, so negative edges are fine and Dijkstra's can then be
+      run from every source over the CompactGraph arrays.
+Both return (vertices, D) where D[i][j] is the shortest distance from vertices[i] to vertices[j] (inf if unreachable).
+D is a NumPy array if NumPy is installed, o/w a list of lists.
+
+@author: Bill Wu
+"""
+
+from CompactGraph import csrDijkstra
+from Graph import Graph, Vertex
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, the pure Python paths below are used without it
+    np = None
+
+INF = float('inf')
+
+class NegativeCycleException(Exception):
+    def __init__(self, cycle=None):
+        super().__init__("Graph contains a negative cycle" + ("" if cycle is None else ": %r" % (cycle,)))
+        self.cycle = cycle
+
+def weightMatrix(G: Graph) -> tuple:
+    """
+    Converts G into a dense weight matrix, W[i][j] = w(vertices[i], vertices[j]), 0 on the diagonal (or a negative
+    self loop's weight), and inf where there is no edge.
+    @return: (list of vertices in row/column order, W as a NumPy array or list of lists)
+    """
+    C = G.freeze()
+    n = C.numVertices()
+    W = [[INF] * n for _ in range(n)]
+    for u in range(n):
+        row = W[u]
+        row[u] = 0
+        for e in range(C.offsets[u], C.offsets[u + 1]):
+            v = C.targets[e]
+            row[v] = min(row[v], C.weights[e])
+    return C.getVertices(), W if np is None else np.array(W, dtype=float).reshape(n, n)
+
+def floydWarshall(G: Graph, blockSize: int = 64) -> tuple:
+    """
+    Floyd-Warshall all-pairs shortest paths, allows negative edge weights.
+    @param blockSize: pivot block size for the NumPy engine, ~64 keeps a row block of a few thousand columns in cache
+    @return: (vertices, D), see module docstring
+    @raises NegativeCycleException if the graph has a negative cycle
+    """
+    vertices, D = weightMatrix(G)
+    n = len(vertices)
+    if np is not None:
+        for start in range(0, n, blockSize):
+            pivots = range(start, min(start + blockSize, n))
+            block = slice(start, pivots.stop)
+            # Phases 1 + 2: pivots of this block only ever read cells in their own row/column panel, so the panels
+            # can be brought up to date on their own, exactly as full Floyd-Warshall would leave them
+            for k in pivots:
+                np.minimum(D[block, :], D[block, k, None] + D[None, k, :], out=D[block, :])
+                np.minimum(D[:, block], D[:, k, None] + D[None, k, block], out=D[:, block])
+            # Phase 3: relax every row block through all pivots of this block using the finished panels
+            rowPanel = D[block, :].copy()
+            for rowStart in range(0, n, blockSize):
+                rows = slice(rowStart, min(rowStart + blockSize, n))
+                sub = D[rows, :]
+                for i, k in enumerate(pivots):
+                    np.minimum(sub, D[rows, k, None] + rowPanel[None, i, :], out=sub)
+        if n and D.diagonal().min() < 0:
+            raise NegativeCycleException()
+        return vertices, D
+
+    for k in range(n):
+        Dk = D[k]
+        for i in range(n):
+            Dik = D[i][k]
+            if Dik == INF:
+                continue
+            Di = D[i]
+            D[i] = [dij if dij <= Dik + dkj else Dik + dkj for dij, dkj in zip(Di, Dk)]
+    if any(D[i][i] < 0 for i in range(n)):
+        raise NegativeCycleException()
+    return vertices, D
+
+def johnson(G: Graph) -> tuple:
+    """
+    Johnson's all-pairs shortest paths, allows negative edge weights.
+    @return: (vertices, D), see module docstring
+    @raises NegativeCycleException (with the cycle attached) if the graph has a negative cycle
+    """
+    C = G.freeze()
+    vertices, n = C.getVertices(), C.numVertices()
+    h = [0] * n
+    if C.hasNegativeWeights:
+        # Virtual source with a 0 weight edge to every vertex; its shortest distances are valid potentials
+        virtual = Vertex(object())
+        H = Graph(G.getVertices(), {u: dict(children) for u, children in G.getEdges().items()})
+        H.addEdges((virtual, v, 0) for v in vertices)
+        cycle, d, _ = H.spfa_SSSP(virtual)
+        if cycle is not None:
+            raise NegativeCycleException(cycle)
+        h = [d[v] for v in vertices]
+
+    reweighted = [C.weights[e] + h[u] - h[C.targets[e]]
+                  for u in range(n) for e in range(C.offsets[u], C.offsets[u + 1])]
+    D = []
+    for s in range(n):
+        ds, _ = csrDijkstra(C.offsets, C.targets, reweighted, s)
+        D.append([dv - h[s] + h[v] if dv < INF else INF for v, dv in enumerate(ds)])
+    return vertices, D if np is None else np.array(D, dtype=float).reshape(n, n)
+
+def allPairsShortestPaths(G: Graph, densityThreshold: float = 0.1) -> tuple:
+    """
+    Picks Floyd-Warshall for dense graphs (|E| / |V|^2 > densityThreshold) and Johnson's for sparse ones.
+    @return: (vertices, D), see module docstring
+    @raises NegativeCycleException if the graph has a negative cycle
+    """
+    numVertices = len(G.getVertices().union(G.getEdges()))
+    numEdges = sum(len(children) for children in G.getEdges().values())
+    if numVertices and numEdges / numVertices ** 2 > densityThreshold:
+        return floydWarshall(G)
+    return johnson(G)
+
+def toDict(vertices: list, D) -> dict:
+    """@return: {u: {v: d(u, v), ...}, ...} from an all-pairs (vertices, D) result"""
+    return {u: {v: float(D[i][j]) for j, v in enumerate(vertices)} for i, u in enumerate(vertices)}
@@ -1,11 +1,12 @@
 import Graph
+from collections import deque
 
 def bfs(graph, start, target):
     # Given a graph/adjacency matrix/adjacency set, (in 6.006 ex create dict of paths to all V) find SP to target
-    queue, visited, parents = [start], {start}, {start: start}
+    queue, visited, parents = deque([start]), {start}, {start: start}
     while queue:  # While there are still items in the queue (FIFO)
         # Pop off first node in the current queue; once all nodes in curr lvl set popped, next lvl set will be formed
-        node = queue.pop(0)
+        node = queue.popleft()
         if node == target:  # Short circuit if found the target node
             break
 
@@ -0,0 +1,225 @@
+"""
+Compact, immutable snapshot of a Graph in compressed sparse row (CSR) form.
+
+Every Vertex is interned to a dense integer id in [0, |V|), and the adjacency set is flattened into three arrays:
+    offsets: length |V| + 1, the out-edges of vertex id u live in the slice [offsets[u], offsets[u + 1])
+    targets: length |E|, target vertex id of each edge
+    weights: length |E|, weight of each edge
+so the traversal/SSSP inner loops only touch machine integers in contiguous buffers rather than hashing Vertex objects
+and walking nested dicts. Inputs and outputs of the public methods still use Vertex, matching Graph's interface.
+
+@author: Bill Wu
+"""
+
+import heapq
+from array import array
+from collections import deque
+from Graph import Vertex
+
+class CompactGraph:
+    def __init__(self, vertices: list, offsets: array, targets: array, weights: array):
+        # Maps id -> Vertex, and the inverse Vertex -> id
+        self.vertices = vertices
+        self.ids = {v: i for i, v in enumerate(vertices)}
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.hasNegativeWeights = any(w < 0 for w in weights)
+
+    @staticmethod
+    def fromGraph(G) -> "CompactGraph":
+        """
+        Builds a CSR snapshot of a Graph. Vertices that only appear as edge endpoints are interned as well.
+        Integral weights are stored as signed 64 bit ints, and everything else as doubles.
+        @param G: input Graph, not mutated
+        @return: CompactGraph with the same vertices, edges and weights as G
+        """
+        vertices = list(G.vertices)
+        ids = {v: i for i, v in enumerate(vertices)}
+        for u, children in G.edges.items():
+            for v in (u, *children):
+                if v not in ids:
+                    ids[v] = len(vertices)
+                    vertices.append(v)
+
+        allIntegral = all(isinstance(w, int) for children in G.edges.values() for w in children.values())
+        offsets, targets, weights = array('q', [0]), array('q'), array('q' if allIntegral else 'd')
+        for u in vertices:
+            children = G.edges.get(u, {})
+            targets.extend(ids[v] for v in children)
+            weights.extend(children.values())
+            offsets.append(len(targets))
+        return CompactGraph(vertices, offsets, targets, weights)
+
+    def numVertices(self) -> int:
+        return len(self.vertices)
+
+    def numEdges(self) -> int:
+        return len(self.targets)
+
+    def getId(self, v: Vertex) -> int:
+        if v not in self.ids:
+            raise ValueError("Vertex not present in graph: %r" % v)
+        return self.ids[v]
+
+    def getVertex(self, i: int) -> Vertex:
+        return self.vertices[i]
+
+    def getVertices(self):
+        return self.vertices
+
+    def getChildren(self, u: Vertex):
+        targets, vertices = self.targets, self.vertices
+        i = self.getId(u)
+        return (vertices[targets[e]] for e in range(self.offsets[i], self.offsets[i + 1]))
+
+    def getWeight(self, u: Vertex, v: Vertex):
+        i, j = self.getId(u), self.getId(v)
+        for e in range(self.offsets[i], self.offsets[i + 1]):
+            if self.targets[e] == j:
+                return self.weights[e]
+        raise ValueError("Edge not present in graph: %r, %r" % (u, v))
+
+    def __contains__(self, item):
+        return item in self.ids
+
+    def _pathTo(self, parents, start: int, target: int):
+        """Follows parent ids from target back to start, and returns the path start ~~> target as Vertices"""
+        if parents[target] == -1:
+            return None
+        i, path = target, [self.vertices[target]]
+        while i != start:  # Potentially O(V) loop here
+            i = parents[i]
+            path.append(self.vertices[i])
+        return path[::-1]
+
+    def _vertexMappings(self, d: list, parents: array) -> tuple:
+        """Translates id-indexed distance and parent arrays back into the Vertex-keyed dicts that Graph returns"""
+        vertices = self.vertices
+        dist = {vertices[i]: d[i] for i in range(len(vertices))}
+        parentMap = {vertices[i]: vertices[p] for i, p in enumerate(parents) if p != -1}
+        return dist, parentMap
+
+    def bfs(self, start: Vertex, target: Vertex):
+        """Same contract as Graph.bfs: returns a shortest-length path from start to target, or None if unreachable"""
+        offsets, targets = self.offsets, self.targets
+        s, t = self.getId(start), self.getId(target)
+        parents = array('q', [-1]) * len(self.vertices)
+        parents[s] = s
+        queue = deque([s])
+        while queue:
+            u = queue.popleft()
+            if u == t:
+                break
+            for e in range(offsets[u], offsets[u + 1]):
+                v = targets[e]
+                if parents[v] == -1:
+                    parents[v] = u
+                    queue.append(v)
+        return self._pathTo(parents, s, t)
+
+    def dfs(self, start: Vertex, target: Vertex):
+        """Same contract as Graph.dfs: returns *a* path from start to target, or None if unreachable"""
+        offsets, targets = self.offsets, self.targets
+        s, t = self.getId(start), self.getId(target)
+        parents = array('q', [-1]) * len(self.vertices)
+        visited = bytearray(len(self.vertices))
+        parents[s] = s
+        stack = [s]
+        while stack:
+            u = stack.pop()
+            visited[u] = 1
+            if u == t:
+                break
+            for e in range(offsets[u], offsets[u + 1]):
+                v = targets[e]
+                if not visited[v]:
+                    parents[v] = u
+                    stack.append(v)
+        return self._pathTo(parents, s, t)
+
+    def dijkstra_SSSP(self, source: Vertex) -> tuple:
+        """
+        Dijkstra's algorithm over the CSR arrays. Every edge weight must be non-negative, which is checked once when
+        the snapshot is built rather than on every call.
+        @param source: source node
+        @return: 1. mapping of the shortest distances between source and every vertex (inf if unreachable)
+                 2. mapping of every reached node to its parent in its shortest path (source maps to itself)
+        """
+        if self.hasNegativeWeights:
+            raise ValueError("Dijkstra's algorithm requires non-negative edge weights")
+        d, parents = csrDijkstra(self.offsets, self.targets, self.weights, self.getId(source))
+        return self._vertexMappings(d, parents)
+
+    def bellmanFord_SSSP(self, source: Vertex) -> tuple:
+        """
+        Bellman-Ford over the CSR arrays, with the same return format as Graph.bellmanFord_SSSP.
+        Stops early once a full pass relaxes nothing.
+        @param source: input source node
+        @return: 1. A negative cycle if it exists, as a list of vertices. None o/w
+                 2. Mapping of the shortest distances between source and every vertex. None if negative cycle exists.
+                 3. Mapping of predecessors, None if negative cycle exists
+        """
+        offsets, targets, weights = self.offsets, self.targets, self.weights
+        n = len(self.vertices)
+        s = self.getId(source)
+        d = [float('inf')] * n
+        parents = array('q', [-1]) * n
+        d[s], parents[s] = 0, s
+
+        for _ in range(n):
+            changed = False
+            for u in range(n):
+                du = d[u]
+                if du == float('inf'):
+                    continue
+                for e in range(offsets[u], offsets[u + 1]):
+                    v = targets[e]
+                    if d[v] > du + weights[e]:
+                        d[v], parents[v] = du + weights[e], u
+                        changed = True
+            if not changed:
+                return None, *self._vertexMappings(d, parents)
+
+        for u in range(n):
+            for e in range(offsets[u], offsets[u + 1]):
+                v = targets[e]
+                if d[v] > d[u] + weights[e]:
+                    return self._getCycle(v, parents), None, None
+        return None, *self._vertexMappings(d, parents)
+
+    def _getCycle(self, v: int, parents: array) -> list:
+        """Id-based equivalent of Graph.getCycle, returns the negative cycle as a list of Vertices"""
+        seen, cycle = set(), []
+        nextNode = v
+        while nextNode not in seen:
+            seen.add(nextNode)
+            cycle.append(nextNode)
+            nextNode = parents[nextNode]
+        cycle.append(nextNode)
+        del cycle[:cycle.index(nextNode)]
+        return [self.vertices[i] for i in reversed(cycle)]
+
+def csrDijkstra(offsets, targets, weights, s: int) -> tuple:
+    """
+    Dijkstra's algorithm on raw CSR buffers (arrays, or memoryviews eg over shared memory), by vertex id.
+    Weights must be non-negative.
+    @param s: source vertex id
+    @return: 1. list of shortest distances from s, indexed by vertex id (inf if unreachable)
+             2. array of parent ids in the shortest path tree (-1 if unreachable, s for s itself)
+    """
+    n = len(offsets) - 1
+    d = [float('inf')] * n
+    parents = array('q', [-1]) * n
+    d[s], parents[s] = 0, s
+    priority_queue = [(0, s)]
+    while priority_queue:
+        curr_d, u = heapq.heappop(priority_queue)
+        if curr_d > d[u]:
+            continue
+        for e in range(offsets[u], offsets[u + 1]):
+            v, nd = targets[e], curr_d + weights[e]
+            if nd < d[v]:
+                d[v], parents[v] = nd, u
+                heapq.heappush(priority_queue, (nd, v))
+    return d, parents
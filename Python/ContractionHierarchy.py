@@ -0,0 +1,210 @@
+"""
+Contraction hierarchies (Geisberger et al.) for fast point-to-point shortest paths on static Graphs with non-negative
+edge weights, eg road networks.
+
+Preprocessing contracts vertices one at a time in order of "importance": removing v from the remaining graph, and
+for every pair of remaining neighbors u -> v -> w adding a shortcut edge u -> w of weight w(u,v) + w(v,w), unless a
+witness path u ~~> w avoiding v is at least as short. The contraction order gives every vertex a rank, and every
+shortest path then has an equivalent up-down path that only climbs in rank and then only descends. So a query is a
+bidirectional Dijkstra where the forward search only follows edges to higher ranked vertices and the backward search
+only follows in-edges from higher ranked vertices, which settles a tiny fraction of the graph. Shortcuts remember the
+vertex they bypassed, so the answer is unpacked back into a path of original edges.
+Internally vertices are interned to dense integer ids, like CompactGraph, so the searches don't hash Vertex objects.
+
+@author: Bill Wu
+"""
+
+import heapq
+from Graph import Graph, Vertex
+
+INF = float('inf')
+
+class ContractionHierarchy:
+    def __init__(self, vertices: list, rank: list, upward: list, downward: list, middle: dict):
+        # Maps id -> Vertex, and the inverse Vertex -> id
+        self.vertices = vertices
+        self.ids = {v: i for i, v in enumerate(vertices)}
+        self.rank = rank  # id -> contraction order, higher means contracted later (more "important")
+        # upward[u] = {w: weight, ...} for edges (u, w) with rank[u] < rank[w]; searched by the forward query
+        self.upward = upward
+        # downward[w] = {u: weight, ...} for edges (u, w) with rank[u] > rank[w]; searched by the backward query
+        self.downward = downward
+        self.middle = middle  # Shortcut edge (u, w) -> the contracted vertex v it bypasses, ie u -> v -> w
+
+    @staticmethod
+    def build(G: Graph, witnessSettleLimit: int = 64) -> "ContractionHierarchy":
+        """
+        Contracts every vertex of G, choosing the next vertex by the priority
+            edge difference (shortcuts added - edges removed) + number of already contracted neighbors
+        which keeps the number of shortcuts low and spreads contraction evenly across the graph. Only the neighbors of a
+        contracted vertex get their priorities recomputed.
+        @param G: input graph, must have non-negative edge weights. Not mutated
+        @param witnessSettleLimit: max vertices each witness search may settle. Hitting it only adds a possibly
+            unnecessary shortcut, so it trades preprocessing time for query time but never correctness
+        @return: ContractionHierarchy over G
+        """
+        G.verifyNonNegativeWeights()
+        vertices = list(G.vertices)
+        ids = {v: i for i, v in enumerate(vertices)}
+        for u, children in G.edges.items():
+            for v in (u, *children):
+                if v not in ids:
+                    ids[v] = len(vertices)
+                    vertices.append(v)
+        n = len(vertices)
+        # Remaining (uncontracted) graph, as out-edges and in-edges. Self loops are never on a shortest path
+        out, inc = [{} for _ in range(n)], [{} for _ in range(n)]
+        for u, children in G.edges.items():
+            for v, w in children.items():
+                if u != v:
+                    out[ids[u]][ids[v]] = w
+                    inc[ids[v]][ids[u]] = w
+
+        rank, upward, downward, middle = [-1] * n, [None] * n, [None] * n, {}
+        contractedNeighbors = [0] * n
+
+        def witnessDistances(u, v, maxDist, targets):
+            """
+            Dijkstra from u in the remaining graph without v, stopping once every target is settled, or past maxDist,
+            or at the settle limit
+            """
+            d = {u: 0}
+            priority_queue = [(0, u)]
+            settledCount, targetsLeft = 0, len(targets)
+            while priority_queue and settledCount < witnessSettleLimit and targetsLeft:
+                curr_d, x = heapq.heappop(priority_queue)
+                if curr_d > d[x]:
+                    continue
+                if curr_d > maxDist:
+                    break
+                settledCount += 1
+                if x in targets:
+                    targetsLeft -= 1
+                for y, w in out[x].items():
+                    if y != v and curr_d + w < d.get(y, INF):
+                        d[y] = curr_d + w
+                        heapq.heappush(priority_queue, (curr_d + w, y))
+            return d
+
+        def shortcutsFor(v):
+            """@return: list of (u, w, weight) shortcuts needed if v were contracted now"""
+            shortcuts = []
+            if not out[v]:
+                return shortcuts
+            maxOut = max(out[v].values())
+            for u, wuv in inc[v].items():
+                d = witnessDistances(u, v, wuv + maxOut, out[v])
+                for w, wvw in out[v].items():
+                    if w != u and d.get(w, INF) > wuv + wvw:
+                        shortcuts.append((u, w, wuv + wvw))
+            return shortcuts
+
+        def priority(v):
+            return len(shortcutsFor(v)) - len(out[v]) - len(inc[v]) + contractedNeighbors[v]
+
+        currentPriority = [priority(v) for v in range(n)]
+        priority_queue = [(p, v) for v, p in enumerate(currentPriority)]
+        heapq.heapify(priority_queue)
+        numContracted = 0
+        while priority_queue:
+            p, v = heapq.heappop(priority_queue)
+            if rank[v] != -1 or p != currentPriority[v]:
+                continue  # Stale entry, v was already contracted or its priority has since changed
+
+            for u, w, weight in shortcutsFor(v):
+                if weight < out[u].get(w, INF):
+                    out[u][w] = weight
+                    inc[w][u] = weight
+                    middle[(u, w)] = v
+            # Every remaining neighbor is contracted after v, so v's remaining edges all lead up in rank
+            rank[v] = numContracted
+            numContracted += 1
+            upward[v], downward[v] = out[v], inc[v]
+            out[v], inc[v] = {}, {}
+            for w in upward[v]:
+                del inc[w][v]
+                contractedNeighbors[w] += 1
+            for u in downward[v]:
+                del out[u][v]
+                contractedNeighbors[u] += 1
+            # Only v's neighbors' priorities can change from contracting v, so just update those
+            for x in set(upward[v]).union(downward[v]):
+                currentPriority[x] = priority(x)
+                heapq.heappush(priority_queue, (currentPriority[x], x))
+
+        return ContractionHierarchy(vertices, rank, upward, downward, middle)
+
+    def numShortcuts(self) -> int:
+        return len(self.middle)
+
+    def getRank(self, v: Vertex) -> int:
+        if v not in self.ids:
+            raise ValueError("Vertex not present in graph: %r" % v)
+        return self.rank[self.ids[v]]
+
+    def query(self, source: Vertex, target: Vertex) -> tuple:
+        """
+        Bidirectional upward Dijkstra from source and target. Unlike plain bidirectional Dijkstra, the searches can't
+        stop at the first meeting vertex, only once both heap minimums are >= the best path length found so far.
+        @param source: source node
+        @param target: target node
+        @return: 1. shortest distance from source to target, inf if target is unreachable
+                 2. list of vertices on a shortest path from source to target (shortcuts unpacked), None if unreachable
+        """
+        for v in (source, target):
+            if v not in self.ids:
+                raise ValueError("Vertex not present in graph: %r" % v)
+        s, t = self.ids[source], self.ids[target]
+        if s == t:
+            return 0, [source]
+
+        adjacency = (self.upward, self.downward)
+        dist = ({s: 0}, {t: 0})
+        parents = ({s: s}, {t: t})
+        heaps = ([(0, s)], [(0, t)])
+        best, meet = INF, None
+
+        while True:
+            candidates = [side for side in (0, 1) if heaps[side] and heaps[side][0][0] < best]
+            if not candidates:
+                break
+            side = min(candidates, key=lambda i: heaps[i][0][0])
+            curr_d, u = heapq.heappop(heaps[side])
+            if curr_d > dist[side][u]:
+                continue  # Stale heap entry
+            if u in dist[1 - side] and curr_d + dist[1 - side][u] < best:
+                best, meet = curr_d + dist[1 - side][u], u
+            for v, w in adjacency[side][u].items():
+                if curr_d + w < dist[side].get(v, INF):
+                    dist[side][v] = curr_d + w
+                    parents[side][v] = u
+                    heapq.heappush(heaps[side], (curr_d + w, v))
+
+        if meet is None:
+            return INF, None
+        # Up-down path through the hierarchy: source ~~> meet (forward parents), then meet ~~> target (backward parents)
+        i, hierarchyPath = meet, [meet]
+        while i != s:
+            i = parents[0][i]
+            hierarchyPath.append(i)
+        hierarchyPath.reverse()
+        i = meet
+        while i != t:
+            i = parents[1][i]
+            hierarchyPath.append(i)
+        return best, [self.vertices[i] for i in self.unpackPath(hierarchyPath)]
+
+    def unpackPath(self, path: list) -> list:
+        """Recursively replaces every shortcut edge on a path of vertex ids with the two edges it bypasses"""
+        result = [path[0]]
+        for i in range(len(path) - 1):
+            stack = [(path[i], path[i + 1])]  # Explicit stack, since shortcut nesting can be deep
+            while stack:
+                u, w = stack.pop()
+                if (u, w) in self.middle:
+                    v = self.middle[(u, w)]
+                    stack.append((v, w))
+                    stack.append((u, v))
+                else:
+                    result.append(w)
+        return result
@@ -0,0 +1,220 @@
+"""
+Streaming ingestion of edge-list files, eg multi-GB edge dumps, into a Graph or straight into a CompactGraph.
+
+Input is one edge per line, "u v" or "u v w", separated by commas (CSV), tabs (TSV) or runs of whitespace, optionally
+gzip compressed (detected from the file's magic bytes, not its name). Blank lines and lines starting with the comment
+prefix are skipped. Vertex values that look like integers are parsed as ints and everything else is kept as a str;
+weights are parsed as ints, then floats, and default to 0 (like Graph.addEdge) when missing.
+
+The file is read lazily in chunks of chunkSize edges, so apart from the graph being built only one chunk of parsed
+edges is held in memory at a time. Each raw value is wrapped into a Vertex once and that object is reused for every
+later edge. For the largest inputs, CompactGraphBuilder skips the per-edge dicts of Graph entirely and keeps three
+flat arrays (~24 bytes per edge) until build() lays them out in CSR form.
+
+@author: Bill Wu
+"""
+
+import gzip
+import time
+from array import array
+from io import TextIOWrapper
+from CompactGraph import CompactGraph
+from Graph import Graph, Vertex
+
+DELIMITERS = {"csv": ",", "tsv": "\t", "whitespace": None}
+
+class EdgeListFormatException(Exception):
+    def __init__(self, path, lineNumber, line):
+        super().__init__("%s, line %d: expected 'u v' or 'u v w', got %r" % (path, lineNumber, line))
+
+class IngestStats:
+    """Running totals for an ingestion, passed to the progress callback after every chunk and at the end"""
+    def __init__(self):
+        self.lines = 0
+        self.edges = 0
+        self.bytesRead = 0  # Of the file on disk, ie compressed bytes for gzip input
+        self.start = time.perf_counter()
+        self.seconds = 0.0
+
+    def edgesPerSecond(self) -> float:
+        return self.edges / self.seconds if self.seconds else 0.0
+
+    def megabytesPerSecond(self) -> float:
+        return self.bytesRead / 1e6 / self.seconds if self.seconds else 0.0
+
+    def __str__(self):
+        return "%d edges (%d lines, %.1f MB) in %.2fs: %.0f edges/s, %.1f MB/s" % (
+            self.edges, self.lines, self.bytesRead / 1e6, self.seconds, self.edgesPerSecond(),
+            self.megabytesPerSecond())
+
+def _parseVertex(token: str):
+    try:
+        return int(token)
+    except ValueError:
+        return token
+
+def _parseWeight(token: str):
+    try:
+        return int(token)
+    except ValueError:
+        return float(token)
+
+def readEdgeChunks(path: str, delimiter: str = "whitespace", chunkSize: int = 65536, comment: str = "#",
+                   skipHeader: bool = False, stats: IngestStats = None, progress=None):
+    """
+    Lazily parses an edge-list file into chunks of edges.
+    @param path: edge-list file, plain text or gzip compressed (UTF-8)
+    @param delimiter: "csv", "tsv", "whitespace", or any other literal separator string
+    @param chunkSize: max edges per yielded chunk, bounds the memory held by the reader
+    @param comment: lines starting with this prefix are skipped
+    @param skipHeader: skip the first non-comment line, eg a CSV header row
+    @param stats: IngestStats to accumulate into, a new one by default
+    @param progress: optional callback(stats) invoked after every chunk and once at the end
+    @return: generator of lists of (u, v, w) tuples over raw (unwrapped) vertex values
+    @raises EdgeListFormatException on a line without 2 or 3 fields, or an unparseable weight
+    """
+    separator = DELIMITERS.get(delimiter, delimiter)
+    stats = IngestStats() if stats is None else stats
+    with open(path, "rb") as raw:
+        compressed = raw.read(2) == b"\x1f\x8b"
+        raw.seek(0)
+        with TextIOWrapper(gzip.GzipFile(fileobj=raw) if compressed else raw, encoding="utf-8") as lines:
+            chunk, lineNumber, headerPending = [], 0, skipHeader
+            for lineNumber, line in enumerate(lines, 1):
+                line = line.strip()
+                if not line or (comment and line.startswith(comment)):
+                    continue
+                if headerPending:
+                    headerPending = False
+                    continue
+                fields = line.split(separator)
+                try:
+                    if len(fields) == 2:
+                        chunk.append((_parseVertex(fields[0].strip()), _parseVertex(fields[1].strip()), 0))
+                    elif len(fields) == 3:
+                        chunk.append((_parseVertex(fields[0].strip()), _parseVertex(fields[1].strip()),
+                                      _parseWeight(fields[2].strip())))
+                    else:
+                        raise ValueError
+                except ValueError:
+                    raise EdgeListFormatException(path, lineNumber, line) from None
+                if len(chunk) >= chunkSize:
+                    stats.lines, stats.edges = lineNumber, stats.edges + len(chunk)
+                    stats.bytesRead, stats.seconds = raw.tell(), time.perf_counter() - stats.start
+                    yield chunk
+                    if progress is not None:
+                        progress(stats)
+                    chunk = []
+            stats.lines, stats.edges = lineNumber, stats.edges + len(chunk)
+            stats.bytesRead, stats.seconds = raw.tell(), time.perf_counter() - stats.start
+            if chunk:
+                yield chunk
+            if progress is not None:
+                progress(stats)
+
+class _Interner:
+    """Maps raw values to a single shared Vertex each, across every chunk of an ingestion"""
+    def __init__(self):
+        self.wrapped = {}
+
+    def __call__(self, x) -> Vertex:
+        v = self.wrapped.get(x)
+        if v is None:
+            v = self.wrapped[x] = Vertex(x)
+        return v
+
+def loadGraph(path: str, G: Graph = None, **kwargs) -> Graph:
+    """
+    Streams an edge-list file into a Graph, chunk by chunk via Graph.addEdges.
+    @param G: Graph to add the edges to (mutated), a new Graph by default
+    @param kwargs: any readEdgeChunks option (delimiter, chunkSize, comment, skipHeader, stats, progress)
+    @return: G
+    """
+    G = Graph() if G is None else G
+    intern = _Interner()
+    for chunk in readEdgeChunks(path, **kwargs):
+        G.addEdges((intern(u), intern(v), w) for u, v, w in chunk)
+    return G
+
+class CompactGraphBuilder:
+    """
+    Accumulates edges into flat arrays and lays them out as a CompactGraph in O(|V| + |E|), without ever building a
+    Graph. As with Graph.addEdge, a repeated edge (u, v) keeps its last weight.
+    """
+    def __init__(self):
+        self.vertices = []
+        self.ids = {}  # Raw vertex value -> id
+        self.sources, self.targets = array('q'), array('q')
+        self.weights = array('q')
+
+    def _getId(self, x) -> int:
+        key = x.val if isinstance(x, Vertex) else x  # So that x and Vertex(x) get the same id
+        i = self.ids.get(key)
+        if i is None:
+            i = self.ids[key] = len(self.vertices)
+            self.vertices.append(x if isinstance(x, Vertex) else Vertex(x))
+        return i
+
+    def addVertex(self, x):
+        self._getId(x)
+
+    def addEdges(self, edges):
+        """@param edges: iterable of (u, v) or (u, v, w) tuples of Vertices or raw values, see Graph.addEdges"""
+        getId, sources, targets = self._getId, self.sources, self.targets
+        for edge in edges:
+            w = edge[2] if len(edge) > 2 else 0
+            if self.weights.typecode == 'q' and not isinstance(w, int):
+                self.weights = array('d', self.weights)  # Switch to doubles once, on the first non-integral weight
+            sources.append(getId(edge[0]))
+            targets.append(getId(edge[1]))
+            self.weights.append(w)
+
+    def build(self) -> CompactGraph:
+        """
+        Counting sort of the edges by source id into CSR order, then removal of repeated edges.
+        The builder can be discarded afterwards, its edge arrays are not shared with the result.
+        """
+        n, sources = len(self.vertices), self.sources
+        counts = array('q', [0]) * (n + 1)
+        for u in sources:
+            counts[u + 1] += 1
+        for u in range(n):
+            counts[u + 1] += counts[u]
+        offsets, position = array('q', counts), counts
+        order = array('q', [0]) * len(sources)
+        for e, u in enumerate(sources):
+            order[position[u]] = e
+            position[u] += 1
+
+        targets, weights = array('q'), array(self.weights.typecode)
+        csrOffsets = array('q', [0])
+        for u in range(n):
+            children = {}  # First occurrence keeps its position, last occurrence its weight, like Graph's dicts
+            for k in range(offsets[u], offsets[u + 1]):
+                e = order[k]
+                children[self.targets[e]] = self.weights[e]
+            targets.extend(children)
+            weights.extend(children.values())
+            csrOffsets.append(len(targets))
+        return CompactGraph(list(self.vertices), csrOffsets, targets, weights)
+
+def loadCompactGraph(path: str, **kwargs) -> CompactGraph:
+    """
+    Streams an edge-list file through a CompactGraphBuilder, for inputs too big to hold as a Graph.
+    @param kwargs: any readEdgeChunks option (delimiter, chunkSize, comment, skipHeader, stats, progress)
+    @return: CompactGraph of the file's edges
+    """
+    builder = CompactGraphBuilder()
+    for chunk in readEdgeChunks(path, **kwargs):
+        builder.addEdges(chunk)
+    return builder.build()
+
+
+if __name__ == "__main__":
+    import sys
+    if len(sys.argv) < 2:
+        print("Usage: python EdgeListReader.py <edge list file> [csv|tsv|whitespace]")
+        sys.exit(1)
+    C = loadCompactGraph(sys.argv[1], delimiter=sys.argv[2] if len(sys.argv) > 2 else "whitespace",
+                         progress=lambda stats: print(stats))
+    print("Loaded %d vertices, %d edges" % (C.numVertices(), C.numEdges()))
@@ -0,0 +1,120 @@
+"""
+Paired-arc residual network over flat arrays, the internal representation of a FlowNetwork.
+
+Every capacity edge i becomes two arcs: arc 2i = (u, v) and arc 2i + 1 = (v, u), so an arc's partner is always e ^ 1
+and pushing x units along e is just residual[e] -= x, residual[e ^ 1] += x. For forward arcs, residual[e] is the
+remaining capacity c - f and residual[e ^ 1] the flow f that could be sent back, so an edge's flow is
+residual[2i + 1]. Arc costs are antisymmetric, cost[e ^ 1] == -cost[e]. Vertices are interned to dense ids, and once
+buildAdjacency() has run, the arcs leaving each vertex are listed in CSR form: adjacent[offsets[u]:offsets[u + 1]]
+are the arc ids with tail u.
+    memory: 4 machine words per arc (head, residual, capacity, cost), plus one dict entry per edge and per vertex
+
+@author: Bill Wu
+"""
+
+from array import array
+from Graph import Vertex
+
+MAX_VALUE = 2 ** 63 - 1  # Largest capacity or absolute cost a signed 64-bit array slot can hold
+
+class ResidualArcs:
+    def __init__(self):
+        # Maps id -> Vertex, and the inverse Vertex -> id
+        self.vertices = []
+        self.ids = {}
+        self.heads = array('q')  # Arc id -> head vertex id. The tail of arc e is heads[e ^ 1]
+        self.residual = array('q')  # Arc id -> residual capacity
+        self.capacity = array('q')  # Arc id -> original capacity, 0 for reverse arcs
+        self.cost = array('q')  # Arc id -> cost per unit of flow
+        self.hasCost = bytearray()  # Edge index -> 1 if the edge was given a cost, o/w its cost is 0
+        self.edgeIds = {}  # (tail id << 32 | head id) -> edge index, for looking up and overwriting edges
+        # CSR adjacency, None until buildAdjacency() and again after an edge is added
+        self.offsets = None
+        self.adjacent = None
+
+    def addVertex(self, v: Vertex) -> int:
+        """@return: v's id, interning it first if it is new"""
+        if v not in self.ids:
+            self.ids[v] = len(self.vertices)
+            self.vertices.append(v)
+            self.offsets = self.adjacent = None
+        return self.ids[v]
+
+    def addEdge(self, u: Vertex, v: Vertex, capacity: int, cost=None) -> int:
+        """
+        Adds the capacity edge (u, v) with zero flow, or if it is already present, sets its capacity and resets its
+        flow to zero. Its cost is only set if one is given.
+        @return: the edge's index i, ie its arcs are 2i and 2i + 1
+        """
+        a, b = self.addVertex(u), self.addVertex(v)
+        key = a << 32 | b
+        if key in self.edgeIds:
+            i = self.edgeIds[key]
+            self.capacity[2 * i] = self.residual[2 * i] = capacity
+            self.residual[2 * i + 1] = 0
+        else:
+            i = self.edgeIds[key] = len(self.hasCost)
+            self.heads.extend((b, a))
+            self.residual.extend((capacity, 0))
+            self.capacity.extend((capacity, 0))
+            self.cost.extend((0, 0))
+            self.hasCost.append(0)
+            self.offsets = self.adjacent = None
+        if cost is not None:
+            self.cost[2 * i], self.cost[2 * i + 1] = cost, -cost
+            self.hasCost[i] = 1
+        return i
+
+    def buildAdjacency(self):
+        """Builds the CSR adjacency by counting sort on the arcs' tails, if anything was added since the last build"""
+        if self.offsets is not None:
+            return
+        heads = self.heads
+        degree = [0] * len(self.vertices)
+        for e in range(len(heads)):
+            degree[heads[e ^ 1]] += 1
+        offsets = array('q', [0])
+        for d in degree:
+            offsets.append(offsets[-1] + d)
+        position = array('q', offsets[:-1])
+        adjacent = array('q', [0]) * len(heads)
+        for e in range(len(heads)):
+            tail = heads[e ^ 1]
+            adjacent[position[tail]] = e
+            position[tail] += 1
+        self.offsets, self.adjacent = offsets, adjacent
+
+    def numVertices(self) -> int:
+        return len(self.vertices)
+
+    def numArcs(self) -> int:
+        return len(self.heads)
+
+    def numEdges(self) -> int:
+        return len(self.hasCost)
+
+    def getId(self, v: Vertex) -> int:
+        if v not in self.ids:
+            raise ValueError("Vertex not present in flow network: %r" % v)
+        return self.ids[v]
+
+    def getEdge(self, u: Vertex, v: Vertex) -> int:
+        """@return: index of the capacity edge (u, v), or None if there is none"""
+        if u not in self.ids or v not in self.ids:
+            return None
+        return self.edgeIds.get(self.ids[u] << 32 | self.ids[v])
+
+    def getFlow(self, i: int) -> int:
+        """@return: flow on edge i"""
+        return self.residual[2 * i + 1]
+
+    def push(self, e: int, x: int):
+        """Sends x more units of flow along arc e"""
+        self.residual[e] -= x
+        self.residual[e ^ 1] += x
+
+    def resetFlow(self):
+        """Sets the flow on every edge back to 0"""
+        residual, capacity = self.residual, self.capacity
+        for e in range(0, len(residual), 2):
+            residual[e], residual[e + 1] = capacity[e], 0
@@ -1,4 +1,8 @@
 from Graph import Graph, Vertex
+from Instrumentation import phaseTimer
+from FlowArcs import MAX_VALUE, ResidualArcs
+from MaxFlow import MAX_FLOW_ALGORITHMS, shortestAugmentingPath
+from MinCostFlow import MIN_COST_FLOW_ALGORITHMS, cancelNegativeCycles, findNegativeCycle, networkSimplexWithSupplies
 import json
 
 class NegativeCapacityException(Exception):
@@ -6,10 +10,13 @@ class NegativeCapacityException(Exception):
 
 class FlowNetwork:
     """
-    A Flow Network. Consists of a source and sink node: S and T; and 4 auxiliary graphs that aid in calculating
-    max flow or min cost max flow. These graphs include a capacity graph to store edge capacities, a flow graph to
-    store any flow pushed through the network, a residual graph storing the augmenting flow through each edge, and
-    a cost graph that stores the cost function applied to each edge.
+    A Flow Network. Consists of a source and sink node: S and T; and a ResidualArcs store (see FlowArcs) holding every
+    capacity edge (u, v) as a pair of arcs, u -> v with the remaining capacity c - f and v -> u with the flow f that
+    could be sent back, in flat arrays alongside their costs. Pushing flow is index arithmetic on those arrays.
+
+    The capacity, flow, residual and cost graphs of earlier versions are still available as read-only Graph views
+    (capacityGraph, flowGraph, residualGraph, costGraph, and the cost mapping), materialized from the arrays when first
+    read and cached until the network next changes. They are snapshots: mutate the network through its own methods.
 
     Any "flow" pushed through ah edge cannot exceed the capacity specified in the capacity graph,
     and the maximum possible amount of flow that can exist at any point in the graph is:
@@ -18,223 +25,243 @@ class FlowNetwork:
     def __init__(self, source, sink, vertices=None, capacities=None, cost=None):
         self.source = source  # Source node S
         self.sink = sink  # Sink node T
-        # Maps u -> {v1: c1, v2: c2, ... }, ...; must be a mapping w "weighted" edges
-        self.capacityGraph = Graph(vertices, {} if capacities is None else capacities)
-        # Flow graph, keeps track of flow pushed through Network
-        self.flowGraph = Graph(vertices)
-        # Residual graph, keeps track of extra flow that can be pushed through
-        self.residualGraph = Graph(vertices)
-        self.resetFlowAndResidualGraph()
-
-        # No methods other than this constructor and addEdge should mutate this cost function mapping
-        self.cost = {} if cost is None else cost
-        # Mutable, represents the residual graph's edge costs (ie cost func mappings * 1( (u,v) exists in res G ))
-        self.costGraph = Graph(vertices, {k: self.cost[k] for k in self.cost})
+        self.arcs = ResidualArcs()
+        # Mutation counter, bumped whenever an edge or the flow changes, so that cached graph views can be dropped
+        self.version = 0
+        self._views = {}
+        for v in (source, sink) if vertices is None else (source, sink, *vertices):
+            self.arcs.addVertex(v)
+        # capacities maps u -> {v1: c1, v2: c2, ... }, ...; and cost maps u -> {v1: w1, ...} for edges among them
+        cost = {} if cost is None else cost
+        if capacities is not None:
+            for u, children in capacities.items():
+                for v, c in children.items():
+                    self.addEdge(u, v, c, cost.get(u, {}).get(v))
+        # Opt-in counters/timings for getMaxFlow and getMinCostMaxFlow, see instrument()
+        self.instrumentation = None
 
     @staticmethod
     def createFlowNetwork(source, sink, vertices=None, capacities=None, cost=None, flowGraph=None, residualGraph=None, costGraph=None):
-        # Constructor only initializes flow/residual/cost graphs, but they could be different, so update them below
-        G = FlowNetwork(source, sink, vertices, capacities, cost)
-        G.flowGraph = Graph.deserialize(flowGraph)
-        G.residualGraph = Graph.deserialize(residualGraph)
-        G.costGraph = Graph.deserialize(costGraph)
+        """
+        Builds a Flow Network from its serialized form (see serializeToJSON), with every vertex given as a serialized
+        string. The residual and residual cost graphs follow from the capacities, costs and flow, so they are ignored.
+        """
+        wrap = lambda mapping: {Vertex.deserialize(u): {Vertex.deserialize(v): x for v, x in children.items()}
+                                for u, children in ({} if mapping is None else mapping).items()}
+        G = FlowNetwork(Vertex.deserialize(source), Vertex.deserialize(sink),
+                        None if vertices is None else [Vertex.deserialize(v) for v in vertices],
+                        wrap(capacities), wrap(cost))
+        for u, children in wrap(flowGraph).items():
+            for v, f in children.items():
+                G.arcs.push(2 * G.arcs.getEdge(u, v), f)
         return G
 
+    def _modified(self):
+        self.version += 1
+        self._views = {}
+
+    def _view(self, name: str, build) -> Graph:
+        """@return: the cached view called name, first building it as Graph(vertices, build()) if there is none"""
+        if name not in self._views:
+            self._views[name] = Graph(self.arcs.vertices, build())
+        return self._views[name]
+
+    def _edgeMapping(self, value, edges=None) -> dict:
+        """@return: {u: {v: value(i), ...}, ...} over the capacity edges (u, v) with index i in edges (default all)"""
+        vertices, heads = self.arcs.vertices, self.arcs.heads
+        mapping = {}
+        for i in range(self.arcs.numEdges()) if edges is None else edges:
+            u, v = vertices[heads[2 * i + 1]], vertices[heads[2 * i]]
+            if u in mapping:
+                mapping[u][v] = value(i)
+            else:
+                mapping[u] = {v: value(i)}
+        return mapping
+
+    def _arcMapping(self, combine) -> dict:
+        """@return: {u: {v: x, ...}, ...} where x folds, with combine, the arcs u -> v that have residual capacity"""
+        vertices, heads, residual, cost = self.arcs.vertices, self.arcs.heads, self.arcs.residual, self.arcs.cost
+        mapping = {}
+        for e in range(self.arcs.numArcs()):
+            if residual[e] > 0:
+                u, v = vertices[heads[e ^ 1]], vertices[heads[e]]
+                children = mapping.setdefault(u, {})
+                children[v] = combine(children[v], e) if v in children else combine(None, e)
+        return mapping
+
+    @property
+    def capacityGraph(self) -> Graph:
+        """Read-only view: capacity of every edge"""
+        return self._view("capacity", lambda: self._edgeMapping(lambda i: self.arcs.capacity[2 * i]))
+
+    @property
+    def flowGraph(self) -> Graph:
+        """Read-only view: flow on every edge (antiparallel edges can both carry flow)"""
+        return self._view("flow", lambda: self._edgeMapping(self.arcs.getFlow))
+
+    @property
+    def residualGraph(self) -> Graph:
+        """Read-only view: for every u, v with residual capacity from u to v, the total residual capacity c - f + f^R"""
+        residual = self.arcs.residual
+        return self._view("residual", lambda: self._arcMapping(
+            lambda x, e: residual[e] if x is None else x + residual[e]))
+
+    @property
+    def costGraph(self) -> Graph:
+        """Read-only view: the cost of the cheapest arc from u to v with residual capacity, for every such u, v"""
+        cost = self.arcs.cost
+        return self._view("cost", lambda: self._arcMapping(lambda x, e: cost[e] if x is None else min(x, cost[e])))
+
+    @property
+    def cost(self) -> dict:
+        """Read-only view: the cost function {u: {v: cost(u, v), ...}, ...}, for the edges given a cost"""
+        if "costFunction" not in self._views:
+            hasCost = self.arcs.hasCost
+            self._views["costFunction"] = self._edgeMapping(
+                lambda i: self.arcs.cost[2 * i], (i for i in range(self.arcs.numEdges()) if hasCost[i]))
+        return self._views["costFunction"]
+
+    def instrument(self, instrumentation):
+        """
+        Attaches an Instrumentation (or detaches it with None) that records counters and phase timings of getMaxFlow,
+        getMinCostMaxFlow and getMinCostFlow.
+        @return: instrumentation
+        """
+        self.instrumentation = instrumentation
+        return instrumentation
+
     def resetFlowAndResidualGraph(self):
         """For each edge present, reset flow to 0 and the residual to the capacity"""
-        # TODO: Reset costGraph as well if we really want this reset feature to be reused outside of constructor
-        for u in self.capacityGraph.edges:
-            for v in self.capacityGraph.edges[u]:
-                self.residualGraph.addEdge(u, v, self.getCapacity(u, v))
-                self.flowGraph.addEdge(u, v, 0)
+        self.arcs.resetFlow()
+        self._modified()
 
     def checkRep(self):
         """
-        [DEBUG] Checks that every mapping/part of the Network rep is maintained.
+        [DEBUG] Checks that every part of the Network rep is maintained.
         Should be called before/after methods that mutate the Network's internals.
         """
-        flowMappings = self.flowGraph.getEdges()  # TODO: should I create an iterator through Graph edges?
-        for u in flowMappings:
-            for v in flowMappings[u]:
-                # If there is flow through an edge, then the flow must be <= the capacity
-                assert u in self.capacityGraph
-                assert v in self.capacityGraph[u]
-                f = self.flowGraph[u][v]
-                cp = self.getCapacity(u, v)
-                assert 0 <= f <= cp
-
-                # No edge in residual network if flow == capacity
-                if f == cp:
-                    if u in self.residualGraph:
-                        assert v not in self.residualGraph[u]
-                    assert v in self.residualGraph and u in self.residualGraph[v]
-                    assert f == self.residualGraph[v][u]
-                else:  # Otherwise, residual flow must be <= capacity-flow, and must have a reverse edge w >= f(u,v)
-                    assert u in self.residualGraph and v in self.residualGraph[u]
-                    assert self.residualGraph[u][v] <= self.getCapacity(u, v) - self.flowGraph[u][v]
-                    if f == 0:  # If 0 flow, then reverse edge shouldn't be in the residual network
-                        if v in self.residualGraph:
-                            assert u not in self.residualGraph[v]
-                    else:  # Reverse edge >= f(u,v) since there could be other contributing flows through edge (u,v)
-                        assert v in self.residualGraph and u in self.residualGraph[v]
-                        assert self.residualGraph[v][u] >= self.flowGraph[u][v]
-
-        for u in self.capacityGraph.edges:
-            for v in self.capacityGraph.edges[u]:
-                # Capacities must be non-negative, and also integral (o/w Ford Fulkerson might not converge properly)
-                cp = self.getCapacity(u, v)
-                assert cp >= 0
-                assert isinstance(cp, int)
-
+        arcs = self.arcs
+        heads, residual, capacity, cost = arcs.heads, arcs.residual, arcs.capacity, arcs.cost
+        assert len(heads) == len(residual) == len(capacity) == len(cost) == 2 * arcs.numEdges()
+        assert len(arcs.edgeIds) == arcs.numEdges()
         # Source and sink nodes must be present
-        # Total flow out of source must be equal to total flow into sink
-        sourceSum, sinkSum = 0, 0
-        assert self.source in self.flowGraph
-        sinkPresent = False
-        for u in flowMappings:
-            if self.sink in flowMappings[u]:
-                sinkPresent = True
-                sinkSum += flowMappings[u][self.sink]
-        assert sinkPresent
-        for f in flowMappings[self.source].values():
-            sourceSum += f
-        assert sourceSum == sinkSum
-
-        # Cost Graph checks: all edge weights w(u,v) must be <= cost[u][v]
-        for u in self.costGraph.edges:
-            for v in self.costGraph.edges[u]:
-                assert u in self.cost and v in self.cost[u]
-                assert self.costGraph.getWeight(u, v) <= self.cost[u][v]
-                # All cost graph edges must also belong to the residual network (costGraph == costs of residual edges)
-                assert u in self.residualGraph and v in self.residualGraph[u]
+        assert self.source in arcs.ids and self.sink in arcs.ids
+        balance = [0] * arcs.numVertices()
+        for i in range(arcs.numEdges()):
+            # Capacities must be non-negative, and also integral (o/w Ford Fulkerson might not converge properly)
+            cp, f = capacity[2 * i], residual[2 * i + 1]
+            assert isinstance(cp, int) and cp >= 0 and capacity[2 * i + 1] == 0
+            # Flow through an edge must be <= the capacity, and the two arcs' residuals always sum to the capacity
+            assert 0 <= f <= cp
+            assert residual[2 * i] == cp - f
+            assert cost[2 * i + 1] == -cost[2 * i]
+            u, v = heads[2 * i + 1], heads[2 * i]
+            assert arcs.edgeIds[u << 32 | v] == i
+            balance[u] -= f
+            balance[v] += f
+        # Flow is conserved everywhere except S and T, so total flow out of source must be equal to total flow into sink
+        s, t = arcs.getId(self.source), arcs.getId(self.sink)
+        assert all(b == 0 for x, b in enumerate(balance) if x != s and x != t)
+        assert s == t or balance[s] == -balance[t]
+
+    def hasEdge(self, u: Vertex, v: Vertex) -> bool:
+        return self.arcs.getEdge(u, v) is not None
 
     def getCapacity(self, u: Vertex, v: Vertex) -> int:
-        return self.capacityGraph.getWeight(u, v)
+        return self.arcs.capacity[2 * self._getEdge(u, v)]
+
+    def getFlow(self, u: Vertex, v: Vertex) -> int:
+        return self.arcs.getFlow(self._getEdge(u, v))
+
+    def _getEdge(self, u: Vertex, v: Vertex) -> int:
+        i = self.arcs.getEdge(u, v)
+        if i is None:
+            raise ValueError("Edge not present in flow network: %r, %r" % (u, v))
+        return i
 
     def addEdge(self, u: Vertex, v: Vertex, capacity: int = 0, cost=None):
         """
-        Given two vertices, a capacity, and a cost, adds the edge to the corresponding graphs in the Flow Network.
+        Given two vertices, a capacity, and a cost, adds the edge to the Flow Network with no flow through it. If the
+        edge is already present, then its capacity (and cost, if one is given) are replaced and its flow reset to 0.
         Throws an exception if the capacity specified is negative.
-        Behavior unspecified if there exists an edge back to the source S,
-        or if there is already flow present in the flow/residual graph.
+        Capacities and costs are stored in signed 64-bit arrays, so both must be ints (TypeError o/w) of absolute value
+        at most 2^63 - 1 (ValueError o/w). Checked before anything is stored, so a rejected edge changes nothing.
+        Behavior unspecified if there is already flow present through the rest of the network.
         """
+        if not isinstance(capacity, int) or not isinstance(0 if cost is None else cost, int):
+            raise TypeError("Capacity and cost must be integers, got %r and %r on edge (%r, %r)"
+                            % (capacity, cost, u, v))
         if capacity < 0:
             raise NegativeCapacityException
-        # Uncomment if desired behavior becomes st if flow preexisting, then reset everything
-        # if any(self.flowGraph[u][v] != 0 for u in self.flowGraph for v in self.flowGraph[u]):
-        #     self.resetFlowAndResidualGraph()
-
-        self.capacityGraph.addEdge(u, v, capacity)
-        self.flowGraph.addEdge(u, v, 0)
-        self.residualGraph.addEdge(u, v, capacity)
-        if cost is not None:
-            self.costGraph.addEdge(u, v, cost)
-            if u not in self.cost:
-                self.cost[u] = {v: cost}
-            else:
-                self.cost[u][v] = cost
+        if capacity > MAX_VALUE or (cost is not None and abs(cost) > MAX_VALUE):
+            raise ValueError("Capacity %r or cost %r on edge (%r, %r) does not fit in 64 bits" % (capacity, cost, u, v))
+        self.arcs.addEdge(u, v, capacity, cost)
+        self._modified()
+
+    def _residualCapacity(self, u: Vertex, v: Vertex) -> int:
+        """@return: the capacity left on the edge (u, v) plus the flow on the edge (v, u) that could be sent back"""
+        arcs = self.arcs
+        i, j = arcs.getEdge(u, v), arcs.getEdge(v, u)
+        return (0 if i is None else arcs.residual[2 * i]) + (0 if j is None else arcs.residual[2 * j + 1])
 
     def getAugmentingPath(self) -> list:
         """
         Gets the shortest-length augmenting path via BFS on the residual network. Uses Edmonds-Karp as the spec
         since it bounds the number of augmentations to O(VE^2) rather than O(E * |f|) where f is the max flow
-        @return: list of vertices in the shortest-length augmenting path
+        @return: list of vertices in the shortest-length augmenting path, or None if there is none
         """
-        return self.residualGraph.bfs(self.source, self.sink)
+        arcs = self.arcs
+        arcs.buildAdjacency()
+        s, t = arcs.getId(self.source), arcs.getId(self.sink)
+        path = shortestAugmentingPath(arcs, s, t) if s != t else None
+        if path is None:
+            return None
+        return [self.source] + [arcs.vertices[arcs.heads[e]] for e in path]
 
     def getMinCapAlongResCycle(self, negCycle: list) -> int:
         """Gets the minimum capacity among all residual graph edges using vertices from a given negative cost cycle."""
         assert negCycle is not None
-        amountRedirectedFlow = float('inf')
-        for i in range(len(negCycle) - 1):
-            u, v = negCycle[i], negCycle[i + 1]
-            assert u in self.residualGraph and v in self.residualGraph[u]  # cycle generated from res G, should be true
-            amountRedirectedFlow = min(amountRedirectedFlow, self.residualGraph[u][v])
-        return amountRedirectedFlow
+        return min(self._residualCapacity(negCycle[i], negCycle[i + 1]) for i in range(len(negCycle) - 1))
 
     def getMinCapAlongAugPath(self, augPath: list) -> int:
         """Gets the minimum capacity among all edges on a valid (non-null) augmenting path, augPath."""
         assert augPath is not None
-        # Need to identify largest difference between any capacity and flow already being pushed through
-        additionalFlow = float('inf')
-        for i in range(len(augPath) - 1):
-            u, v = augPath[i], augPath[i + 1]
-            # Need this check if sending flow to "counter" existing flow
-            if u not in self.capacityGraph or (u in self.capacityGraph and v not in self.capacityGraph[u]):
-                assert v in self.flowGraph and u in self.flowGraph[v]  # Must be flow in opposite direction
-                additionalFlow = min(additionalFlow, self.flowGraph[v][u])  # min cap is sending this flow backwards
-            else:
-                additionalFlow = min(additionalFlow, self.getCapacity(u, v) - self.flowGraph[u].get(v, 0))
-        return additionalFlow
+        return min(self._residualCapacity(augPath[i], augPath[i + 1]) for i in range(len(augPath) - 1))
 
     def pushAugmentingFlow(self, augPath: list, costsPresent: bool):
         """
-        Pushes augmenting flow along the specified path, and updates the residuals in the residual graph
-            Note: also updates the cost graph's costs (which correspond to residual costs)
+        Pushes as much flow as possible along the specified path. Along each step u -> v, flow already on the edge
+        (v, u) is sent back first, and only the rest is added to the edge (u, v).
         @param augPath: input path from source to sink node of possible nonzero additional flow, must not be None
-            Note: can also be a cycle reachable from the sink node if using cycle cancelling.
-        @param costsPresent: True if cost graph represents the costs of edges in residual graph,
-            o/w False if Flow Network not initialized with costs in mind.
+            Note: can also be a residual cycle (first == last vertex), eg when cancelling negative cost cycles.
+        @param costsPresent: True if augPath is such a cycle, o/w False. Costs follow the flow either way
         @return: null
         """
         if costsPresent:
-            assert self.costGraph.edges  # Must have a valid cost graph for costsPresent to be flipped to True
-            # The augmenting path here is assumed to be a cycle that is passed in
             assert augPath[-1] == augPath[0]
             additionalFlow = self.getMinCapAlongResCycle(augPath)
         else:
             additionalFlow = self.getMinCapAlongAugPath(augPath)
-        # If an augmenting path is specified, then just need to make the necessary changes along the augmenting path
+        arcs = self.arcs
         for i in range(len(augPath) - 1):
-            u, v = augPath[i], augPath[i+1]
-
-            # In the case of cycles, we want to redirect the flow for cycle cancelling, which could mean subtracting
-            # Note: ok if a flow value is 0 rather than deleted from mappings - no bfs or bellman ford on flow edges
-            if v in self.flowGraph and u in self.flowGraph[v]:
-                self.flowGraph[v][u] -= additionalFlow
-            else:
-                # Augment flow graph for f(u,v) normally: add additional flow, or add edge to mapping if needed
-                if u in self.flowGraph:
-                    self.flowGraph[u][v] = self.flowGraph[u].get(v, 0) + additionalFlow
-
-            # Augment residual graph, potentially edit edges (u,v) and (v,u) if already flow going through
-            assert additionalFlow <= self.residualGraph[u][v]
-            # Subtract off flow pushed through, ie delta f(u,v)
-            if v in self.residualGraph[u] and self.residualGraph[u][v] == additionalFlow:
-                del self.residualGraph[u][v]
-                # Augment cost graph, should emulate residual graph's edges but instead of capacities, have costs
-                if self.costGraph.edges:
-                    assert v in self.costGraph[u]
-                    # Only want to delete cost graph edge if flow reaches capacity and res G also no longer has the edge
-                    del self.costGraph[u][v]
-            else:
-                self.residualGraph[u][v] -= additionalFlow
-
-            # Residual flow, from v->u
-            if v not in self.residualGraph:
-                self.residualGraph[v] = {u: additionalFlow}
-                # Augment cost graph to reflect addition of new edge in residual graph
-                if self.costGraph.edges:
-                    assert v not in self.costGraph
-                    assert u in self.costGraph
-                    # pulling from the original costs mapping since that is immutable, as opposed to the mutable cost G
-                    self.costGraph[v] = {u: -self.cost[u][v]}
-            else:
-                self.residualGraph[v][u] = self.residualGraph[v].get(u, 0) + additionalFlow
-                if self.costGraph.edges:
-                    assert v in self.costGraph
-                    # If cycle edge part of original cost func mapping, then G_c[v][u] <- -cost(v,u)
-                    # O/w edge is not on a cycle and needs the -cost(u, v)
-                    if v in self.cost and u in self.cost[v]:
-                        self.costGraph[v][u] = self.cost[v][u]
-                    else:
-                        self.costGraph[v][u] = -self.cost[u][v]
-
-    def getMaxFlow(self) -> int:
+            u, v = augPath[i], augPath[i + 1]
+            remaining, j = additionalFlow, arcs.getEdge(v, u)
+            if j is not None:
+                sentBack = min(remaining, arcs.getFlow(j))
+                arcs.push(2 * j + 1, sentBack)
+                remaining -= sentBack
+            if remaining > 0:
+                arcs.push(2 * arcs.getEdge(u, v), remaining)
+        self._modified()
+
+    def getMaxFlow(self, algorithm: str = "edmondsKarp") -> int:
         """
-        Finds the max flow (as an integer), given the current flow network. Uses the Ford Fulkerson algorithm.
-        Note: Pushes flow through the network (mutates the network's flow)
+        Finds the max flow (as an integer), given the current flow network. Uses the Ford Fulkerson algorithm by
+        default (Edmonds-Karp, since augmenting paths are found with BFS), or any other of
+        MaxFlow.MAX_FLOW_ALGORITHMS, eg "dinic" or "pushRelabel".
+        Note: Pushes flow through the network (mutates the network's flow), on top of any flow already in it
         If no augmenting path exists at all, then the max flow is just 0.
+        @param algorithm: a name in MaxFlow.MAX_FLOW_ALGORITHMS
         @return: any feasible max flow as an integer
 
         Pseudocode (from https://www.hackerearth.com/practice/algorithms/graphs/maximum-flow/tutorial/):
@@ -245,31 +272,58 @@ class FlowNetwork:
                 Update residual network graph
             return
         """
-        augmentingPath = self.getAugmentingPath()
-        while augmentingPath is not None:
-            self.pushAugmentingFlow(augmentingPath, costsPresent=False)
-            augmentingPath = self.getAugmentingPath()
-
-        maxFlow = 0
-        if self.source in self.flowGraph:
-            for v in self.flowGraph[self.source]:
-                maxFlow += self.flowGraph[self.source][v]
-        return maxFlow
+        if algorithm not in MAX_FLOW_ALGORITHMS:
+            raise ValueError("Unknown max flow algorithm %r, expected one of %s"
+                             % (algorithm, sorted(MAX_FLOW_ALGORITHMS)))
+        arcs = self.arcs
+        s, t = arcs.getId(self.source), arcs.getId(self.sink)
+        arcs.buildAdjacency()
+        with phaseTimer(self.instrumentation, "getMaxFlow")(algorithm):
+            _, counters = MAX_FLOW_ALGORITHMS[algorithm](arcs, s, t)
+        self._modified()
+        if self.instrumentation is not None:
+            self.instrumentation.record("getMaxFlow", **counters)
+        return self.getFlowValue()
+
+    def getFlowValue(self) -> int:
+        """
+        @return: the value of the flow currently in the network, ie the total flow leaving the source, minus any flow
+            coming back into it (push-relabel may return excess to the source over edges into it)
+        """
+        heads, residual = self.arcs.heads, self.arcs.residual
+        s = self.arcs.getId(self.source)
+        flowValue = 0
+        for e in range(0, len(heads), 2):
+            if heads[e ^ 1] == s:
+                flowValue += residual[e + 1]
+            if heads[e] == s:
+                flowValue -= residual[e + 1]
+        return flowValue
 
     def getNegCostResidualCycle(self) -> list:
         """
         Detects if there exists a negative cost cycle in the Residual Graph, and if so, returns the cycle, o/w None.
-        Uses Bellman-Ford, since Dijkstra etc. cannot handle negative cost cycles.
-        @return: list of vertices in negative cost cycle from residual graph, or null if no cycle exists
+        Uses queue-based Bellman-Ford (SPFA) from every vertex at once, since Dijkstra etc. cannot handle negative
+        cost cycles, see MinCostFlow.findNegativeCycle.
+        @return: list of vertices in negative cost cycle from residual graph (first == last), or null if none exists
         """
-        cycle, d, p = self.costGraph.bellmanFord_SSSP(self.sink)
-        return cycle
-
-    def getMinCostMaxFlow(self) -> tuple:
+        arcs = self.arcs
+        arcs.buildAdjacency()
+        cycle = findNegativeCycle(arcs)
+        if cycle is None:
+            return None
+        return [arcs.vertices[arcs.heads[cycle[-1]]]] + [arcs.vertices[arcs.heads[e]] for e in cycle]
+
+    def getMinCostMaxFlow(self, maxFlowAlgorithm: str = "edmondsKarp", algorithm: str = "cycleCancelling") -> tuple:
         """
-        Finds the min cost max flow (assumed to be integral). Uses the cycle cancelling algorithm.
+        Finds the min cost max flow (assumed to be integral). Uses the cycle cancelling algorithm by default, or one of
+        MinCostFlow.MIN_COST_FLOW_ALGORITHMS (eg "networkSimplex", "costScaling"), which start over from zero
+        flow (successive shortest paths requires that the network has no negative cost cycle, and raises
+        MinCostFlow.NegativeCostCycleException).
         Note: mutates the current Flow Network state by redirecting flow after a feasible max flow is found (minimize c)
-        Note: Assumes that the cost function is defined for edges (u,v) that appear in capacities
+        Note: edges added without a cost cost 0
+        @param maxFlowAlgorithm: algorithm finding the initial feasible max flow for cycle cancelling, see getMaxFlow
+        @param algorithm: "cycleCancelling" or a name in MinCostFlow.MIN_COST_FLOW_ALGORITHMS
         @return: tuple( minimum cost from an optimal max flow as an integer, max flow as an integer )
 
         Pseudocode (from https://www.hackerearth.com/practice/algorithms/graphs/minimum-cost-maximum-flow/tutorial/)
@@ -283,24 +337,50 @@ class FlowNetwork:
             mincost = sum of Cij*Fij for each of the flow in residual graph
             return mincost
         """
-        self.getMaxFlow()  # Obtains a feasible max flow and updates the Flow and Residual graphs
-        negCostCycle = self.getNegCostResidualCycle()
-        while negCostCycle is not None:
-            self.pushAugmentingFlow(negCostCycle, costsPresent=True)
-            negCostCycle = self.getNegCostResidualCycle()
-
-        # By now, there are no more negative cost cycles in the residual graph, and so our flow cost must be optimal
-        minCost, maxFlow = 0, 0
-        for u in self.flowGraph.edges:
-            for v in self.flowGraph.edges[u]:
-                if self.flowGraph.getWeight(u, v) == 0:
-                    continue
-                assert u in self.cost and v in self.cost[u]
-                minCost += self.flowGraph.getWeight(u, v) * self.cost[u][v]
-                if u == self.source:
-                    maxFlow += self.flowGraph.getWeight(u, v)
-
-        return minCost, maxFlow
+        if algorithm != "cycleCancelling" and algorithm not in MIN_COST_FLOW_ALGORITHMS:
+            raise ValueError("Unknown min cost flow algorithm %r, expected \"cycleCancelling\" or one of %s"
+                             % (algorithm, sorted(MIN_COST_FLOW_ALGORITHMS)))
+        arcs = self.arcs
+        phase = phaseTimer(self.instrumentation, "getMinCostMaxFlow")
+        if algorithm == "cycleCancelling":
+            with phase("maxFlow"):
+                self.getMaxFlow(maxFlowAlgorithm)  # Obtains a feasible max flow
+            with phase("cycleCancelling"):
+                counters = cancelNegativeCycles(arcs)
+            # By now, there are no more negative cost cycles in the residual graph, and so our flow cost must be optimal
+        else:
+            arcs.resetFlow()
+            arcs.buildAdjacency()
+            with phase(algorithm):
+                _, counters = MIN_COST_FLOW_ALGORITHMS[algorithm](arcs, arcs.getId(self.source), arcs.getId(self.sink))
+        self._modified()
+        if self.instrumentation is not None:
+            self.instrumentation.record("getMinCostMaxFlow", **counters)
+        return self.getFlowCost(), self.getFlowValue()
+
+    def getMinCostFlow(self, supplies: dict) -> int:
+        """
+        Finds the cheapest flow that meets the given supplies and demands, ignoring the source and sink (eg to route a
+        fixed number of assignments rather than as many as possible), with network simplex, and replaces the
+        network's current flow with it.
+        Raises MinCostFlow.InfeasibleFlowException if the demands can't be met within the capacities.
+        @param supplies: {vertex: supply (> 0) or demand (< 0), ...}, summing to 0. Vertices left out have neither
+        @return: min total cost as an integer
+        """
+        supply = [0] * self.arcs.numVertices()
+        for v, b in supplies.items():
+            supply[self.arcs.getId(v)] = b
+        with phaseTimer(self.instrumentation, "getMinCostFlow")("networkSimplex"):
+            minCost, counters = networkSimplexWithSupplies(self.arcs, supply)
+        self._modified()
+        if self.instrumentation is not None:
+            self.instrumentation.record("getMinCostFlow", **counters)
+        return minCost
+
+    def getFlowCost(self) -> int:
+        """@return: total cost of the flow currently in the network, ie the sum of f(u,v) * cost(u,v)"""
+        residual, cost = self.arcs.residual, self.arcs.cost
+        return sum(residual[e + 1] * cost[e] for e in range(0, len(residual), 2))
 
     def serializeToJSON(self, outPath: str):
         """Serializes the Flow Network into a JSON object, and writes it to the file specified (overwrites contents).
@@ -317,11 +397,11 @@ class FlowNetwork:
         """
         with open(outPath, "w") as out:
             result = {}
-            result["source"] = self.source.val
-            result["sink"] = self.sink.val
-            result["vertices"] = [v.val for v in self.capacityGraph.vertices]
+            result["source"] = self.source.serialize()
+            result["sink"] = self.sink.serialize()
+            result["vertices"] = [v.serialize() for v in self.arcs.vertices]
             result["capacities"] = self.capacityGraph.serialize()
-            result["cost"] = {k.val: {v.val: self.cost[k][v] for v in self.cost[k]} for k in self.cost}
+            result["cost"] = {k.serialize(): {v.serialize(): self.cost[k][v] for v in self.cost[k]} for k in self.cost}
             result["flow"] = self.flowGraph.serialize()
             result["residual"] = self.residualGraph.serialize()
             result["residualCost"] = self.costGraph.serialize()
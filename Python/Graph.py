@@ -1,4 +1,7 @@
 import heapq
+from collections import deque
+from IndexedHeap import IndexedDaryHeap
+from Instrumentation import phaseTimer
 
 class Vertex:
     # Assume that a Vertex is immutable
@@ -17,10 +20,10 @@ class Vertex:
         return Vertex(val)
 
     def __str__(self):
-        return "vertex %r" % self.val
+        return "vertex %r" % (self.val,)
 
     def __repr__(self):
-        return "Vertex(%r)" % self.val
+        return "Vertex(%r)" % (self.val,)
 
     def __hash__(self):
         return hash(self.val)
@@ -44,9 +47,71 @@ class Graph:
     def __init__(self, vertices=None, edges=None):
         # Can construct a graph via edges adjacency set (u -> {v1: w1, v2: w2}, ...})
         # For ease of use, the vertices are assumed to not be be of type Graph.Vertex(x)
-        self.vertices = set() if vertices is None else vertices
+        # Copied so that graphs built from the same vertex collection (eg FlowNetwork's graphs) don't alias it
+        self.vertices = set() if vertices is None else set(vertices)
         # Adjacency set for all the edges - {u: {v1: w1, v2: w2, ...}, ...}
         self.edges = {} if edges is None else edges
+        # Mutation counter, bumped by every mutating method so that derived results (eg SSSPCache) can tell when the
+        # graph has changed. Mutating a child dict in place (G[u][v] = w) bypasses it, call markModified() after that
+        self.version = 0
+        # Opt-in counters/timings for bfsTree, dijkstra_SSSP and bellmanFord_SSSP, see instrument()
+        self.instrumentation = None
+        # Optional reverse adjacency set {v: {u1: w1, u2: w2, ...}, ...} (ie in-edges), see enableReverseIndex()
+        self.reverseEdges = None
+        # Results of O(|E|) scans that stay valid until the next mutation: the version that last passed
+        # verifyNonNegativeWeights, and a (version, reverse adjacency set) pair built by _reverseAdjacency
+        self._nonNegativeVersion = None
+        self._reverseCache = None
+
+    def markModified(self):
+        self.version += 1
+
+    def enableReverseIndex(self):
+        """
+        Builds the reverse adjacency set once in O(|E|), after which addEdge, addEdges and __setitem__ keep it in sync,
+        making getParents and inDegree O(1) per parent. Like the version counter, in place edits of a child dict
+        (G[u][v] = w) bypass it.
+        """
+        if self.reverseEdges is None:
+            reverseEdges = {}
+            for u, children in self.edges.items():
+                for v, w in children.items():
+                    if v in reverseEdges:
+                        reverseEdges[v][u] = w
+                    else:
+                        reverseEdges[v] = {u: w}
+            self.reverseEdges = reverseEdges
+
+    def getParents(self, v):
+        """@return: iterable of the vertices u with an edge (u, v). Scans every edge unless the reverse index is on"""
+        if self.reverseEdges is not None:
+            return self.reverseEdges.get(v, {}).keys()
+        return [u for u, children in self.edges.items() if v in children]
+
+    def inDegree(self, v) -> int:
+        if self.reverseEdges is not None:
+            return len(self.reverseEdges.get(v, ()))
+        return sum(1 for children in self.edges.values() if v in children)
+
+    def transpose(self):
+        """
+        Zero-copy transposed view: a Graph whose out-edges are this graph's in-edges (the reverse index, enabled if
+        needed) and whose vertex set is this graph's own, so every traversal/SSSP method runs on it unchanged and it
+        reflects later changes to this graph. The view's version is this graph's, so results cached over either one
+        (eg by SSSPCache) are dropped when the other changes.
+        @return: the transposed Graph, with weight w(v, u) = w(u, v)
+        """
+        self.enableReverseIndex()
+        return _TransposedGraph(self)
+
+    def instrument(self, instrumentation):
+        """
+        Attaches an Instrumentation (or detaches it with None) that records counters and phase timings of this graph's
+        bfs/bfsTree, dijkstra_SSSP and bellmanFord_SSSP runs.
+        @return: instrumentation
+        """
+        self.instrumentation = instrumentation
+        return instrumentation
 
     def getVertices(self):
         return self.vertices  # Consider making deep copies to prevent aliasing/rep exposure issues
@@ -68,7 +133,16 @@ class Graph:
     def __setitem__(self, key, value):
         assert isinstance(key, Vertex)
         assert isinstance(value, dict) and all(isinstance(v, Vertex) for v in value)
+        if self.reverseEdges is not None:
+            for v in self.edges.get(key, ()):
+                del self.reverseEdges[v][key]
+            for v, w in value.items():
+                if v in self.reverseEdges:
+                    self.reverseEdges[v][key] = w
+                else:
+                    self.reverseEdges[v] = {key: w}
         self.edges[key] = value
+        self.version += 1
 
     def getWeight(self, u, v):
         # Given vertices u and v, get the weight of the edge (u, v)
@@ -94,12 +168,69 @@ class Graph:
             self.edges[u][v] = w
         else:
             self.edges[u] = {v: w}
+        if self.reverseEdges is not None:
+            if v in self.reverseEdges:
+                self.reverseEdges[v][u] = w
+            else:
+                self.reverseEdges[v] = {u: w}
+
+        # Add new vertices if an edge connects ones not already in the graph (in place, no copy of the vertex set)
+        self.vertices.add(u)
+        self.vertices.add(v)
+        self.version += 1
+
+    def addEdges(self, edges):
+        """
+        Bulk version of addEdge, runs in O(|edges|) overall. Each raw (non-Vertex) value is wrapped into a Vertex
+        only once, and the same Vertex object is reused for every later edge mentioning it.
+        @param edges: iterable of (u, v) or (u, v, w) tuples, where u and v are Vertices or raw values.
+            Unweighted edges get weight 0, as in addEdge
+        """
+        wrapped, adjacency, vertices, reverseAdjacency = {}, self.edges, self.vertices, self.reverseEdges
+        for edge in edges:
+            u, v = edge[0], edge[1]
+            w = edge[2] if len(edge) > 2 else 0
+            if not isinstance(u, Vertex):
+                if u not in wrapped:
+                    wrapped[u] = Vertex(u)
+                u = wrapped[u]
+            if not isinstance(v, Vertex):
+                if v not in wrapped:
+                    wrapped[v] = Vertex(v)
+                v = wrapped[v]
+            children = adjacency.get(u)
+            if children is None:
+                adjacency[u] = {v: w}
+            else:
+                children[v] = w
+            if reverseAdjacency is not None:
+                parents = reverseAdjacency.get(v)
+                if parents is None:
+                    reverseAdjacency[v] = {u: w}
+                else:
+                    parents[u] = w
+            vertices.add(u)
+            vertices.add(v)
+        self.version += 1
 
-        # Add new vertices if an edge connects ones not already in the graph
-        self.vertices = self.vertices.union({u, v})
+    @staticmethod
+    def fromEdgeList(edges, vertices=None):
+        """
+        Builds a new Graph from an iterable of (u, v) or (u, v, w) edges using addEdges.
+        @param edges: iterable of edges, see addEdges
+        @param vertices: optional extra vertices (eg isolated ones), raw values are wrapped into Vertex
+        @return: the new Graph
+        """
+        G = Graph()
+        if vertices is not None:
+            for x in vertices:
+                G.vertices.add(x if isinstance(x, Vertex) else Vertex(x))
+        G.addEdges(edges)
+        return G
 
     def addVertex(self, x):
         self.vertices.add(Vertex(x))
+        self.version += 1
 
     def serialize(self) -> dict:
         """Serializes the graph into a Python dictionary, with each vertex also serialized.
@@ -116,32 +247,30 @@ class Graph:
                     result[uStr][vStr] = self.edges[u][v]
         return result
 
+    def freeze(self):
+        """
+        Snapshots the graph into an immutable CompactGraph (CSR arrays over dense integer vertex ids), which supports
+        bfs, dfs, dijkstra_SSSP and bellmanFord_SSSP without per-edge Vertex hashing. Later mutations of this graph
+        are not reflected in the snapshot.
+        @return: CompactGraph with the same vertices, edges and weights
+        """
+        from CompactGraph import CompactGraph  # Deferred, since CompactGraph imports Vertex from this module
+        return CompactGraph.fromGraph(self)
+
     @staticmethod
     def deserialize(data):
         G = Graph()
         for ustr in data:
             u = Vertex.deserialize(ustr)
-            for vstr in data[u]:
+            for vstr in data[ustr]:
                 v = Vertex.deserialize(vstr)
-                G.addEdge(u, v)
+                G.addEdge(u, v, data[ustr][vstr])
         return G
 
     def bfs(self, start, target):
         # Given a graph/adjacency matrix/adjacency set, (in 6.006 ex create dict of paths to all V) find SP to target
-        queue, visited, parents = [start], {start}, {start: start}
-        while queue:  # While there are still items in the queue (FIFO)
-            # Pop off first node in the current queue; once nodes in curr lvl set popped, next lvl set will be formed
-            node = queue.pop(0)
-            if node == target:  # Short circuit if found the target node
-                break
-
-            # Push all neighbors for the next level set onto queue, add to seen, add parent pointers etc
-            for neighbor in self.getChildren(node):
-                if neighbor not in visited:  # Make sure to not visit any already visited nodes
-                    parents[neighbor] = node
-                    queue.append(neighbor)
-                    visited.add(neighbor)
-
+        # Level-synchronous search that stops as soon as target is discovered, see bfsTree
+        _, parents = self.bfsTree([start], [target])
         if target not in parents:  # No path exists/target doesn't have a parent node
             return None
         # Invariant at this point is that start, target \in parents set, and so \exists a path from start~~>target
@@ -153,6 +282,89 @@ class Graph:
 
         return path[::-1]  # Reverse path so that it is from start to target
 
+    def bfsTree(self, sources, targets=None, alpha=14, beta=24):
+        """
+        Frontier-based (level-synchronous) BFS from one or more sources, computing the full distance and parent maps.
+        Direction-optimizing: each level is expanded either top-down (scan the out-edges of the frontier) or bottom-up
+        (every undiscovered vertex scans its in-edges for a frontier parent), whichever should touch fewer edges.
+        Switches to bottom-up when the frontier's out-edges exceed 1/alpha of the still unexplored edges, and back to
+        top-down once the frontier shrinks below 1/beta of the vertices (heuristic from Beamer et al.).
+        Runtime complexity: O(|V| + |E|) for a full search, + O(|E|) to build the in-edges the first time bottom-up is
+        used on this version of the graph (free with the reverse index on).
+        @param sources: iterable of source vertices, all at distance 0
+        @param targets: optional iterable of vertices; the search stops as soon as any of them is discovered
+        @param alpha: top-down -> bottom-up switching parameter
+        @param beta: bottom-up -> top-down switching parameter
+        @return: 1. mapping of each discovered vertex to its number of edges away from the nearest source
+                 2. mapping of each discovered vertex to its parent in the BFS tree (sources map to themselves)
+        """
+        inst = self.instrumentation
+        if inst is None:
+            return self._bfsTree(sources, targets, alpha, beta, None)
+        stats = {"levels": 0, "bottomUpLevels": 0, "edgesScanned": 0, "bottomUpVertexScans": 0}
+        with inst.phase("bfs", "search"):
+            d, parents = self._bfsTree(sources, targets, alpha, beta, stats)
+        inst.record("bfs", verticesDiscovered=len(d), **stats)
+        return d, parents
+
+    def _bfsTree(self, sources, targets, alpha, beta, stats):
+        """bfsTree's search, which also tallies per-level counters into stats unless it is None"""
+        targets = set() if targets is None else set(targets)
+        d, parents, frontier = {}, {}, []
+        for s in sources:
+            if s not in d:
+                d[s], parents[s] = 0, s
+                frontier.append(s)
+        if not targets.isdisjoint(frontier):
+            return d, parents
+
+        edges = self.edges
+        unexploredEdges = sum(len(children) for children in edges.values())
+        inEdges, unvisited, bottomUp, level = None, None, False, 0
+        while frontier:
+            level += 1
+            frontierEdges = sum(len(edges.get(u, ())) for u in frontier)
+            if not bottomUp and frontierEdges > unexploredEdges / alpha:
+                bottomUp = True
+            elif bottomUp and len(frontier) < len(self.vertices) / beta:
+                bottomUp = False
+            unexploredEdges -= frontierEdges
+
+            nextFrontier = []
+            if bottomUp:
+                if inEdges is None:
+                    with phaseTimer(self.instrumentation, "bfs")("inEdges"):
+                        inEdges = self._reverseAdjacency()
+                    unvisited = list(inEdges)
+                frontierSet = set(frontier)
+                unvisited = [v for v in unvisited if v not in d]
+                if stats is not None:
+                    stats["levels"] += 1
+                    stats["bottomUpLevels"] += 1
+                    stats["bottomUpVertexScans"] += len(unvisited)
+                for v in unvisited:
+                    for u in inEdges[v]:
+                        if u in frontierSet:  # First frontier parent found, no need to scan the rest of v's in-edges
+                            d[v], parents[v] = level, u
+                            nextFrontier.append(v)
+                            if v in targets:
+                                return d, parents
+                            break
+            else:
+                if stats is not None:
+                    stats["levels"] += 1
+                    stats["edgesScanned"] += frontierEdges
+                for u in frontier:
+                    for v in edges.get(u, ()):
+                        if v not in d:  # Make sure to not visit any already visited nodes
+                            d[v], parents[v] = level, u
+                            nextFrontier.append(v)
+                            if v in targets:  # Short circuit if found a target node
+                                return d, parents
+            frontier = nextFrontier
+
+        return d, parents
+
     def dfs(self, start, target):
         # Given graph/adjacency matrix/adjacency set, return *a* path from start to target, using depth-first search
         stack, visited, parents = [start], {start}, {start: start}
@@ -178,6 +390,77 @@ class Graph:
 
         return path[::-1]  # Reverse path so that it is from start to target
 
+    def stronglyConnectedComponents(self) -> tuple:
+        """
+        Tarjan's algorithm, with an explicit stack of (vertex, child iterator) frames instead of recursion, so long
+        chains don't hit the recursion limit. O(|V| + |E|).
+        @return: 1. mapping of every vertex to its component id. Ids are a topological order of the condensation, ie
+                    every edge (u, v) between different components has component[u] < component[v]
+                 2. list of components (lists of vertices), indexed by component id
+        """
+        index, lowLink = {}, {}
+        onStack, sccStack, components = set(), [], []
+        edges = self.edges
+        for root in self.vertices.union(edges):
+            if root in index:
+                continue
+            index[root] = lowLink[root] = len(index)
+            sccStack.append(root)
+            onStack.add(root)
+            frames = [(root, iter(edges.get(root, ())))]
+            while frames:
+                u, children = frames[-1]
+                for v in children:
+                    if v not in index:
+                        index[v] = lowLink[v] = len(index)
+                        sccStack.append(v)
+                        onStack.add(v)
+                        frames.append((v, iter(edges.get(v, ()))))
+                        break
+                    if v in onStack and index[v] < lowLink[u]:
+                        lowLink[u] = index[v]
+                else:  # Every child of u is done
+                    frames.pop()
+                    if frames:
+                        parent = frames[-1][0]
+                        lowLink[parent] = min(lowLink[parent], lowLink[u])
+                    if lowLink[u] == index[u]:  # u is the root of a component, pop it off the stack
+                        component = []
+                        while True:
+                            v = sccStack.pop()
+                            onStack.remove(v)
+                            component.append(v)
+                            if v == u:
+                                break
+                        components.append(component)
+
+        components.reverse()  # Tarjan's finds components in reverse topological order
+        componentOf = {v: i for i, component in enumerate(components) for v in component}
+        return componentOf, components
+
+    def condensation(self) -> tuple:
+        """
+        Contracts every strongly connected component into a single vertex, which leaves a DAG.
+        @return: 1. condensation Graph over Vertex(component id), with an edge (a, b) of the min weight among edges
+                    from component a to component b
+                 2. mapping of every vertex to its component id, see stronglyConnectedComponents
+                 3. list of components, indexed by component id
+        """
+        componentOf, components = self.stronglyConnectedComponents()
+        componentVertices = [Vertex(i) for i in range(len(components))]
+        C = Graph(componentVertices)
+        for u, children in self.edges.items():
+            a = componentOf[u]
+            for v, w in children.items():
+                b = componentOf[v]
+                if a != b:
+                    cu, cv = componentVertices[a], componentVertices[b]
+                    if cu not in C.edges:
+                        C.edges[cu] = {cv: w}
+                    elif cv not in C.edges[cu] or w < C.edges[cu][cv]:
+                        C.edges[cu][cv] = w
+        return C, componentOf, components
+
     def relax(self, u, v, d, p=None, pq=None, curr_d=None):
         """
         If current "shortest" distance from s to v is greater than shortest distance from s to u + w(u,v), then set
@@ -201,6 +484,7 @@ class Graph:
         @param p predecessor mapping, default to None
         @param pq priority queue of vertices ordered by key=distance
         @param curr_d current distance away from source
+        @return True if d(s,v) was lowered, False o/w
         """
         assert u in d and v in d and u in self.edges and v in self.edges[u]
         if d[v] > d[u] + self.edges[u][v]:
@@ -210,6 +494,8 @@ class Graph:
             if pq is not None:
                 assert curr_d is not None
                 heapq.heappush(pq, (curr_d + self.edges[u][v], v))
+            return True
+        return False
 
     def verifyDAG(self, s):
         """
@@ -230,38 +516,148 @@ class Graph:
 
         return traverse(s)
 
-    def dijkstra_SSSP(self, source):
+    def verifyNonNegativeWeights(self):
+        """
+        Dijkstra's algorithm is only correct if no edge has a negative weight, so check that in O(|E|).
+        Raises ValueError naming an offending edge o/w. A passing check is remembered until the version changes, so
+        repeated searches on an unchanged graph skip the scan.
+        """
+        if self._nonNegativeVersion == self.version:
+            return
+        for u, children in self.edges.items():
+            for v, w in children.items():
+                if w < 0:
+                    raise ValueError("Negative edge weight %r on edge %r, %r" % (w, u, v))
+        self._nonNegativeVersion = self.version
+
+    def _reverseAdjacency(self) -> dict:
+        """
+        @return: the reverse adjacency set {v: {u1: w1, u2: w2, ...}, ...}, ie the reverse index if it is on, o/w one
+            built in O(|E|) and reused until the version changes
+        """
+        if self.reverseEdges is not None:
+            return self.reverseEdges
+        if self._reverseCache is not None and self._reverseCache[0] == self.version:
+            return self._reverseCache[1]
+        reverseEdges = {}
+        for u, children in self.edges.items():
+            for v, w in children.items():
+                if v in reverseEdges:
+                    reverseEdges[v][u] = w
+                else:
+                    reverseEdges[v] = {u: w}
+        self._reverseCache = (self.version, reverseEdges)
+        return reverseEdges
+
+    def dijkstra_SSSP(self, source, target=None, arity=4):
         """
-        Dijkstra's algorithm for single-source shortest paths, given a start and target Vertex.
-        Note: graph must not contain any cycles with negative weights (for now, just restrict the graph to be a DAG)
-        Since this implementation uses heaps, our runtime complexity of Dijkstra's Algorithm is:
+        Dijkstra's algorithm for single-source shortest paths, given a source and optionally a target Vertex.
+        Note: graph must not contain any negative edge weights (checked once per version, raises ValueError o/w)
+        Since this implementation uses an indexed d-ary heap with a real decrease-key, every vertex is in the heap at
+        most once, and our runtime complexity of Dijkstra's Algorithm is:
         O(|E| * T(decrease_key()) + |V| * T(extract_min()))
-        -> O((|E| + |V|) log |V|)
-            since the heappush for decrease key and heappop's readjusting after extracting min are both O(log |V|). 
+        -> O(|E| log_d |V| + |V| d log_d |V|)
         @param source: source node
+        @param target: if specified, stop as soon as target is settled. Only d[target] and the distances of vertices
+            settled before it are then final
+        @param arity: number of children per heap node
         @return: 1. mapping of the shortest distances between source and every vertex (default d(s, s) <- 0)
                  2. mapping of every node to its parent in its corresponding shortest path (see: subpaths of SP's
                  are themselves SPs, and triangle inequality for why this works)
         """
-        self.verifyDAG(source)
+        phase = phaseTimer(self.instrumentation, "dijkstra_SSSP")
+        with phase("verify"):
+            self.verifyNonNegativeWeights()
         d = {}
         for v in self.vertices:
             d[v] = float('inf')
         d[source] = 0
-        visited = set()
-        priority_queue = [(0, source)]
         parentMap = {source: source}
-
-        while priority_queue:
-            curr_d, u = heapq.heappop(priority_queue)
-            if curr_d > d[u]:
-                continue
-            visited.add(u)
-            for v in self.getChildren(u):
-                self.relax(u, v, d, parentMap, priority_queue, curr_d)
-
+        priority_queue = IndexedDaryHeap(arity)
+        priority_queue.push(source, 0)
+        edges = self.edges
+
+        pops, edgesScanned, relaxations = 0, 0, 0
+        with phase("search"):
+            while priority_queue:
+                curr_d, u = priority_queue.pop()  # u is settled, d[u] is final
+                pops += 1
+                if u == target:
+                    break
+                children = edges.get(u, {})
+                edgesScanned += len(children)
+                for v, w in children.items():
+                    if d[v] > curr_d + w:
+                        d[v] = curr_d + w
+                        parentMap[v] = u
+                        priority_queue.pushOrDecrease(v, d[v])
+                        relaxations += 1
+
+        if self.instrumentation is not None:
+            # Every vertex with a parent was pushed exactly once, every other successful relaxation was a decrease-key
+            self.instrumentation.record("dijkstra_SSSP", heapPops=pops, heapPushes=len(parentMap),
+                                        decreaseKeys=relaxations - (len(parentMap) - 1), edgesScanned=edgesScanned,
+                                        relaxations=relaxations)
         return d, parentMap
 
+    def bidirectionalDijkstra(self, source, target, arity=4):
+        """
+        Point-to-point shortest path, alternating a forward Dijkstra from source with a backward Dijkstra from target
+        over the in-edges, always advancing the side whose next key is smaller. Let mu be the best s~~>t path length
+        seen over any edge joining the two search trees; once the two heap minimums sum to >= mu, no shorter path
+        can exist, so usually far fewer vertices are settled than in a one-sided search.
+        Note: graph must not contain any negative edge weights (raises ValueError o/w)
+        Both that check and the in-edges are computed once per version, so repeated queries on an unchanged graph
+        only pay for the two searches.
+        @param source: source node
+        @param target: target node
+        @return: 1. shortest distance from source to target, inf if target is unreachable
+                 2. list of vertices on a shortest path from source to target, None if unreachable
+        """
+        self.verifyNonNegativeWeights()
+        if source == target:
+            return 0, [source]
+        adjacency = (self.edges, self._reverseAdjacency())  # Backward search runs over {v: {u: w(u,v), ...}, ...}
+        dist = ({source: 0}, {target: 0})
+        parents = ({source: source}, {target: target})
+        settled = (set(), set())
+        heaps = (IndexedDaryHeap(arity), IndexedDaryHeap(arity))
+        heaps[0].push(source, 0)
+        heaps[1].push(target, 0)
+        mu, meet = float('inf'), None
+
+        while heaps[0] and heaps[1]:
+            if heaps[0].peek()[0] + heaps[1].peek()[0] >= mu:
+                break
+            side = 0 if heaps[0].peek()[0] <= heaps[1].peek()[0] else 1
+            other = 1 - side
+            curr_d, u = heaps[side].pop()
+            settled[side].add(u)
+            for v, w in adjacency[side].get(u, {}).items():
+                if v in settled[side]:
+                    continue
+                if curr_d + w < dist[side].get(v, float('inf')):
+                    dist[side][v] = curr_d + w
+                    parents[side][v] = u
+                    heaps[side].pushOrDecrease(v, curr_d + w)
+                # Edge (u, v) joins the two search trees, so it closes a candidate s~~>t path
+                if v in dist[other] and dist[side][v] + dist[other][v] < mu:
+                    mu, meet = dist[side][v] + dist[other][v], v
+
+        if meet is None:
+            return float('inf'), None
+        # Follow forward parents from the meeting vertex back to source, and backward parents on to target
+        i, path = meet, [meet]
+        while i != source:
+            i = parents[0][i]
+            path.append(i)
+        path.reverse()
+        i = meet
+        while i != target:
+            i = parents[1][i]
+            path.append(i)
+        return mu, path
+
     def bellmanFord_SSSP(self, source):
         """
         Bellman-Ford algorithm for single source shortest paths. Detects negative cycles in addition to providing
@@ -281,21 +677,91 @@ class Graph:
                  2. Mapping of the shortest distances between source and every vertex. None if negative cycle exists.
                  3. Mapping of predecessors, None if negative cycle exists
         """
+        phase = phaseTimer(self.instrumentation, "bellmanFord_SSSP")
         d, p = {}, {}  # Initialize sp distances mapping and predecessor mapping
         for v in self.vertices:
             d[v] = float('inf')
         d[source] = 0
 
-        for _ in self.vertices:
-            for u in self.edges:
-                for v in self.edges[u]:
-                    self.relax(u, v, d, p)
+        relaxations = 0
+        with phase("relaxation"):
+            for _ in self.vertices:
+                for u in self.edges:
+                    for v in self.edges[u]:
+                        relaxations += self.relax(u, v, d, p)
+
+        with phase("negativeCycleCheck"):
+            cycle = next((self.getCycle(v, p) for u in self.edges for v in self.edges[u]
+                          if d[v] > d[u] + self.getWeight(u, v)), None)
+
+        if self.instrumentation is not None:
+            numEdges = sum(len(children) for children in self.edges.values())
+            self.instrumentation.record("bellmanFord_SSSP", passes=len(self.vertices),
+                                        relaxCalls=len(self.vertices) * numEdges, relaxations=relaxations,
+                                        negativeCycles=int(cycle is not None))
+        if cycle is not None:
+            return cycle, None, None
+        return None, d, p
 
-        for u in self.edges:
-            for v in self.edges[u]:
-                if d[v] > d[u] + self.getWeight(u, v):
-                    return self.getCycle(v, p), None, None
+    def spfa_SSSP(self, source):
+        """
+        Queue-based Bellman-Ford (SPFA) for single source shortest paths, with Tarjan's subtree disassembly.
+        Same contract and return format as bellmanFord_SSSP, but only vertices whose distance just improved are
+        queued to have their out-edges relaxed, and it stops as soon as the queue empties (no distance changed).
+        The shortest path tree is kept explicitly: whenever d[v] improves, every descendant of v in the tree has a
+        stale distance, so the whole subtree is detached and its queued vertices skipped until they improve again.
+        If the improving edge (u, v) comes from inside v's own subtree, then u ~~> v -> ... closes a negative cycle,
+        which is reported right away instead of after |V| rounds.
+        Runtime complexity: O(|V||E|) worst case like Bellman-Ford, but typically close to O(|E|) in practice.
+        @param source: input source node
+        @return: 1. A negative cycle if it exists, as a list of vertices (first == last, like getCycle). None o/w
+                 2. Mapping of the shortest distances between source and every vertex. None if negative cycle exists.
+                 3. Mapping of predecessors, None if negative cycle exists
+        """
+        edges = self.edges
+        d, p = {source: 0}, {}
+        children = {source: set()}  # Shortest path tree, as parent -> set of children
+        inTree, inQueue = {source}, {source}
+        queue = deque([source])
+
+        while queue:
+            u = queue.popleft()
+            inQueue.remove(u)
+            if u not in inTree:  # Detached by a subtree disassembly since it was queued
+                continue
+            du = d[u]
+            for v, w in edges.get(u, {}).items():
+                if du + w >= d.get(v, float('inf')):
+                    continue
+                # Disassemble v's subtree, watching for u, in which case u ~~> v -> u is a negative cycle
+                if v in inTree:
+                    stack = [v]
+                    while stack:
+                        x = stack.pop()
+                        if x == u:
+                            cycle, i = [v], u
+                            while i != v:
+                                cycle.append(i)
+                                i = p[i]
+                            cycle.append(v)
+                            cycle.reverse()
+                            return cycle, None, None
+                        if x != v:
+                            inTree.remove(x)
+                        stack.extend(children.get(x, ()))
+                        children[x] = set()
+                    if v in p:
+                        children[p[v]].discard(v)
+                d[v], p[v] = du + w, u
+                children.setdefault(u, set()).add(v)
+                inTree.add(v)
+                if v not in inQueue:
+                    queue.append(v)
+                    inQueue.add(v)
 
+        for v in self.vertices:
+            if v not in d:
+                d[v] = float('inf')
         return None, d, p
 
     def getCycle(self, v, p):
@@ -345,6 +811,24 @@ class Graph:
 
             print("SSSP from source %r to node %r has distance %r and path %r" % (source, v, d[v], path[::-1]))
 
+class _TransposedGraph(Graph):
+    """The view returned by Graph.transpose(), which reads and bumps its base graph's version as its own"""
+    def __init__(self, base: Graph):
+        self.base = None  # Graph.__init__ sets the version, which has nowhere to go until base is set below
+        super().__init__(edges=base.reverseEdges)
+        self.vertices = base.vertices  # Shared, not copied
+        self.reverseEdges = base.edges  # The transpose of the transpose is the base graph
+        self.base = base
+
+    @property
+    def version(self):
+        return 0 if self.base is None else self.base.version
+
+    @version.setter
+    def version(self, value):
+        if self.base is not None:
+            self.base.version = value
+
 
 if __name__ == "__main__":
     a, b, c, d, e = Vertex("a"), Vertex("b"), Vertex("c"), Vertex("d"), Vertex("e")
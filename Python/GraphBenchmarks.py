@@ -0,0 +1,398 @@
+"""
+Timing benchmarks for Graph, run as a script:
+    python GraphBenchmarks.py                                   ad-hoc comparison tables
+    python GraphBenchmarks.py --suite out.json [--sizes small medium] [--baseline old.json]
+                                                                regression suite, see runSuite
+
+The suite runs every algorithm over reproducible synthetic graphs (grid, G(n,p), power-law, layered DAG, bipartite)
+at a few sizes, recording wall time and peak (Python heap) memory, and writes JSON that a later run can be compared
+against to flag regressions.
+
+@author: Bill Wu
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from Graph import Graph, Vertex
+from ContractionHierarchy import ContractionHierarchy
+from FlowNetwork import FlowNetwork
+from GraphFile import MappedGraph, readGraph, writeGraph
+from MST import MST
+from Topological_Sort import topological_order
+
+def randomEdgeList(numVertices: int, numEdges: int, seed: int = 0) -> list:
+    """Generates a reproducible list of (u, v, w) edges over raw integer vertices in [0, numVertices)"""
+    rng = random.Random(seed)
+    return [(rng.randrange(numVertices), rng.randrange(numVertices), rng.randrange(100)) for _ in range(numEdges)]
+
+def benchmarkBuild(edgeCounts: list, vertexRatio: int = 4) -> list:
+    """
+    Times building a Graph edge by edge with addEdge vs in bulk with Graph.fromEdgeList, for each edge count.
+    @param edgeCounts: list of edge counts to try, with |V| = |E| / vertexRatio
+    @param vertexRatio: average out-degree of the generated graphs
+    @return: list of (numEdges, addEdge seconds, fromEdgeList seconds)
+    """
+    results = []
+    for numEdges in edgeCounts:
+        edges = randomEdgeList(max(1, numEdges // vertexRatio), numEdges)
+
+        start = time.perf_counter()
+        G = Graph()
+        for u, v, w in edges:
+            G.addEdge(u, v, w)
+        addEdgeTime = time.perf_counter() - start
+
+        start = time.perf_counter()
+        Graph.fromEdgeList(edges)
+        bulkTime = time.perf_counter() - start
+        results.append((numEdges, addEdgeTime, bulkTime))
+    return results
+
+def gridEdgeList(rows: int, cols: int, seed: int = 0) -> list:
+    """Generates a road-like bidirectional grid over raw (row, col) vertices, with random weights in [1, 100)"""
+    rng = random.Random(seed)
+    edges = []
+    for r in range(rows):
+        for c in range(cols):
+            for nr, nc in ((r + 1, c), (r, c + 1)):
+                if nr < rows and nc < cols:
+                    edges.append(((r, c), (nr, nc), rng.randrange(1, 100)))
+                    edges.append(((nr, nc), (r, c), rng.randrange(1, 100)))
+    return edges
+
+def benchmarkContractionHierarchy(gridSizes: list, numQueries: int = 100, seed: int = 0) -> list:
+    """
+    Times contraction hierarchy preprocessing, and average point-to-point query latency of CH vs Dijkstra's
+    (stopping once the target is settled), on random queries over square grids.
+    @param gridSizes: list of grid side lengths
+    @param numQueries: number of random (source, target) pairs per grid
+    @return: list of (|V|, preprocessing seconds, avg CH query ms, avg Dijkstra query ms)
+    """
+    results = []
+    rng = random.Random(seed)
+    for side in gridSizes:
+        G = Graph.fromEdgeList(gridEdgeList(side, side, seed))
+        start = time.perf_counter()
+        CH = ContractionHierarchy.build(G)
+        preprocessTime = time.perf_counter() - start
+
+        randomVertex = lambda: Vertex((rng.randrange(side), rng.randrange(side)))
+        queries = [(randomVertex(), randomVertex()) for _ in range(numQueries)]
+        start = time.perf_counter()
+        for s, t in queries:
+            CH.query(s, t)
+        chTime = time.perf_counter() - start
+        start = time.perf_counter()
+        for s, t in queries:
+            G.dijkstra_SSSP(s, target=t)
+        dijkstraTime = time.perf_counter() - start
+        results.append((len(G.vertices), preprocessTime, 1000 * chTime / numQueries, 1000 * dijkstraTime / numQueries))
+    return results
+
+def benchmarkSerialization(edgeCounts: list, vertexRatio: int = 4, numQueries: int = 1000, seed: int = 0) -> list:
+    """
+    Compares the JSON path (Graph.serialize + json.dump, json.load + Graph.deserialize) with the binary GraphFile
+    format: write time, size on disk, full load time, and the time to open the binary file with mmap and answer
+    random getChildren queries without loading it.
+    @param edgeCounts: list of edge counts to try, with |V| = |E| / vertexRatio
+    @param numQueries: number of random getChildren queries against the mapped file
+    @return: list of (numEdges, JSON write s, JSON bytes, JSON load s, binary write s, binary bytes, binary load s,
+                      mmap open + queries s)
+    """
+    results = []
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        jsonPath, binaryPath = os.path.join(tmp, "graph.json"), os.path.join(tmp, "graph.csrg")
+        for numEdges in edgeCounts:
+            numVertices = max(1, numEdges // vertexRatio)
+            G = Graph.fromEdgeList(randomEdgeList(numVertices, numEdges, seed))
+
+            start = time.perf_counter()
+            with open(jsonPath, "w") as out:
+                json.dump(G.serialize(), out)
+            jsonWrite = time.perf_counter() - start
+            start = time.perf_counter()
+            with open(jsonPath) as f:
+                Graph.deserialize(json.load(f))
+            jsonLoad = time.perf_counter() - start
+
+            start = time.perf_counter()
+            writeGraph(G, binaryPath)
+            binaryWrite = time.perf_counter() - start
+            start = time.perf_counter()
+            readGraph(binaryPath)
+            binaryLoad = time.perf_counter() - start
+
+            queries = [Vertex(rng.randrange(numVertices)) for _ in range(numQueries)]
+            start = time.perf_counter()
+            with MappedGraph(binaryPath) as M:
+                for v in queries:
+                    if v in M:
+                        list(M.getChildren(v))
+            mappedQueries = time.perf_counter() - start
+            results.append((numEdges, jsonWrite, os.path.getsize(jsonPath), jsonLoad,
+                            binaryWrite, os.path.getsize(binaryPath), binaryLoad, mappedQueries))
+    return results
+
+def gnpEdgeList(n: int, p: float, seed: int = 0) -> list:
+    """
+    Erdos-Renyi G(n, p) directed graph over [0, n) without self loops, weights in [1, 100). Generated in
+    O(n + |E|) by skipping geometrically distributed gaps between edges (Batagelj-Brandes) instead of n^2 coin flips.
+    """
+    rng = random.Random(seed)
+    edges = []
+    if p <= 0:
+        return edges
+    logq = math.log(1 - p) if p < 1 else None
+    i = -1
+    while True:
+        # Skip ahead to the next present (u, v) pair in the row-major order of all n * (n - 1) candidate pairs
+        i += 1 if logq is None else 1 + int(math.log(1 - rng.random()) / logq)
+        if i >= n * (n - 1):
+            return edges
+        u, v = divmod(i, n - 1)
+        edges.append((u, v + (v >= u), rng.randrange(1, 100)))
+
+def powerLawEdgeList(n: int, degree: int = 3, seed: int = 0) -> list:
+    """
+    Barabasi-Albert preferential attachment: every new vertex links to `degree` existing vertices picked with
+    probability proportional to their degree, giving a power-law degree distribution. Edges point from the new vertex,
+    with weights in [1, 100).
+    """
+    rng = random.Random(seed)
+    edges, endpoints = [], list(range(min(n, degree)))  # Each vertex appears once per incident edge (+ once to start)
+    for u in range(len(endpoints), n):
+        targets = {rng.choice(endpoints) for _ in range(degree)}
+        for v in targets:
+            edges.append((u, v, rng.randrange(1, 100)))
+            endpoints.append(v)
+        endpoints.extend([u] * (len(targets) + 1))
+    return edges
+
+def layeredDAGEdgeList(layers: int, width: int, degree: int = 3, seed: int = 0) -> list:
+    """DAG of `layers` layers of `width` vertices (layer, i), each with `degree` edges into the next layer"""
+    rng = random.Random(seed)
+    return [((layer, i), (layer + 1, j), rng.randrange(1, 100))
+            for layer in range(layers - 1) for i in range(width) for j in rng.sample(range(width), min(degree, width))]
+
+def bipartiteFlowNetwork(left: int, right: int, p: float, seed: int = 0) -> FlowNetwork:
+    """
+    Bipartite matching as a unit capacity flow network: source -> ("L", i) -> ("R", j) -> sink, with each left-right
+    edge present with probability p and a cost in [1, 10)
+    """
+    rng = random.Random(seed)
+    source, sink = Vertex("source"), Vertex("sink")
+    F = FlowNetwork(source, sink)
+    lefts, rights = [Vertex(("L", i)) for i in range(left)], [Vertex(("R", j)) for j in range(right)]
+    for u in lefts:
+        F.addEdge(source, u, 1, 0)
+    for v in rights:
+        F.addEdge(v, sink, 1, 0)
+    for u in lefts:
+        for v in rights:
+            if rng.random() < p:
+                F.addEdge(u, v, 1, rng.randrange(1, 10))
+    return F
+
+def flowNetworkFromEdgeList(edges: list, source, sink, maxCapacity: int = 100, seed: int = 0) -> FlowNetwork:
+    """
+    Flow network over a weighted edge list, with the weights as costs and capacities in [1, maxCapacity].
+    Antiparallel edges are kept, since every solver handles them as separate arc pairs.
+    """
+    rng = random.Random(seed)
+    F = FlowNetwork(Vertex(source), Vertex(sink))
+    for u, v, w in edges:
+        F.addEdge(Vertex(u), Vertex(v), rng.randint(1, maxCapacity), w)
+    return F
+
+def denseFlowNetwork(n: int, p: float = 0.5, seed: int = 0) -> FlowNetwork:
+    """G(n, p) flow network from vertex 0 to vertex n - 1, see flowNetworkFromEdgeList"""
+    return flowNetworkFromEdgeList(gnpEdgeList(n, p, seed), 0, n - 1, seed=seed)
+
+def layeredFlowNetwork(layers: int, width: int, degree: int = 3, seed: int = 0) -> FlowNetwork:
+    """Layered DAG flow network, with a source into every vertex of the first layer and a sink out of the last"""
+    edges = layeredDAGEdgeList(layers, width, degree, seed)
+    edges += [("source", (0, i), 0) for i in range(width)] + [((layers - 1, i), "sink", 0) for i in range(width)]
+    return flowNetworkFromEdgeList(edges, "source", "sink", seed=seed)
+
+# Generator name -> size name -> function() returning an edge list (or a FlowNetwork for the flow generators)
+SUITE_GRAPHS = {
+    "grid": {"small": lambda: gridEdgeList(20, 20), "medium": lambda: gridEdgeList(100, 100),
+             "large": lambda: gridEdgeList(300, 300)},
+    "gnp": {"small": lambda: gnpEdgeList(500, 0.006), "medium": lambda: gnpEdgeList(10000, 0.0005),
+            "large": lambda: gnpEdgeList(100000, 0.00005)},
+    "powerLaw": {"small": lambda: powerLawEdgeList(500), "medium": lambda: powerLawEdgeList(10000),
+                 "large": lambda: powerLawEdgeList(100000)},
+    "layeredDAG": {"small": lambda: layeredDAGEdgeList(10, 50), "medium": lambda: layeredDAGEdgeList(50, 200),
+                   "large": lambda: layeredDAGEdgeList(100, 1000)},
+    "bipartite": {"small": lambda: bipartiteFlowNetwork(50, 50, 0.1),
+                  "medium": lambda: bipartiteFlowNetwork(150, 150, 0.05),
+                  "large": lambda: bipartiteFlowNetwork(400, 400, 0.02)},
+    "denseFlow": {"small": lambda: denseFlowNetwork(30), "medium": lambda: denseFlowNetwork(100),
+                  "large": lambda: denseFlowNetwork(300)},
+    "layeredFlow": {"small": lambda: layeredFlowNetwork(5, 20), "medium": lambda: layeredFlowNetwork(10, 50),
+                    "large": lambda: layeredFlowNetwork(20, 100)},
+}
+
+# Bellman-Ford is O(|V||E|), so it is only run when that product is at most this
+BELLMAN_FORD_MAX_WORK = 10 ** 6
+
+def _suiteTasks(generator: str, data) -> list:
+    """@return: list of (algorithm name, |V|, |E|, function() to time) to run on one generated input"""
+    if isinstance(data, FlowNetwork):
+        F = data
+        numEdges, numVertices = F.arcs.numEdges(), F.arcs.numVertices()
+        # These all mutate the network's flow, so each run gets a fresh copy
+        fresh = lambda: FlowNetwork(F.source, F.sink, F.capacityGraph.vertices,
+                                    {u: dict(children) for u, children in F.capacityGraph.edges.items()},
+                                    {u: dict(children) for u, children in F.cost.items()})
+        return [("maxFlow", numVertices, numEdges, lambda: fresh().getMaxFlow()),
+                ("maxFlowDinic", numVertices, numEdges, lambda: fresh().getMaxFlow(algorithm="dinic")),
+                ("maxFlowPushRelabel", numVertices, numEdges, lambda: fresh().getMaxFlow(algorithm="pushRelabel")),
+                ("minCostMaxFlow", numVertices, numEdges, lambda: fresh().getMinCostMaxFlow()),
+                ("minCostMaxFlowSSP", numVertices, numEdges,
+                 lambda: fresh().getMinCostMaxFlow(algorithm="successiveShortestPaths")),
+                ("minCostMaxFlowNetworkSimplex", numVertices, numEdges,
+                 lambda: fresh().getMinCostMaxFlow(algorithm="networkSimplex")),
+                ("minCostMaxFlowCostScaling", numVertices, numEdges,
+                 lambda: fresh().getMinCostMaxFlow(algorithm="costScaling")),
+                ("minCostMaxFlowCapacityScaling", numVertices, numEdges,
+                 lambda: fresh().getMinCostMaxFlow(algorithm="capacityScaling"))]
+
+    edges = data
+    G = Graph.fromEdgeList(edges)
+    n, m = len(G.vertices), sum(len(children) for children in G.edges.values())
+    # Preferential attachment edges point from newer to older vertices, so only the newest reaches most of the graph
+    source = Vertex(edges[-1][0] if generator == "powerLaw" else edges[0][0])
+    far = Vertex(edges[-1][1])
+    tasks = [("construction", n, m, lambda: Graph.fromEdgeList(edges)),
+             ("bfs", n, m, lambda: G.bfsTree([source])),
+             ("dfs", n, m, lambda: G.dfs(source, far)),
+             ("dijkstra", n, m, lambda: G.dijkstra_SSSP(source))]
+    if n * m <= BELLMAN_FORD_MAX_WORK:
+        tasks.append(("bellmanFord", n, m, lambda: G.bellmanFord_SSSP(source)))
+    if generator == "layeredDAG":
+        tasks.append(("topologicalSort", n, m, lambda: list(topological_order(G))))
+    if generator == "grid":  # Symmetric edges, ie effectively undirected
+        tasks.append(("mst", n, m, lambda: MST(G)))
+    return tasks
+
+def _measure(fn, repeat: int, measureMemory: bool) -> tuple:
+    """@return: (best wall time of repeat runs in seconds, peak traced memory of one more run in bytes or None)"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    peak = None
+    if measureMemory:  # Separate run, since tracing allocations slows everything down
+        tracemalloc.start()
+        try:
+            fn()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return best, peak
+
+def runSuite(sizes=("small",), generators=None, repeat: int = 3, measureMemory: bool = True, log=None) -> list:
+    """
+    Times every algorithm that applies to each generated graph.
+    @param sizes: size names to run, any of "small", "medium", "large"
+    @param generators: generator names to run (keys of SUITE_GRAPHS), all by default
+    @param repeat: timed runs per benchmark, the best is kept
+    @param measureMemory: also record peak memory allocated during one extra run, via tracemalloc
+    @param log: optional callback(result) invoked after each benchmark, eg print
+    @return: list of results {"generator", "size", "algorithm", "vertices", "edges", "seconds", "peakMemoryBytes"}
+    """
+    results = []
+    for generator in (SUITE_GRAPHS if generators is None else generators):
+        for size in sizes:
+            data = SUITE_GRAPHS[generator][size]()
+            for algorithm, numVertices, numEdges, fn in _suiteTasks(generator, data):
+                seconds, peak = _measure(fn, repeat, measureMemory)
+                result = {"generator": generator, "size": size, "algorithm": algorithm, "vertices": numVertices,
+                          "edges": numEdges, "seconds": seconds, "peakMemoryBytes": peak}
+                results.append(result)
+                if log is not None:
+                    log(result)
+    return results
+
+def writeResults(results: list, outPath: str):
+    """Writes suite results, along with the environment they were measured in, as JSON (overwrites contents)"""
+    with open(outPath, "w") as out:
+        json.dump({"python": platform.python_version(), "platform": platform.platform(), "time": time.time(),
+                   "results": results}, out, indent=1)
+
+def compareResults(baseline: list, results: list, threshold: float = 1.25) -> list:
+    """
+    Flags benchmarks that got slower (or used more memory) than baseline by more than threshold times.
+    @param baseline: results of an earlier runSuite, eg json.load(f)["results"] of a writeResults file
+    @return: list of (generator, size, algorithm, metric, baseline value, new value) regressions
+    """
+    key = lambda r: (r["generator"], r["size"], r["algorithm"])
+    old = {key(r): r for r in baseline}
+    regressions = []
+    for r in results:
+        if key(r) not in old:
+            continue
+        for metric in ("seconds", "peakMemoryBytes"):
+            before, after = old[key(r)].get(metric), r.get(metric)
+            if before and after and after > threshold * before:
+                regressions.append((*key(r), metric, before, after))
+    return regressions
+
+
+def _suiteMain(args):
+    def log(result):
+        peak = result["peakMemoryBytes"]
+        print("%-10s %-6s %-15s %8d %8d %10.4fs %12s" % (
+            result["generator"], result["size"], result["algorithm"], result["vertices"], result["edges"],
+            result["seconds"], "-" if peak is None else "%.2f MB" % (peak / 1e6)))
+
+    results = runSuite(args.sizes, args.generators, args.repeat, not args.noMemory, log)
+    writeResults(results, args.suite)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compareResults(json.load(f)["results"], results, args.threshold)
+        for generator, size, algorithm, metric, before, after in regressions:
+            print("REGRESSION %s/%s/%s %s: %.4g -> %.4g" % (generator, size, algorithm, metric, before, after))
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--suite", metavar="OUT_JSON", help="run the regression suite and write its results here")
+    parser.add_argument("--sizes", nargs="+", default=["small"], choices=["small", "medium", "large"])
+    parser.add_argument("--generators", nargs="+", choices=sorted(SUITE_GRAPHS))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--noMemory", action="store_true", help="skip peak memory measurement")
+    parser.add_argument("--baseline", metavar="OLD_JSON", help="earlier --suite output to check for regressions")
+    parser.add_argument("--threshold", type=float, default=1.25, help="slowdown factor counted as a regression")
+    args = parser.parse_args()
+    if args.suite:
+        sys.exit(_suiteMain(args))
+
+    print("Graph build time vs edge count")
+    print("%10s %14s %14s" % ("|E|", "addEdge (s)", "bulk (s)"))
+    for numEdges, addEdgeTime, bulkTime in benchmarkBuild([10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6]):
+        print("%10d %14.4f %14.4f" % (numEdges, addEdgeTime, bulkTime))
+
+    print("\nContraction hierarchy vs Dijkstra's on grids")
+    print("%10s %16s %14s %18s" % ("|V|", "preprocess (s)", "CH query (ms)", "Dijkstra query (ms)"))
+    for numVertices, preprocessTime, chTime, dijkstraTime in benchmarkContractionHierarchy([10, 30, 60]):
+        print("%10d %16.3f %14.3f %18.3f" % (numVertices, preprocessTime, chTime, dijkstraTime))
+
+    print("\nJSON vs binary graph files")
+    print("%10s %12s %12s %12s %12s %12s %12s %16s" % ("|E|", "JSON write", "JSON bytes", "JSON load",
+                                                       "bin write", "bin bytes", "bin load", "mmap queries"))
+    for row in benchmarkSerialization([10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6]):
+        print("%10d %12.4f %12d %12.4f %12.4f %12d %12.4f %16.4f" % row)
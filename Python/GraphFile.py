@@ -0,0 +1,235 @@
+"""
+Compact binary on-disk format for Graph, designed to be opened with mmap and queried in place.
+
+Layout (all integers little-endian, every section starts on an 8 byte boundary):
+    header:         magic b"CSRG", version u32, targets typecode, weights typecode (array typecodes, 1 byte each),
+                    2 padding bytes, |V| u64, |E| u64, byte offsets of the 6 sections below (u64 each)
+    vertex index:   |V| + 1 int64 byte offsets into the vertex blob
+    vertex blob:    JSON encoding of each vertex's value, back to back (tuples are restored on read)
+    vertex lookup:  |V| vertex ids sorted by the JSON encoding (as bytes) of their value with numbers normalized (see
+                    _lookupKey), same int type as the targets, so a vertex's id is found by binary search
+    CSR offsets:    |V| + 1 int64, out-edges of vertex id u are edges [offsets[u], offsets[u + 1])
+    CSR targets:    |E| target vertex ids, int32 when |V| < 2^31 (ie nearly always) and int64 o/w
+    CSR weights:    |E| edge weights, int32 if they all fit, o/w int64 for integral weights and float64 for the rest
+The CSR sections are CompactGraph's arrays (narrowed where possible), so MappedGraph exposes them as zero-copy
+memoryviews over the mapped file: opening a file is O(1), and a query only pages in the parts of the file it touches.
+
+@author: Bill Wu
+"""
+
+import json
+import mmap
+import struct
+import sys
+from array import array
+from CompactGraph import CompactGraph
+from Graph import Graph, Vertex
+
+MAGIC = b"CSRG"
+VERSION = 3
+HEADER = struct.Struct("<4sIcc2xQQQQQQQQ")
+TYPECODE_SIZES = {'i': 4, 'q': 8, 'd': 8}  # 'i' is 4 bytes on every platform CPython supports
+
+class GraphFileException(Exception):
+    pass
+
+def _encodeValue(val) -> bytes:
+    return json.dumps(val, separators=(",", ":")).encode("utf-8")
+
+def _normalized(val):
+    """Maps equal numbers to one representative (True, 1.0 -> 1), since Vertex(1) == Vertex(1.0) == Vertex(True)"""
+    if isinstance(val, tuple):
+        return tuple(_normalized(x) for x in val)
+    if isinstance(val, bool) or (isinstance(val, float) and val.is_integer()):
+        return int(val)
+    return val
+
+def _lookupKey(val) -> bytes:
+    """Sort key of the vertex lookup section, the same for every value that makes an equal Vertex"""
+    return _encodeValue(_normalized(val))
+
+def _toTuple(x):
+    """JSON turns tuples into lists, but Vertex values must be immutable (hashable), so turn them back"""
+    return tuple(_toTuple(y) for y in x) if isinstance(x, list) else x
+
+def _decodeValue(data: bytes):
+    return _toTuple(json.loads(data.decode("utf-8")))
+
+def _padding(n: int) -> bytes:
+    return b"\0" * (-n % 8)
+
+def _narrowest(arr: array) -> array:
+    """Downcasts an int64 array to int32 when every value fits, halving its size on disk"""
+    if arr.typecode == 'q' and (not arr or (min(arr) >= -2 ** 31 and max(arr) < 2 ** 31)):
+        return array('i', arr)
+    return arr
+
+def _littleEndianBytes(arr: array) -> bytes:
+    if sys.byteorder != "little":
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    return arr.tobytes()
+
+def writeGraph(G, outPath: str):
+    """
+    Writes a Graph (or CompactGraph) to outPath in the binary format above (overwrites contents).
+    Vertex values must be JSON serializable (str, int, float, bool, None, or tuples of those).
+    """
+    C = G if isinstance(G, CompactGraph) else G.freeze()
+    encoded = [_encodeValue(v.val) for v in C.getVertices()]
+    blob, vertexIndex = bytearray(), array('q', [0])
+    for data in encoded:
+        blob += data
+        vertexIndex.append(len(blob))
+    idType = 'i' if C.numVertices() < 2 ** 31 else 'q'
+    keys = [_lookupKey(v.val) for v in C.getVertices()]
+    lookup = array(idType, sorted(range(C.numVertices()), key=keys.__getitem__))
+    targets = array(idType, C.targets)
+    weights = _narrowest(C.weights)
+
+    sections = [_littleEndianBytes(vertexIndex), bytes(blob), _littleEndianBytes(lookup), _littleEndianBytes(C.offsets),
+                _littleEndianBytes(targets), _littleEndianBytes(weights)]
+    sectionOffsets, position = [], HEADER.size + len(_padding(HEADER.size))
+    for section in sections:
+        sectionOffsets.append(position)
+        position += len(section) + len(_padding(len(section)))
+
+    with open(outPath, "wb") as out:
+        header = HEADER.pack(MAGIC, VERSION, targets.typecode.encode(), weights.typecode.encode(),
+                             C.numVertices(), C.numEdges(), *sectionOffsets)
+        out.write(header + _padding(len(header)))
+        for section in sections:
+            out.write(section + _padding(len(section)))
+
+def readGraph(inPath: str) -> Graph:
+    """Loads a binary graph file fully into a new Graph"""
+    with MappedGraph(inPath) as M:
+        return M.toGraph()
+
+class MappedGraph:
+    """
+    Read-only view of a binary graph file through mmap. Has CompactGraph's query interface (getChildren, getWeight,
+    plus id-based access through the offsets/targets/weights memoryviews), without reading the whole file.
+    Close it (or use it as a context manager) once done, which also invalidates the memoryviews.
+    """
+    def __init__(self, inPath: str):
+        self.file = open(inPath, "rb")
+        try:
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # Empty file
+            self.file.close()
+            raise GraphFileException("Not a binary graph file: %s" % inPath)
+        if len(self.map) < HEADER.size:
+            self.close()
+            raise GraphFileException("Not a binary graph file: %s" % inPath)
+        magic, version, targetsType, weightsType, self.n, self.m, *sectionOffsets = HEADER.unpack_from(self.map)
+        targetsType, weightsType = targetsType.decode("latin-1"), weightsType.decode("latin-1")
+        if magic != MAGIC or version != VERSION or not {targetsType, weightsType} <= TYPECODE_SIZES.keys():
+            self.close()
+            raise GraphFileException("Not a binary graph file (or unsupported version): %s" % inPath)
+        self.weightsType = 'd' if weightsType == 'd' else 'q'  # In memory, integral weights are int64 like CompactGraph
+        indexStart, self.blobStart, lookupStart, offsetsStart, targetsStart, weightsStart = sectionOffsets
+
+        self.views = []
+        self.vertexIndex = self._section(indexStart, 'q', self.n + 1)
+        self.lookup = self._section(lookupStart, targetsType, self.n)
+        self.offsets = self._section(offsetsStart, 'q', self.n + 1)
+        self.targets = self._section(targetsStart, targetsType, self.m)
+        self.weights = self._section(weightsStart, weightsType, self.m)
+
+    def _section(self, start: int, typecode: str, length: int):
+        """Zero-copy typed view of a section, or a byte swapped copy on big-endian hosts"""
+        if sys.byteorder != "little":
+            arr = array(typecode, self.map[start:start + length * TYPECODE_SIZES[typecode]])
+            arr.byteswap()
+            return arr
+        view = memoryview(self.map)[start:start + length * TYPECODE_SIZES[typecode]].cast(typecode)
+        self.views.append(view)
+        return view
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
+
+    def close(self):
+        for view in getattr(self, "views", []):
+            view.release()
+        self.views = []
+        self.map.close()
+        self.file.close()
+
+    def numVertices(self) -> int:
+        return self.n
+
+    def numEdges(self) -> int:
+        return self.m
+
+    def _encodedVertex(self, i: int) -> bytes:
+        return self.map[self.blobStart + self.vertexIndex[i]:self.blobStart + self.vertexIndex[i + 1]]
+
+    def _storedLookupKey(self, i: int) -> bytes:
+        """Vertex id i's lookup key, which is its stored encoding unless that holds a float or bool to normalize"""
+        data = self._encodedVertex(i)
+        return _lookupKey(_decodeValue(data)) if any(c in data for c in (b".", b"e", b"E")) else data
+
+    def getVertex(self, i: int) -> Vertex:
+        """Decodes only vertex id i's value from the blob"""
+        return Vertex(_decodeValue(self._encodedVertex(i)))
+
+    def getVertices(self) -> list:
+        return [self.getVertex(i) for i in range(self.n)]
+
+    def getId(self, v: Vertex) -> int:
+        """
+        Vertex -> id, by binary search of the vertex lookup section for v's lookup key, in O(log |V|) comparisons
+        that each decode only the probed vertex. Numbers are normalized on both sides, so eg Vertex(1.0) and
+        Vertex(True) find a vertex written as Vertex(1), just as they would in a Graph
+        """
+        if not isinstance(v, Vertex):
+            raise ValueError("Vertex not present in graph: %r" % (v,))
+        key = _lookupKey(v.val)
+        lo, hi = 0, self.n
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._storedLookupKey(self.lookup[mid]) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo == self.n or self._storedLookupKey(self.lookup[lo]) != key:
+            raise ValueError("Vertex not present in graph: %r" % (v,))
+        return self.lookup[lo]
+
+    def __contains__(self, item):
+        try:
+            self.getId(item)
+        except ValueError:
+            return False
+        return True
+
+    def getChildren(self, u: Vertex):
+        i = self.getId(u)
+        return (self.getVertex(self.targets[e]) for e in range(self.offsets[i], self.offsets[i + 1]))
+
+    def getWeight(self, u: Vertex, v: Vertex):
+        i, j = self.getId(u), self.getId(v)
+        for e in range(self.offsets[i], self.offsets[i + 1]):
+            if self.targets[e] == j:
+                return self.weights[e]
+        raise ValueError("Edge not present in graph: %r, %r" % (u, v))
+
+    def toCompactGraph(self) -> CompactGraph:
+        """Copies the file's contents into an in-memory CompactGraph (which stays valid after close())"""
+        return CompactGraph(self.getVertices(), array('q', self.offsets), array('q', self.targets),
+                            array(self.weightsType, self.weights))
+
+    def toGraph(self) -> Graph:
+        """Loads the whole file into a new Graph"""
+        vertices = self.getVertices()
+        offsets, targets, weights = self.offsets, self.targets, self.weights
+        G = Graph(vertices)
+        for u in range(self.n):
+            if offsets[u] != offsets[u + 1]:
+                G.edges[vertices[u]] = {vertices[targets[e]]: weights[e] for e in range(offsets[u], offsets[u + 1])}
+        return G
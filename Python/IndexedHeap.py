@@ -0,0 +1,113 @@
+"""
+Indexed d-ary min-heap, used as the priority queue for Dijkstra's algorithm and friends.
+
+Each item appears in the heap at most once, and a position index (item -> slot in the heap list) lets decreaseKey
+sift the item up in place instead of pushing a duplicate entry like the lazy heapq approach. A d-ary layout (default
+4 children per node) makes the tree shallower, so decreaseKey, the most common operation in Dijkstra on sparse
+graphs, does fewer comparisons, at the cost of a few more comparisons per pop.
+    push/decreaseKey: O(log_d n), pop: O(d log_d n), contains/getKey: O(1)
+
+@author: Bill Wu
+"""
+
+class IndexedDaryHeap:
+    def __init__(self, arity: int = 4):
+        assert arity >= 2
+        self.arity = arity
+        self.heap = []  # Items in heap order, heap[0] has the minimum key
+        self.keys = {}  # item -> current key
+        self.pos = {}  # item -> index of item in self.heap
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __contains__(self, item):
+        return item in self.pos
+
+    def getKey(self, item):
+        return self.keys[item]
+
+    def peek(self) -> tuple:
+        """@return: (key, item) with the minimum key, without removing it"""
+        item = self.heap[0]
+        return self.keys[item], item
+
+    def push(self, item, key):
+        """Inserts an item not already in the heap. Raises ValueError if the item is already present."""
+        if item in self.pos:
+            raise ValueError("Item already in heap: %r" % (item,))
+        self.keys[item] = key
+        self.pos[item] = len(self.heap)
+        self.heap.append(item)
+        self._siftUp(len(self.heap) - 1)
+
+    def decreaseKey(self, item, key):
+        """Lowers the key of an item already in the heap. Raises ValueError if the new key is larger."""
+        if key > self.keys[item]:
+            raise ValueError("New key %r is larger than current key %r" % (key, self.keys[item]))
+        self.keys[item] = key
+        self._siftUp(self.pos[item])
+
+    def pushOrDecrease(self, item, key) -> bool:
+        """
+        Inserts the item with the given key, or lowers its key if it is already present with a larger one.
+        @return: True if the heap changed, False if the item was already present with a key <= key
+        """
+        if item not in self.pos:
+            self.push(item, key)
+            return True
+        if key < self.keys[item]:
+            self.decreaseKey(item, key)
+            return True
+        return False
+
+    def pop(self) -> tuple:
+        """Removes and returns (key, item) with the minimum key. Raises IndexError if the heap is empty."""
+        heap = self.heap
+        top = heap[0]
+        last = heap.pop()
+        if heap:
+            heap[0] = last
+            self.pos[last] = 0
+            self._siftDown(0)
+        del self.pos[top]
+        return self.keys.pop(top), top
+
+    def _siftUp(self, i: int):
+        heap, keys, pos, arity = self.heap, self.keys, self.pos, self.arity
+        item = heap[i]
+        key = keys[item]
+        while i > 0:
+            parentIdx = (i - 1) // arity
+            parent = heap[parentIdx]
+            if keys[parent] <= key:
+                break
+            heap[i] = parent  # Move the parent down a level, and keep looking for item's slot further up
+            pos[parent] = i
+            i = parentIdx
+        heap[i] = item
+        pos[item] = i
+
+    def _siftDown(self, i: int):
+        heap, keys, pos, arity = self.heap, self.keys, self.pos, self.arity
+        n = len(heap)
+        item = heap[i]
+        key = keys[item]
+        while True:
+            firstChild = arity * i + 1
+            if firstChild >= n:
+                break
+            # Find the child with the smallest key among the (up to arity) children
+            minIdx = firstChild
+            minKey = keys[heap[firstChild]]
+            for c in range(firstChild + 1, min(firstChild + arity, n)):
+                childKey = keys[heap[c]]
+                if childKey < minKey:
+                    minIdx, minKey = c, childKey
+            if key <= minKey:
+                break
+            heap[i] = heap[minIdx]
+            pos[heap[i]] = i
+            i = minIdx
+        heap[i] = item
+        pos[item] = i
@@ -0,0 +1,72 @@
+"""
+Opt-in counters and phase timings for the hot paths of Graph and FlowNetwork.
+
+Instrumented algorithms keep their counts in plain local ints (per vertex or per successful relaxation, never an extra
+call per edge) and hand them over once at the end of a run, and only time phases when an Instrumentation is attached.
+So with instrumentation off, which is the default, the cost is a few integer additions per vertex.
+
+Usage:
+    inst = G.instrument(Instrumentation(callback=lambda algorithm, counters, timings: ...))
+    G.dijkstra_SSSP(s)
+    inst.asDict()  # {"counters": {"dijkstra_SSSP.heapPops": ..., ...}, "timings": {"dijkstra_SSSP.search": ...}}
+    G.instrument(None)  # Turns it back off
+
+Counters and timings accumulate across runs under "<algorithm>.<name>" keys, and the callback (eg a metrics pipeline
+hook) receives each run's own counters and timings as it finishes.
+
+@author: Bill Wu
+"""
+
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager, nullcontext
+
+class Instrumentation:
+    def __init__(self, callback=None):
+        """
+        @param callback: optional callback(algorithm: str, counters: dict, timings: dict), invoked after every
+            instrumented run with that run's counters and phase timings (in seconds)
+        """
+        self.callback = callback
+        self.counters = Counter()
+        self.timings = defaultdict(float)
+        self.runTimings = defaultdict(float)  # Phase timings of the runs in progress, until they are recorded
+
+    @contextmanager
+    def phase(self, algorithm: str, name: str):
+        """Times the enclosed block as phase name of algorithm's current run"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.runTimings[(algorithm, name)] += time.perf_counter() - start
+
+    def record(self, algorithm: str, **counters):
+        """Ends a run of algorithm: accumulates its counters and phase timings, then invokes the callback"""
+        timings = {}
+        for key in [key for key in self.runTimings if key[0] == algorithm]:
+            timings[key[1]] = self.runTimings.pop(key)
+            self.timings["%s.%s" % key] += timings[key[1]]
+        for name, count in counters.items():
+            self.counters["%s.%s" % (algorithm, name)] += count
+        self.counters["%s.runs" % algorithm] += 1
+        if self.callback is not None:
+            self.callback(algorithm, counters, timings)
+
+    def asDict(self) -> dict:
+        """@return: {"counters": {"<algorithm>.<name>": int, ...}, "timings": {"<algorithm>.<phase>": seconds, ...}}"""
+        return {"counters": dict(self.counters), "timings": dict(self.timings)}
+
+    def reset(self):
+        self.counters.clear()
+        self.timings.clear()
+        self.runTimings.clear()
+
+def phaseTimer(instrumentation: Instrumentation, algorithm: str):
+    """
+    @return: function name -> context manager timing that phase of algorithm, which does nothing (and doesn't read
+        the clock) if instrumentation is None
+    """
+    if instrumentation is None:
+        return lambda name: nullcontext()
+    return lambda name: instrumentation.phase(algorithm, name)
@@ -0,0 +1,143 @@
+"""
+ALT (A*, Landmarks, Triangle inequality) index for repeated point-to-point shortest path queries on a static Graph.
+
+Preprocessing picks k landmarks L and stores d(L, v) and d(v, L) for every vertex v. By the triangle inequality,
+    d(v, t) >= d(L, t) - d(L, v)    and    d(v, t) >= d(v, L) - d(t, L)
+so the max over all landmarks is a lower bound on the remaining distance to the target. A* uses it as a consistent
+heuristic, which steers the search toward the target and settles far fewer vertices than plain Dijkstra.
+The landmark table can be written to/read from JSON so preprocessing is only paid once per graph.
+
+@author: Bill Wu
+"""
+
+import json
+import random
+from Graph import Graph, Vertex
+from IndexedHeap import IndexedDaryHeap
+
+INF = float('inf')
+
+class LandmarkIndex:
+    def __init__(self, G: Graph, landmarks: list, distFrom: list, distTo: list):
+        self.G = G
+        self.landmarks = landmarks
+        # distFrom[i] maps v -> d(landmarks[i], v) and distTo[i] maps v -> d(v, landmarks[i]), for reachable v only
+        self.distFrom = distFrom
+        self.distTo = distTo
+
+    @staticmethod
+    def build(G: Graph, k: int = 8, seed: int = 0) -> "LandmarkIndex":
+        """
+        Chooses k landmarks with farthest-point selection and precomputes distances to and from each of them.
+        Starting from a random vertex, each new landmark is the vertex farthest from all landmarks chosen so far
+        (vertices unreachable from all of them first), which spreads landmarks toward the edges of the graph.
+        Runtime complexity: O(k (|E| + |V|) log |V|), ie 2k runs of Dijkstra's
+        @param G: input graph, must have non-negative edge weights
+        @param k: number of landmarks (capped at |V|)
+        @param seed: seed for picking the starting vertex
+        @return: LandmarkIndex over G
+        """
+        G.verifyNonNegativeWeights()
+        vertices = sorted(G.vertices, key=lambda v: repr(v.val))  # Deterministic order for a given seed
+        if not vertices:
+            return LandmarkIndex(G, [], [], [])
+        # Distances to a landmark are distances from it in the transposed graph. Built here rather than with
+        # G.transpose(), which would leave G's optional reverse index switched on
+        reverseEdges = {}
+        for u, children in G.edges.items():
+            for v, w in children.items():
+                reverseEdges.setdefault(v, {})[u] = w
+        reverseG = Graph(G.vertices, reverseEdges)
+
+        landmarks, distFrom, distTo = [], [], []
+        closest = {v: INF for v in vertices}  # min round trip distance to any chosen landmark so far
+        nextLandmark = random.Random(seed).choice(vertices)
+        for _ in range(min(k, len(vertices))):
+            landmarks.append(nextLandmark)
+            fromL, _ = G.dijkstra_SSSP(nextLandmark)
+            toL, _ = reverseG.dijkstra_SSSP(nextLandmark)
+            distFrom.append({v: d for v, d in fromL.items() if d < INF})
+            distTo.append({v: d for v, d in toL.items() if d < INF})
+            for v in vertices:
+                closest[v] = min(closest[v], fromL[v] + toL[v])
+            candidates = [v for v in vertices if v not in landmarks]
+            if not candidates:
+                break
+            nextLandmark = max(candidates, key=lambda v: closest[v])
+        return LandmarkIndex(G, landmarks, distFrom, distTo)
+
+    def lowerBound(self, v: Vertex, t: Vertex):
+        """@return: max over landmarks of the triangle inequality lower bounds on d(v, t), inf if t is unreachable"""
+        bound = 0
+        for fromL, toL in zip(self.distFrom, self.distTo):
+            # d(L, t) - d(L, v): if L reaches v but not t, then v can't reach t either
+            if v in fromL:
+                bound = max(bound, fromL.get(t, INF) - fromL[v])
+            # d(v, L) - d(t, L): only a bound if both v and t reach L
+            if t in toL and v in toL:
+                bound = max(bound, toL[v] - toL[t])
+        return bound
+
+    def query(self, source: Vertex, target: Vertex) -> tuple:
+        """
+        A* search from source to target, using the landmark lower bounds as the heuristic. Since the heuristic is
+        consistent, every vertex is settled at most once, just like in Dijkstra's.
+        @param source: source node
+        @param target: target node
+        @return: 1. shortest distance from source to target, inf if target is unreachable
+                 2. list of vertices on a shortest path from source to target, None if unreachable
+        """
+        if self.lowerBound(source, target) == INF:
+            return INF, None
+        d, parents = {source: 0}, {source: source}
+        heuristic = {source: self.lowerBound(source, target)}
+        priority_queue = IndexedDaryHeap()
+        priority_queue.push(source, heuristic[source])
+        settled = set()
+        while priority_queue:
+            _, u = priority_queue.pop()
+            if u == target:
+                break
+            settled.add(u)
+            for v, w in self.G[u].items():
+                if v in settled or d[u] + w >= d.get(v, INF):
+                    continue
+                if v not in heuristic:
+                    heuristic[v] = self.lowerBound(v, target)
+                if heuristic[v] == INF:  # Target unreachable from v, never worth exploring (checked on every edge in)
+                    continue
+                d[v], parents[v] = d[u] + w, u
+                priority_queue.pushOrDecrease(v, d[v] + heuristic[v])
+
+        if target not in parents:
+            return INF, None
+        i, path = target, [target]
+        while i != source:
+            i = parents[i]
+            path.append(i)
+        return d[target], path[::-1]
+
+    def serializeToJSON(self, outPath: str):
+        """
+        Writes the landmark table to a JSON file (overwrites contents). Only finite distances are stored.
+        Format:
+            "landmarks": list(val)
+            "distFrom": list(list([val, dist]))
+            "distTo": list(list([val, dist]))
+        """
+        with open(outPath, "w") as out:
+            result = {}
+            result["landmarks"] = [L.val for L in self.landmarks]
+            result["distFrom"] = [[[v.val, d] for v, d in fromL.items()] for fromL in self.distFrom]
+            result["distTo"] = [[[v.val, d] for v, d in toL.items()] for toL in self.distTo]
+            json.dump(result, out)
+
+    @staticmethod
+    def deserialize(inPath: str, G: Graph) -> "LandmarkIndex":
+        """Reads a landmark table written by serializeToJSON, for the same graph G it was built from"""
+        with open(inPath, "r") as inp:
+            data = json.load(inp)
+            return LandmarkIndex(G,
+                                 [Vertex(val) for val in data["landmarks"]],
+                                 [{Vertex(val): d for val, d in fromL} for fromL in data["distFrom"]],
+                                 [{Vertex(val): d for val, d in toL} for toL in data["distTo"]])
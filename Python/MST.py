@@ -7,29 +7,28 @@ class MST:
         # Make this support spanning forests in a later iteration
         self.graph = graph
         E = graph.getEdges()
+        # Edges as (u, v, w) tuples, since Graph stores them as an adjacency set {u: {v: w, ...}, ...}
         self.graphEdgesSorted = []
-        for v in E.keys():
-            for e in E[v]:
-                self.graphEdgesSorted.append(e)
-        self.graphEdgesSorted.sort(key=lambda x: x.w)
+        for u in E.keys():
+            for v, w in E[u].items():
+                self.graphEdgesSorted.append((u, v, w))
+        self.graphEdgesSorted.sort(key=lambda e: e[2])
         self.MSTEdges = set()
         self.nodes = UnionFind.UnionFind()
 
         # Kruskal's algorithm to form the set of MST edges
         for v in self.graph.getVertices():
             self.nodes.make_set(v)
-        for e in self.graphEdgesSorted:
-            u, v = e.u, e.v
+        for u, v, w in self.graphEdgesSorted:
+            self.nodes.make_set(u)  # No-op unless the edge's endpoint isn't in the graph's vertex set
+            self.nodes.make_set(v)
             if self.nodes.find_set(u) != self.nodes.find_set(v):
-                self.MSTEdges.add(e)
+                self.MSTEdges.add((u, v, w))
                 self.nodes.union(u, v)
 
     def get_MST_Edges(self):
-        # Return a defensive copy to avoid aliasing
-        result = set()
-        for e in self.MSTEdges:
-            result.add(e.copy())
-        return result
+        # Return a copy to avoid aliasing, the (u, v, w) tuples themselves are immutable
+        return set(self.MSTEdges)
 
 if __name__ == "__main__":
     G = Graph.Graph()
@@ -0,0 +1,255 @@
+"""
+Max-flow solvers over ResidualArcs (see FlowArcs), selected through FlowNetwork.getMaxFlow(algorithm=...).
+
+Each solver pushes as much additional flow as possible from s to t on top of the flow already in the arcs, and
+returns (flow added, counters for Instrumentation).
+
+@author: Bill Wu
+"""
+
+from collections import deque
+from FlowArcs import ResidualArcs
+
+def shortestAugmentingPath(arcs: ResidualArcs, s: int, t: int) -> list:
+    """@return: arc ids of a shortest (fewest arcs) s ~~> t path over arcs with residual capacity, or None if none"""
+    heads, residual, offsets, adjacent = arcs.heads, arcs.residual, arcs.offsets, arcs.adjacent
+    parentArc = [-1] * arcs.numVertices()
+    parentArc[s] = -2
+    queue = deque([s])
+    while queue:
+        u = queue.popleft()
+        for k in range(offsets[u], offsets[u + 1]):
+            e = adjacent[k]
+            v = heads[e]
+            if residual[e] > 0 and parentArc[v] == -1:
+                parentArc[v] = e
+                if v == t:
+                    path = []
+                    while v != s:
+                        path.append(parentArc[v])
+                        v = heads[parentArc[v] ^ 1]
+                    path.reverse()
+                    return path
+                queue.append(v)
+    return None
+
+def edmondsKarp(arcs: ResidualArcs, s: int, t: int) -> tuple:
+    """
+    Ford-Fulkerson with BFS, so every augmenting path is a shortest one, which bounds the number of augmentations to
+    O(VE) and the running time to O(VE^2) rather than O(E * |f|) for a max flow f.
+    @param s: source vertex id
+    @param t: sink vertex id
+    @return: (flow added, {"augmentingPaths": int, "augmentingPathEdges": int})
+    """
+    residual = arcs.residual
+    totalFlow = augmentingPaths = pathEdges = 0
+    path = shortestAugmentingPath(arcs, s, t) if s != t else None
+    while path is not None:
+        pushed = min(residual[e] for e in path)
+        for e in path:
+            residual[e] -= pushed
+            residual[e ^ 1] += pushed
+        totalFlow += pushed
+        augmentingPaths += 1
+        pathEdges += len(path)
+        path = shortestAugmentingPath(arcs, s, t)
+    return totalFlow, {"augmentingPaths": augmentingPaths, "augmentingPathEdges": pathEdges}
+
+def dinic(arcs: ResidualArcs, s: int, t: int) -> tuple:
+    """
+    Dinic's algorithm: each phase BFS's the level graph (distance from s over arcs with residual capacity), then
+    finds a blocking flow in it with DFS along arcs that go exactly one level up. Every vertex keeps a current-arc
+    pointer that only moves forward within a phase, since an arc that was saturated or led to a dead end can't be
+    used again until the next phase. O(V^2 E) in general, O(E sqrt(V)) on unit capacity networks such as bipartite
+    matchings. The DFS uses an explicit stack of arcs, so long paths don't hit the recursion limit.
+    @param s: source vertex id
+    @param t: sink vertex id
+    @return: (flow added, {"phases": int, "augmentingPaths": int, "arcsScanned": int})
+    """
+    heads, residual, offsets, adjacent = arcs.heads, arcs.residual, arcs.offsets, arcs.adjacent
+    n = arcs.numVertices()
+    totalFlow = phases = augmentingPaths = arcsScanned = 0
+    while s != t:
+        level = [-1] * n
+        level[s] = 0
+        queue = deque([s])
+        while queue and level[t] == -1:
+            u = queue.popleft()
+            for k in range(offsets[u], offsets[u + 1]):
+                e = adjacent[k]
+                v = heads[e]
+                if residual[e] > 0 and level[v] == -1:
+                    level[v] = level[u] + 1
+                    queue.append(v)
+        if level[t] == -1:
+            break
+        phases += 1
+
+        current = list(offsets[:-1])  # Current-arc pointers, as positions in adjacent
+        path, u = [], s  # Arcs of the path s ~~> u being extended
+        while True:
+            if u == t:
+                pushed = min(residual[e] for e in path)
+                for e in path:
+                    residual[e] -= pushed
+                    residual[e ^ 1] += pushed
+                totalFlow += pushed
+                augmentingPaths += 1
+                # Retreat to the tail of the first saturated arc, the path before it can still carry flow
+                k = next(i for i, e in enumerate(path) if residual[e] == 0)
+                u = heads[path[k] ^ 1]
+                del path[k:]
+                continue
+
+            end, k = offsets[u + 1], current[u]
+            while k < end:
+                e = adjacent[k]
+                if residual[e] > 0 and level[heads[e]] == level[u] + 1:
+                    break
+                k += 1
+            arcsScanned += k - current[u]
+            current[u] = k
+            if k < end:  # Advance
+                path.append(adjacent[k])
+                u = heads[adjacent[k]]
+            else:  # Dead end, so u is useless for the rest of this phase: retreat and skip the arc into it
+                level[u] = -1
+                if not path:
+                    break
+                e = path.pop()
+                u = heads[e ^ 1]
+                current[u] += 1
+    return totalFlow, {"phases": phases, "augmentingPaths": augmentingPaths, "arcsScanned": arcsScanned}
+
+def _globalRelabel(arcs: ResidualArcs, s: int, t: int, height: list):
+    """
+    Sets every height to its exact residual distance to t, or to n + the residual distance to s for vertices that can't
+    reach t anymore (they can only send their excess back to s), by BFS over reverse arcs. Vertices that can reach
+    neither get 2n, they have no excess and never will.
+    """
+    heads, residual, offsets, adjacent = arcs.heads, arcs.residual, arcs.offsets, arcs.adjacent
+    n = len(height)
+    for u in range(n):
+        height[u] = 2 * n
+    height[t], height[s] = 0, n
+    for root in (t, s):
+        queue = deque([root])
+        while queue:
+            v = queue.popleft()
+            for k in range(offsets[v], offsets[v + 1]):
+                e = adjacent[k]
+                u = heads[e]
+                if residual[e ^ 1] > 0 and height[u] == 2 * n:  # u can still push into v
+                    height[u] = height[v] + 1
+                    queue.append(u)
+
+def pushRelabel(arcs: ResidualArcs, s: int, t: int) -> tuple:
+    """
+    Highest-label push-relabel (Goldberg-Tarjan): saturates every arc out of s, then repeatedly discharges the active
+    vertex (one with excess) of greatest height, pushing excess along admissible arcs (residual > 0, one level down)
+    and relabeling a vertex to 1 + its lowest residual neighbour once it has none. O(V^2 sqrt(E)). Two heuristics keep
+    the heights tight, which is what makes it fast in practice:
+        - global relabeling: heights are reset to exact BFS distances at the start and after every |V| relabels
+        - gap: when no vertex is left at some height h < |V|, the vertices above it can't reach t anymore, so they're
+            lifted straight past |V| at once instead of one relabel at a time
+    Excess that can't reach t flows back to s in the same run, so the result is a flow, not just a preflow.
+    @param s: source vertex id
+    @param t: sink vertex id
+    @return: (flow added, {"pushes": int, "relabels": int, "globalRelabels": int, "gaps": int})
+    """
+    heads, residual, offsets, adjacent = arcs.heads, arcs.residual, arcs.offsets, arcs.adjacent
+    n = arcs.numVertices()
+    pushes = relabels = globalRelabels = gaps = 0
+    if s == t:
+        return 0, {"pushes": pushes, "relabels": relabels, "globalRelabels": globalRelabels, "gaps": gaps}
+    excess, height = [0] * n, [0] * n
+    for k in range(offsets[s], offsets[s + 1]):
+        e = adjacent[k]
+        x = residual[e]
+        if x > 0:
+            residual[e] = 0
+            residual[e ^ 1] += x
+            excess[heads[e]] += x
+            pushes += 1
+
+    relabelsSinceGlobal = n
+    buckets = [[] for _ in range(2 * n + 1)]  # Height -> active vertices at that height (possibly stale entries)
+    count = [0] * (2 * n + 1)  # Height -> number of vertices other than s and t at that height
+    current, highest = [], -1
+    while True:
+        if relabelsSinceGlobal >= n:
+            _globalRelabel(arcs, s, t, height)
+            globalRelabels += 1
+            relabelsSinceGlobal = 0
+            current = list(offsets[:-1])
+            for bucket in buckets:
+                bucket.clear()
+            count = [0] * (2 * n + 1)
+            for v in range(n):
+                if v != s and v != t:
+                    count[height[v]] += 1
+                    if excess[v] > 0:
+                        buckets[height[v]].append(v)
+            highest = 2 * n
+
+        while highest >= 0 and not buckets[highest]:
+            highest -= 1
+        if highest < 0:
+            break
+        u = buckets[highest].pop()
+        if height[u] != highest or excess[u] == 0:
+            continue
+
+        # Discharge u
+        while excess[u] > 0:
+            k, end, h = current[u], offsets[u + 1], height[u]
+            while k < end:
+                e = adjacent[k]
+                v = heads[e]
+                if residual[e] > 0 and height[v] == h - 1:
+                    x = min(excess[u], residual[e])
+                    residual[e] -= x
+                    residual[e ^ 1] += x
+                    if excess[v] == 0 and v != s and v != t:
+                        buckets[h - 1].append(v)
+                    excess[u] -= x
+                    excess[v] += x
+                    pushes += 1
+                    if excess[u] == 0:
+                        break
+                k += 1
+            current[u] = k
+            if excess[u] == 0:
+                break
+
+            # Relabel: no admissible arc is left, so u must be lifted above its lowest residual neighbour
+            newHeight = 2 * n
+            for k in range(offsets[u], end):
+                e = adjacent[k]
+                if residual[e] > 0 and height[heads[e]] + 1 < newHeight:
+                    newHeight = height[heads[e]] + 1
+            current[u] = offsets[u]
+            relabels += 1
+            relabelsSinceGlobal += 1
+            count[h] -= 1
+            height[u] = newHeight
+            count[newHeight] += 1
+            if count[h] == 0 and h < n:  # Gap: nothing above h can reach t
+                gaps += 1
+                for v in range(n):
+                    if h < height[v] < n and v != s and v != t:
+                        count[height[v]] -= 1
+                        height[v] = n + 1
+                        count[n + 1] += 1
+                        current[v] = offsets[v]
+                        if excess[v] > 0 and v != u:
+                            buckets[n + 1].append(v)
+            highest = max(highest, height[u])
+    return excess[t], {"pushes": pushes, "relabels": relabels, "globalRelabels": globalRelabels, "gaps": gaps}
+
+# Algorithm name -> solver, see FlowNetwork.getMaxFlow
+MAX_FLOW_ALGORITHMS = {
+    "edmondsKarp": edmondsKarp,
+    "dinic": dinic,
+    "pushRelabel": pushRelabel,
+}
@@ -0,0 +1,562 @@
+"""
+Min-cost max-flow solvers over ResidualArcs (see FlowArcs), selected through
+FlowNetwork.getMinCostMaxFlow(algorithm=...), plus the negative cycle cancelling its default algorithm relies on.
+
+Each solver sends as much flow as possible from s to t at minimum total cost, starting from the flow already in the
+arcs, which must be a min-cost flow for its own value (eg zero flow, when there are no negative cost cycles). It
+returns (flow added, counters for Instrumentation); the cost itself is read off the final flow by FlowNetwork.
+
+@author: Bill Wu
+"""
+
+from collections import deque
+from FlowArcs import ResidualArcs
+from IndexedHeap import IndexedDaryHeap
+from MaxFlow import dinic
+
+class NegativeCostCycleException(Exception):
+    pass
+
+def findNegativeCycle(arcs: ResidualArcs) -> list:
+    """
+    Queue-based Bellman-Ford from every vertex at once (all distances start at 0), over arcs with residual capacity.
+    Every |V| relaxations, the parent arcs are checked for a cycle, which can only have a negative cost, so a cycle is
+    found soon after it forms rather than after |V| full passes, and from anywhere in the network, not just what one
+    source reaches.
+    @return: arc ids of a negative cost residual cycle, in order, or None if there is none
+    """
+    heads, residual, cost, offsets, adjacent = arcs.heads, arcs.residual, arcs.cost, arcs.offsets, arcs.adjacent
+    n = arcs.numVertices()
+    d, parentArc = [0] * n, [-1] * n
+    queue, queued = deque(range(n)), [True] * n
+    relaxations = 0
+    while queue:
+        u = queue.popleft()
+        queued[u] = False
+        du = d[u]
+        for k in range(offsets[u], offsets[u + 1]):
+            e = adjacent[k]
+            if residual[e] > 0:
+                v = heads[e]
+                if du + cost[e] < d[v]:
+                    d[v] = du + cost[e]
+                    parentArc[v] = e
+                    relaxations += 1
+                    if relaxations % n == 0:
+                        cycle = _findParentCycle(arcs, parentArc)
+                        if cycle is not None:
+                            return cycle
+                    if not queued[v]:
+                        queued[v] = True
+                        queue.append(v)
+    return None
+
+def _findParentCycle(arcs: ResidualArcs, parentArc: list) -> list:
+    """@return: arc ids of a cycle in the parent arc forest (walking up from each vertex at most once), or None"""
+    heads = arcs.heads
+    n = len(parentArc)
+    walk = [-1] * n  # Vertex -> start of the walk that visited it
+    for start in range(n):
+        v = start
+        while v != -1 and walk[v] == -1:
+            walk[v] = start
+            v = heads[parentArc[v] ^ 1] if parentArc[v] != -1 else -1
+        if v != -1 and walk[v] == start:  # Came back around to this walk, so v is on a cycle
+            cycle, u = [], v
+            while True:
+                e = parentArc[u]
+                cycle.append(e)
+                u = heads[e ^ 1]
+                if u == v:
+                    break
+            cycle.reverse()
+            return cycle
+    return None
+
+def cancelNegativeCycles(arcs: ResidualArcs) -> dict:
+    """
+    Cycle cancelling: saturates negative cost residual cycles one at a time until there are none, which leaves the
+    flow min-cost for its value (and conserved at every vertex, so the value doesn't change).
+    @return: {"cycleCancellations": int, "cancelledCycleEdges": int}
+    """
+    residual = arcs.residual
+    cancellations = cycleEdges = 0
+    cycle = findNegativeCycle(arcs)
+    while cycle is not None:
+        pushed = min(residual[e] for e in cycle)
+        for e in cycle:
+            residual[e] -= pushed
+            residual[e ^ 1] += pushed
+        cancellations += 1
+        cycleEdges += len(cycle)
+        cycle = findNegativeCycle(arcs)
+    return {"cycleCancellations": cancellations, "cancelledCycleEdges": cycleEdges}
+
+def _initialPotentials(arcs: ResidualArcs, s: int) -> list:
+    """
+    Finds potentials pi with nonnegative reduced costs cost(e) + pi[tail] - pi[head] on every residual arc reachable
+    from s, ie shortest path distances from s, with queue-based Bellman-Ford. If no residual arc has a negative cost,
+    all zeros already work and nothing is searched. Otherwise, the whole residual network is first searched for a
+    negative cost cycle (see findNegativeCycle), including any that s can't reach.
+    @return: list of potentials by vertex id, 0 for vertices s can't reach
+    """
+    heads, residual, cost, offsets, adjacent = arcs.heads, arcs.residual, arcs.cost, arcs.offsets, arcs.adjacent
+    n = arcs.numVertices()
+    potential = [0] * n
+    if all(cost[e] >= 0 for e in range(arcs.numArcs()) if residual[e] > 0):
+        return potential
+    if findNegativeCycle(arcs) is not None:
+        raise NegativeCostCycleException("Residual network has a negative cost cycle")
+
+    d, length = [None] * n, [0] * n  # Vertex -> number of arcs on its current shortest path
+    d[s] = 0
+    queue, queued = deque([s]), [False] * n
+    queued[s] = True
+    while queue:
+        u = queue.popleft()
+        queued[u] = False
+        for k in range(offsets[u], offsets[u + 1]):
+            e = adjacent[k]
+            v = heads[e]
+            if residual[e] > 0 and (d[v] is None or d[u] + cost[e] < d[v]):
+                d[v] = d[u] + cost[e]
+                length[v] = length[u] + 1
+                if length[v] >= n:  # This shortest path has >= n arcs, so it runs around a cycle
+                    raise NegativeCostCycleException("Residual network has a negative cost cycle")
+                if not queued[v]:
+                    queued[v] = True
+                    queue.append(v)
+    for v in range(n):
+        if d[v] is not None:
+            potential[v] = d[v]
+    return potential
+
+def successiveShortestPaths(arcs: ResidualArcs, s: int, t: int) -> tuple:
+    """
+    Successive shortest paths: repeatedly augments along a cheapest s ~~> t path in the residual network, which keeps
+    the flow min-cost for its value, until t is unreachable. Node potentials (Johnson's reweighting) make every
+    residual arc's reduced cost cost(e) + pi[tail] - pi[head] nonnegative, so each path is found with Dijkstra instead
+    of Bellman-Ford; after each search pi[v] += min(d[v], d[t]) keeps the reduced costs nonnegative on the arcs the
+    augmentation adds. Dijkstra stops as soon as t is settled. O(|f| E log V) for a max flow of value |f|, after
+    one Bellman-Ford pass for the initial potentials if any residual arc has a negative cost.
+    Raises NegativeCostCycleException if the residual network starts out with a negative cost cycle anywhere, even
+    where s can't reach it, since the flow would then not be min-cost for its value.
+    @param s: source vertex id
+    @param t: sink vertex id
+    @return: (flow added, {"augmentations": int, "heapPops": int})
+    """
+    heads, residual, cost, offsets, adjacent = arcs.heads, arcs.residual, arcs.cost, arcs.offsets, arcs.adjacent
+    n = arcs.numVertices()
+    totalFlow = augmentations = pops = 0
+    potential = _initialPotentials(arcs, s)
+    while s != t:
+        d, parentArc, settled = [None] * n, [-1] * n, []
+        d[s] = 0
+        heap = IndexedDaryHeap()
+        heap.push(s, 0)
+        while heap:
+            du, u = heap.pop()
+            pops += 1
+            settled.append(u)
+            if u == t:
+                break
+            pu = potential[u] + du
+            for k in range(offsets[u], offsets[u + 1]):
+                e = adjacent[k]
+                if residual[e] > 0:
+                    v = heads[e]
+                    dv = pu + cost[e] - potential[v]  # d[u] + reduced cost of e
+                    if d[v] is None or dv < d[v]:
+                        d[v] = dv
+                        parentArc[v] = e
+                        heap.pushOrDecrease(v, dv)
+        if d[t] is None:
+            break
+
+        # pi[v] += min(d[v], d[t]): settled vertices have d[v] <= d[t], the rest are at least d[t] away
+        dt = d[t]
+        isSettled = [False] * n
+        for v in settled:
+            isSettled[v] = True
+            potential[v] += d[v]
+        for v in range(n):
+            if not isSettled[v]:
+                potential[v] += dt
+
+        pushed, v = None, t
+        while v != s:
+            e = parentArc[v]
+            pushed = residual[e] if pushed is None else min(pushed, residual[e])
+            v = heads[e ^ 1]
+        v = t
+        while v != s:
+            e = parentArc[v]
+            residual[e] -= pushed
+            residual[e ^ 1] += pushed
+            v = heads[e ^ 1]
+        totalFlow += pushed
+        augmentations += 1
+    return totalFlow, {"augmentations": augmentations, "heapPops": pops}
+
+
+class InfeasibleFlowException(Exception):
+    pass
+
+# Arc states in network simplex: in the spanning tree, or out of it at flow 0 / flow == capacity
+_TREE, _LOWER, _UPPER = 0, 1, -1
+
+def _networkSimplex(tails: list, heads: list, capacity: list, cost: list, supply: list) -> tuple:
+    """
+    Primal network simplex for min-cost flow with node supplies (supply[v] > 0) and demands (supply[v] < 0), over
+    arcs tails[i] -> heads[i] with 0 <= flow <= capacity[i].
+
+    The basis is a spanning tree (parent pointers, with depths and the potentials that make every tree arc's reduced
+    cost cost + pi[tail] - pi[head] zero); nontree arcs sit at flow 0 or at capacity. It starts from the artificial
+    tree where every vertex hangs off an extra root: supply vertices send their supply up a cost 0 arc, demand vertices
+    get theirs down an arc costing more than any real path (big-M), so a real route always beats the artificial one.
+    Each pivot brings in a violating nontree arc (negative reduced cost at 0, positive at capacity), sends as much flow
+    as possible around the cycle it closes with the tree, and swaps it for the arc that blocks, then re-hangs the cut
+    off subtree and shifts its potentials. The entering arc is chosen by block pivoting: arcs are scanned round-robin in
+    blocks of ~sqrt(|E|) and the most violating arc of the first block with any is taken, which is much cheaper per
+    pivot than Dantzig's full scan for only a few more pivots. Ties for the leaving arc are broken so that the tree
+    stays strongly feasible (zero flow tree arcs point towards the root), which rules out cycling on degenerate pivots.
+    @return: (flow by arc, {"pivots": int, "degeneratePivots": int})
+        Raises InfeasibleFlowException if the supplies can't be routed (or don't sum to 0)
+    """
+    if sum(supply) != 0:
+        raise InfeasibleFlowException("Supplies and demands don't balance: they sum to %d" % sum(supply))
+    n, m = len(supply), len(tails)
+    root = n
+    artificialCost = (max([abs(c) for c in cost], default=0) + 1) * (n + 1)
+    infinity = sum(supply[v] for v in range(n) if supply[v] > 0) + sum(capacity) + 1
+    # Real arcs are 0..m-1, then vertex v's artificial arc to/from the root is m + v
+    tails, heads, capacity, cost = list(tails), list(heads), list(capacity), list(cost)
+    flow, state = [0] * m, [_LOWER] * m
+    parent, predArc, depth, potential = [root] * (n + 1), [-1] * (n + 1), [1] * (n + 1), [0] * (n + 1)
+    children = [set() for _ in range(n + 1)]
+    parent[root], depth[root] = -1, 0
+    for v in range(n):
+        if supply[v] >= 0:
+            tails.append(v), heads.append(root), cost.append(0)
+        else:
+            tails.append(root), heads.append(v), cost.append(artificialCost)
+            potential[v] = artificialCost
+        capacity.append(infinity)
+        flow.append(abs(supply[v]))
+        state.append(_TREE)
+        predArc[v] = m + v
+        children[root].add(v)
+
+    pivots = degeneratePivots = 0
+    blockSize = max(10, int(m ** 0.5))
+    nextArc = 0
+    while True:
+        # Block pricing: the most violating arc of the first block that has one
+        entering, best, scanned = -1, 0, 0
+        while scanned < m:
+            for _ in range(min(blockSize, m - scanned)):
+                e = nextArc
+                nextArc = nextArc + 1 if nextArc + 1 < m else 0
+                violation = state[e] * (cost[e] + potential[tails[e]] - potential[heads[e]])
+                if violation < best:
+                    entering, best = e, violation
+            scanned += blockSize
+            if entering != -1:
+                break
+        if entering == -1:
+            break
+        pivots += 1
+
+        # The cycle pushes flow first -> second along the entering arc, then second ~~> join ~~> first in the tree
+        if state[entering] == _LOWER:
+            first, second = tails[entering], heads[entering]
+        else:
+            first, second = heads[entering], tails[entering]
+        join, u, v = first, first, second
+        while u != v:
+            if depth[u] >= depth[v]:
+                u = parent[u]
+            else:
+                v = parent[v]
+        join = u
+
+        delta, leaving, side = capacity[entering], -1, 0
+        u = first
+        while u != join:  # Flow runs down from parent[u] to u
+            e = predArc[u]
+            d = capacity[e] - flow[e] if heads[e] == u else flow[e]
+            if d < delta:
+                delta, leaving, side = d, u, 1
+            u = parent[u]
+        u = second
+        while u != join:  # Flow runs up from u to parent[u]
+            e = predArc[u]
+            d = capacity[e] - flow[e] if tails[e] == u else flow[e]
+            if d <= delta:
+                delta, leaving, side = d, u, 2
+            u = parent[u]
+        if delta >= infinity:
+            raise InfeasibleFlowException("Unbounded: negative cost cycle of unbounded capacity")
+
+        if delta > 0:
+            flow[entering] += state[entering] * delta
+            u = first
+            while u != join:
+                e = predArc[u]
+                flow[e] += delta if heads[e] == u else -delta
+                u = parent[u]
+            u = second
+            while u != join:
+                e = predArc[u]
+                flow[e] += delta if tails[e] == u else -delta
+                u = parent[u]
+        else:
+            degeneratePivots += 1
+
+        if side == 0:  # The entering arc blocks itself, it just moves to its other bound
+            state[entering] = -state[entering]
+            continue
+
+        # Swap arcs: the subtree under leaving gets re-hung from the entering arc, reversing the path in between
+        e = predArc[leaving]
+        state[e] = _LOWER if flow[e] == 0 else _UPPER
+        state[entering] = _TREE
+        if side == 1:
+            inside, outside = first, second
+        else:
+            inside, outside = second, first
+        children[parent[leaving]].discard(leaving)
+        u, newParent, newArc = inside, outside, entering
+        while True:
+            oldParent, oldArc = parent[u], predArc[u]
+            if u != leaving:
+                children[oldParent].discard(u)
+            parent[u], predArc[u] = newParent, newArc
+            children[newParent].add(u)
+            if u == leaving:
+                break
+            u, newParent, newArc = oldParent, u, oldArc
+
+        # Depths and potentials of the re-hung subtree, from its new parent down
+        stack = [inside]
+        while stack:
+            u = stack.pop()
+            e, p = predArc[u], parent[u]
+            depth[u] = depth[p] + 1
+            potential[u] = potential[p] - cost[e] if tails[e] == u else potential[p] + cost[e]
+            stack.extend(children[u])
+
+    if any(flow[m + v] for v in range(n)):
+        raise InfeasibleFlowException("Supplies and demands can't be routed within the capacities")
+    return flow[:m], {"pivots": pivots, "degeneratePivots": degeneratePivots}
+
+def _forwardArcs(arcs: ResidualArcs) -> tuple:
+    """@return: (tails, heads, capacities, costs) of the capacity edges, ie the even arcs"""
+    heads = arcs.heads
+    return ([heads[e + 1] for e in range(0, len(heads), 2)], list(heads[0::2]), list(arcs.capacity[0::2]),
+            list(arcs.cost[0::2]))
+
+def _setFlows(arcs: ResidualArcs, flows: list):
+    """Sets the flow of every capacity edge i (arc 2i) to flows[i]"""
+    residual, capacity = arcs.residual, arcs.capacity
+    for i, f in enumerate(flows):
+        residual[2 * i], residual[2 * i + 1] = capacity[2 * i] - f, f
+
+def networkSimplexWithSupplies(arcs: ResidualArcs, supply: list) -> tuple:
+    """
+    Min-cost flow meeting the given supplies and demands, with network simplex (see _networkSimplex). Replaces any
+    flow already in the arcs.
+    @param supply: vertex id -> supply (> 0) or demand (< 0), summing to 0
+    @return: (total cost, counters). Raises InfeasibleFlowException if the demands can't be met
+    """
+    tails, heads, capacity, cost = _forwardArcs(arcs)
+    flows, counters = _networkSimplex(tails, heads, capacity, cost, supply)
+    _setFlows(arcs, flows)
+    return sum(f * c for f, c in zip(flows, cost)), counters
+
+def networkSimplex(arcs: ResidualArcs, s: int, t: int) -> tuple:
+    """
+    Min-cost max-flow with network simplex, as a min-cost circulation: with a return arc t -> s whose cost is below
+    minus the cost of any simple path, every unit of flow that gets through the network pays for itself, so the
+    optimal circulation is a max flow, and the cheapest one. Replaces any flow already in the arcs.
+    @param s: source vertex id
+    @param t: sink vertex id
+    @return: (flow added, {"pivots": int, "degeneratePivots": int})
+    """
+    n = arcs.numVertices()
+    if s == t:
+        return 0, {"pivots": 0, "degeneratePivots": 0}
+    tails, heads, capacity, cost = _forwardArcs(arcs)
+    before = sum(arcs.residual[e ^ 1] for e in range(0, arcs.numArcs(), 2) if arcs.heads[e ^ 1] == s)
+    tails.append(t), heads.append(s)
+    capacity.append(sum(c for tail, c in zip(tails, capacity) if tail == s))
+    cost.append(-(max([abs(c) for c in cost], default=0) * n + 1))
+    flows, counters = _networkSimplex(tails, heads, capacity, cost, [0] * n)
+    _setFlows(arcs, flows[:-1])
+    return flows[-1] - before, counters
+
+def _refine(arcs: ResidualArcs, cost: list, potential: list, epsilon: int) -> tuple:
+    """
+    One cost scaling phase: turns the epsilon * alpha-optimal flow in arcs into an epsilon-optimal one, ie one where no
+    residual arc has a reduced cost cost(e) + pi[tail] - pi[head] below -epsilon. Saturating every arc of negative
+    reduced cost makes the flow 0-optimal but leaves excesses and deficits, which push-relabel then routes back along
+    admissible arcs (residual, negative reduced cost), lowering a vertex's potential by at least epsilon whenever it
+    has excess but no admissible arc. Flow conservation, and so the flow value, is the same afterwards.
+    @return: (pushes, relabels)
+    """
+    heads, residual, offsets, adjacent = arcs.heads, arcs.residual, arcs.offsets, arcs.adjacent
+    n = arcs.numVertices()
+    excess = [0] * n
+    for e in range(arcs.numArcs()):
+        r = residual[e]
+        if r > 0:
+            u, v = heads[e ^ 1], heads[e]
+            if cost[e] + potential[u] - potential[v] < 0:
+                residual[e] = 0
+                residual[e ^ 1] += r
+                excess[u] -= r
+                excess[v] += r
+
+    pushes = relabels = 0
+    current = list(offsets[:-1])
+    queue = deque(v for v in range(n) if excess[v] > 0)
+    while queue:
+        u = queue.popleft()
+        while excess[u] > 0:
+            k, end, pu = current[u], offsets[u + 1], potential[u]
+            while k < end:
+                e = adjacent[k]
+                v = heads[e]
+                if residual[e] > 0 and cost[e] + pu - potential[v] < 0:
+                    x = min(excess[u], residual[e])
+                    residual[e] -= x
+                    residual[e ^ 1] += x
+                    if excess[v] <= 0 < excess[v] + x:
+                        queue.append(v)
+                    excess[u] -= x
+                    excess[v] += x
+                    pushes += 1
+                    if excess[u] == 0:
+                        break
+                k += 1
+            current[u] = k
+            if excess[u] == 0:
+                break
+            # Relabel: the lowest potential that still keeps every residual arc out of u epsilon-optimal
+            potential[u] = max(potential[heads[adjacent[k]]] - cost[adjacent[k]] for k in range(offsets[u], end)
+                               if residual[adjacent[k]] > 0) - epsilon
+            current[u] = offsets[u]
+            relabels += 1
+    return pushes, relabels
+
+def costScaling(arcs: ResidualArcs, s: int, t: int, alpha: int = 16) -> tuple:
+    """
+    Goldberg-Tarjan cost scaling: finds a max flow with Dinic, then makes it min-cost with successive epsilon-optimal
+    refinements (see _refine), dividing epsilon by alpha each phase. Costs are multiplied by |V| + 1 first, so that
+    once epsilon reaches 1 the flow is 1 / (|V| + 1)-optimal in the original costs, which for integers means optimal.
+    That takes O(log_alpha(|V| C)) phases for a max cost C, so the running time is polynomial in log C rather than in
+    C, which suits cost models with a wide range (large penalties next to small rewards). Negative cost cycles are
+    cancelled like everything else.
+    @param s: source vertex id
+    @param t: sink vertex id
+    @param alpha: factor epsilon shrinks by in each phase
+    @return: (flow added, {"refines": int, "pushes": int, "relabels": int})
+    """
+    flowAdded, _ = dinic(arcs, s, t)
+    n = arcs.numVertices()
+    cost = [c * (n + 1) for c in arcs.cost]
+    potential = [0] * n
+    epsilon = max([abs(c) for c in cost], default=0)
+    refines = pushes = relabels = 0
+    while epsilon > 1:
+        epsilon = max(1, -(-epsilon // alpha))
+        p, r = _refine(arcs, cost, potential, epsilon)
+        refines, pushes, relabels = refines + 1, pushes + p, relabels + r
+    return flowAdded, {"refines": refines, "pushes": pushes, "relabels": relabels}
+
+def capacityScaling(arcs: ResidualArcs, s: int, t: int) -> tuple:
+    """
+    Capacity scaling: finds a max flow with Dinic, then makes it min-cost by successive shortest paths in Delta-phases
+    for Delta = the largest power of 2 <= the max capacity, down to 1. Each phase first saturates the arcs with residual
+    >= Delta and negative reduced cost, then routes the excesses that creates to the deficits Delta units at a time,
+    along shortest paths (Dijkstra on reduced costs, as in successiveShortestPaths) over arcs with residual >= Delta.
+    Only O(|E|) augmentations happen per phase, so there are O(|E| log U) in total for a max capacity U, instead of
+    one per unit of flow, which suits networks with large capacities.
+    @param s: source vertex id
+    @param t: sink vertex id
+    @return: (flow added, {"phases": int, "augmentations": int, "heapPops": int})
+    """
+    flowAdded, _ = dinic(arcs, s, t)
+    heads, residual, cost, offsets, adjacent = arcs.heads, arcs.residual, arcs.cost, arcs.offsets, arcs.adjacent
+    n = arcs.numVertices()
+    potential, excess = [0] * n, [0] * n
+    phases = augmentations = pops = 0
+    delta = 1 << (max(arcs.capacity, default=1).bit_length() - 1) if max(arcs.capacity, default=0) > 0 else 0
+    while delta >= 1:
+        phases += 1
+        for e in range(arcs.numArcs()):
+            r = residual[e]
+            if r >= delta:
+                u, v = heads[e ^ 1], heads[e]
+                if cost[e] + potential[u] - potential[v] < 0:
+                    residual[e] = 0
+                    residual[e ^ 1] += r
+                    excess[u] -= r
+                    excess[v] += r
+
+        while True:
+            sources = [v for v in range(n) if excess[v] >= delta]
+            if not sources or all(excess[v] > -delta for v in range(n)):
+                break
+            d, parentArc, settled, target = [None] * n, [-1] * n, [], -1
+            heap = IndexedDaryHeap()
+            for v in sources:
+                d[v] = 0
+                heap.push(v, 0)
+            while heap:
+                du, u = heap.pop()
+                pops += 1
+                settled.append(u)
+                if excess[u] <= -delta:
+                    target = u
+                    break
+                pu = potential[u] + du
+                for k in range(offsets[u], offsets[u + 1]):
+                    e = adjacent[k]
+                    if residual[e] >= delta:
+                        v = heads[e]
+                        dv = pu + cost[e] - potential[v]
+                        if d[v] is None or dv < d[v]:
+                            d[v] = dv
+                            parentArc[v] = e
+                            heap.pushOrDecrease(v, dv)
+            if target == -1:  # What's left moves on to the next phase, over arcs of smaller residual
+                break
+
+            dt = d[target]
+            isSettled = [False] * n
+            for v in settled:
+                isSettled[v] = True
+                potential[v] += d[v]
+            for v in range(n):
+                if not isSettled[v]:
+                    potential[v] += dt
+            v = target
+            while parentArc[v] != -1:
+                e = parentArc[v]
+                residual[e] -= delta
+                residual[e ^ 1] += delta
+                v = heads[e ^ 1]
+            excess[v] -= delta
+            excess[target] += delta
+            augmentations += 1
+        delta //= 2
+    return flowAdded, {"phases": phases, "augmentations": augmentations, "heapPops": pops}
+
+# Algorithm name -> solver, see FlowNetwork.getMinCostMaxFlow
+MIN_COST_FLOW_ALGORITHMS = {
+    "successiveShortestPaths": successiveShortestPaths,
+    "networkSimplex": networkSimplex,
+    "costScaling": costScaling,
+    "capacityScaling": capacityScaling,
+}
@@ -0,0 +1,100 @@
+"""
+Multi-source / all-pairs shortest paths over a pool of worker processes.
+
+The graph is frozen into a CompactGraph once, and its CSR arrays (offsets, targets, weights) are copied into
+multiprocessing shared memory blocks. Each worker attaches to those blocks when it starts and reads them through
+memoryviews, so the graph is never pickled per task: a task is just a source id, and a result is one distance row.
+Rows are streamed back as they finish, so callers can consume all-pairs output without holding the whole matrix.
+
+Usage:
+    with ParallelSSSP(G, processes=8) as engine:
+        for source, row in engine.dijkstraRows(sources):
+            ...  # row[engine.getId(v)] == d(source, v)
+
+@author: Bill Wu
+"""
+
+import multiprocessing
+from array import array
+from multiprocessing import shared_memory
+from CompactGraph import csrDijkstra
+from Graph import Graph, Vertex
+
+# Per-worker state, set once by _initWorker: the attached shared memory blocks and memoryviews over them
+_worker = {}
+
+def _initWorker(blocks: list):
+    """Pool initializer: attaches to the shared CSR blocks, given as [(name, typecode, length), ...]"""
+    views = []
+    for name, typecode, length in blocks:
+        shm = shared_memory.SharedMemory(name=name)
+        _worker.setdefault("shm", []).append(shm)  # Keep a reference, the views are only valid while it's open
+        views.append(shm.buf.cast(typecode)[:length])
+    _worker["offsets"], _worker["targets"], _worker["weights"] = views
+
+def _dijkstraRow(s: int) -> tuple:
+    d, _ = csrDijkstra(_worker["offsets"], _worker["targets"], _worker["weights"], s)
+    return s, array('d', d)
+
+class ParallelSSSP:
+    def __init__(self, G: Graph, processes: int = None):
+        """
+        Freezes G, copies its CSR arrays into shared memory and starts the worker pool.
+        Call close() (or use as a context manager) to stop the workers and free the shared memory.
+        @param G: input graph, must have non-negative edge weights
+        @param processes: number of worker processes, defaults to the number of CPUs
+        """
+        self.compact = G.freeze()
+        if self.compact.hasNegativeWeights:
+            raise ValueError("Dijkstra's algorithm requires non-negative edge weights")
+        self.blocks = []
+        for arr in (self.compact.offsets, self.compact.targets, self.compact.weights):
+            nbytes = len(arr) * arr.itemsize
+            # Size 0 blocks are not allowed, and the buffer must hold at least one whole item to be cast
+            shm = shared_memory.SharedMemory(create=True, size=max(arr.itemsize, nbytes))
+            shm.buf[:nbytes] = arr.tobytes()
+            self.blocks.append((shm, arr.typecode, len(arr)))
+        self.pool = multiprocessing.Pool(processes, _initWorker,
+                                         ([(shm.name, typecode, length) for shm, typecode, length in self.blocks],))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
+
+    def close(self):
+        """Stops the worker pool, then releases and unlinks the shared memory blocks"""
+        self.pool.terminate()
+        self.pool.join()
+        for shm, _, _ in self.blocks:
+            shm.close()
+            shm.unlink()
+        self.blocks = []
+
+    def getVertices(self) -> list:
+        """@return: list mapping vertex id -> Vertex, ie the column order of every distance row"""
+        return self.compact.getVertices()
+
+    def getId(self, v: Vertex) -> int:
+        return self.compact.getId(v)
+
+    def dijkstraRows(self, sources=None, chunksize: int = 1):
+        """
+        Runs Dijkstra's from every source in parallel, yielding results as soon as each one finishes (so not
+        necessarily in the order of sources).
+        @param sources: iterable of source Vertices, defaults to every vertex (ie all-pairs shortest paths)
+        @param chunksize: number of sources handed to a worker at a time, larger amortizes IPC for small graphs
+        @return: generator of (source Vertex, array('d') of distances indexed by vertex id, inf if unreachable)
+        """
+        ids = range(self.compact.numVertices()) if sources is None else [self.getId(s) for s in sources]
+        for s, row in self.pool.imap_unordered(_dijkstraRow, ids, chunksize):
+            yield self.compact.getVertex(s), row
+
+    def dijkstraDistances(self, sources=None, chunksize: int = 1) -> dict:
+        """
+        Convenience wrapper around dijkstraRows that collects Vertex-keyed mappings, like Graph.dijkstra_SSSP's.
+        @return: {source: {v: d(source, v), ...}, ...}
+        """
+        vertices = self.getVertices()
+        return {s: dict(zip(vertices, row)) for s, row in self.dijkstraRows(sources, chunksize)}
@@ -0,0 +1,97 @@
+"""
+Transitive closure index for a static Graph: "is v reachable from u" in O(1) after preprocessing.
+
+Vertices in the same strongly connected component reach exactly the same set, so the closure is only computed per
+component, over the condensation DAG. Component ids come out of Graph.stronglyConnectedComponents in topological order,
+so walking the ids in reverse sees every successor before its predecessors, and each component's reachable set is its
+own bit OR'd with its successors' sets, as Python ints used as bitsets (one big-int OR per condensation edge).
+Each finished set is then frozen into a fixed width little-endian bytes row, so testing one bit is a single byte index
+instead of a shift over a big int.
+    build: O(|V| + |E| + |E_c| * C / 64), memory: C^2 / 8 bytes, for C components and |E_c| condensation edges
+so it suits graphs with up to tens of thousands of components (or any graph with a few big SCCs).
+
+@author: Bill Wu
+"""
+
+from Graph import Graph, Vertex
+
+class ReachabilityIndex:
+    def __init__(self, componentOf: dict, components: list, rows: list, version: int):
+        self.componentOf = componentOf  # Vertex -> component id
+        self.components = components  # Component id -> list of its vertices
+        self.rows = rows  # Component id -> bytes, bit c is set iff component c is reachable from it
+        self.version = version  # Graph.version the index was built at
+
+    @staticmethod
+    def build(G: Graph) -> "ReachabilityIndex":
+        """
+        @param G: input graph, not mutated. The index is a snapshot, see isCurrent()
+        @return: ReachabilityIndex over G
+        """
+        componentOf, components = G.stronglyConnectedComponents()
+        numComponents = len(components)
+        successors = [set() for _ in range(numComponents)]
+        for u, children in G.edges.items():
+            a = componentOf[u]
+            for v in children:
+                if componentOf[v] != a:
+                    successors[a].add(componentOf[v])
+
+        reach = [0] * numComponents
+        for c in range(numComponents - 1, -1, -1):  # Reverse topological order, successors are done first
+            mask = 1 << c
+            for d in successors[c]:
+                mask |= reach[d]
+            reach[c] = mask
+        width = (numComponents + 7) // 8
+        rows = [mask.to_bytes(width, "little") for mask in reach]
+        return ReachabilityIndex(componentOf, components, rows, G.version)
+
+    def isCurrent(self, G: Graph) -> bool:
+        """@return: False if G has been mutated since the index was built, in which case answers may be stale"""
+        return G.version == self.version
+
+    def _getComponent(self, v: Vertex) -> int:
+        if v not in self.componentOf:
+            raise ValueError("Vertex not present in graph: %r" % v)
+        return self.componentOf[v]
+
+    def reachable(self, u: Vertex, v: Vertex) -> bool:
+        """@return: True if there is a path u ~~> v (every vertex reaches itself), in O(1)"""
+        c = self._getComponent(v)
+        return bool(self.rows[self._getComponent(u)][c >> 3] >> (c & 7) & 1)
+
+    def reachableMask(self, sources) -> int:
+        """
+        @param sources: iterable of vertices
+        @return: bitset (int) of the component ids reachable from any of sources, for further bitwise ops (eg & of
+            two masks for the components reachable from both, or complementMask(mask) for the rest)
+        """
+        mask = 0
+        for u in sources:
+            mask |= int.from_bytes(self.rows[self._getComponent(u)], "little")
+        return mask
+
+    def complementMask(self, mask: int) -> int:
+        """@return: bitset of every component whose bit is not set in mask (unlike ~mask, which is negative)"""
+        return ((1 << len(self.components)) - 1) & ~mask
+
+    def verticesOf(self, mask: int) -> list:
+        """@return: list of the vertices in every component whose bit is set in mask"""
+        vertices = []
+        while mask:
+            low = mask & -mask
+            vertices.extend(self.components[low.bit_length() - 1])
+            mask ^= low
+        return vertices
+
+    def reachableFrom(self, sources) -> set:
+        """@return: set of vertices reachable from any of sources (including the sources themselves)"""
+        return set(self.verticesOf(self.reachableMask(sources)))
+
+    def numComponents(self) -> int:
+        return len(self.components)
+
+    def memoryBytes(self) -> int:
+        """@return: bytes held by the bitset rows, ie the closure itself (the vertex -> component map is extra)"""
+        return sum(len(row) for row in self.rows)
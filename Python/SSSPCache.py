@@ -0,0 +1,93 @@
+"""
+LRU cache of single-source shortest path results for a Graph.
+
+Results are keyed by (algorithm, source, graph version), where Graph.version is bumped by every mutating method, so a
+repeated query on an unchanged graph is a dictionary lookup, and the first query after a mutation recomputes. Since
+versions only ever increase, entries of an older version can never be hit again, and are dropped as soon as a change
+is noticed rather than waiting to be evicted.
+
+Usage:
+    cache = SSSPCache(G, maxSize=64)
+    d, parents = cache.dijkstra_SSSP(s)  # Computed
+    d, parents = cache.dijkstra_SSSP(s)  # Cached, until G changes
+Cached results are shared between callers, so treat them as read-only.
+
+@author: Bill Wu
+"""
+
+from collections import OrderedDict
+from Graph import Graph, Vertex
+from Topological_Sort import SSSPTopologicalRelaxation
+
+# Algorithm name -> function(G, source) computing its result
+ALGORITHMS = {
+    "dijkstra": lambda G, s: G.dijkstra_SSSP(s),
+    "bellmanFord": lambda G, s: G.bellmanFord_SSSP(s),
+    "spfa": lambda G, s: G.spfa_SSSP(s),
+    "topologicalRelaxation": SSSPTopologicalRelaxation,
+}
+
+class SSSPCache:
+    def __init__(self, G: Graph, maxSize: int = 128):
+        """
+        @param G: graph whose shortest paths are cached. It may keep being mutated through its methods
+        @param maxSize: max number of cached results, the least recently used one is evicted past that
+        """
+        if maxSize < 1:
+            raise ValueError("Cache size must be positive, got %r" % maxSize)
+        self.G = G
+        self.maxSize = maxSize
+        self.results = OrderedDict()  # (algorithm, source, version) -> result, least recently used first
+        self.version = G.version
+        self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def query(self, algorithm: str, source: Vertex):
+        """
+        @param algorithm: one of ALGORITHMS' names
+        @param source: source vertex
+        @return: the algorithm's result for source on the current graph, see the corresponding Graph method
+        """
+        if algorithm not in ALGORITHMS:
+            raise ValueError("Unknown SSSP algorithm %r, expected one of %s" % (algorithm, sorted(ALGORITHMS)))
+        if self.G.version != self.version:
+            self.invalidations += len(self.results)
+            self.results.clear()
+            self.version = self.G.version
+
+        key = (algorithm, source, self.version)
+        if key in self.results:
+            self.hits += 1
+            self.results.move_to_end(key)
+            return self.results[key]
+        self.misses += 1
+        result = ALGORITHMS[algorithm](self.G, source)
+        self.results[key] = result
+        if len(self.results) > self.maxSize:
+            self.results.popitem(last=False)
+            self.evictions += 1
+        return result
+
+    def dijkstra_SSSP(self, source: Vertex) -> tuple:
+        return self.query("dijkstra", source)
+
+    def bellmanFord_SSSP(self, source: Vertex) -> tuple:
+        return self.query("bellmanFord", source)
+
+    def spfa_SSSP(self, source: Vertex) -> tuple:
+        return self.query("spfa", source)
+
+    def SSSPTopologicalRelaxation(self, source: Vertex) -> dict:
+        return self.query("topologicalRelaxation", source)
+
+    def clear(self):
+        self.results.clear()
+
+    def __len__(self):
+        return len(self.results)
+
+    def getStats(self) -> dict:
+        """@return: hit/miss counters, plus entries evicted by size and dropped because the graph changed"""
+        lookups = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "hitRate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions, "invalidations": self.invalidations, "size": len(self.results),
+                "maxSize": self.maxSize}
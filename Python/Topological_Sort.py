@@ -2,56 +2,71 @@ from Graph import *
 
 """
 Topological Sort:
-Use DFS subroutine to get a topological sorted order of vertices, ie for each edge (u,v), u comes before v in the
-sorted ordering. Consider in future refactoring: change adjacency set to graph abstract data type
+Use in-degree counting (Kahn's algorithm) to get a topological sorted order of vertices, ie for each edge (u,v),
+u comes before v in the sorted ordering. Iterative, so deep DAGs don't hit the recursion limit, and detects cycles
+along the way instead of needing a separate verifyDAG pass.
 Author: Bill Wu
 Date: 8/4/19
 """
 
-def topological_sort(graph):
+class CycleDetectedException(Exception):
+    pass
+
+def topological_levels(graph, source=None):
     """
-    Conducts a topological ordering of vertices of a graph
-    :param graph: graph input graph as adjacency set, assumes vertices are integers,
-                  also assume for now graph is fully connected and is a DAG (directed acyclic graph)
-                  must also contain all vertices present in the keys of the adjacency set
-    :return: list of graph vertices in topologically sorted order
+    Kahn's algorithm: repeatedly removes every vertex with no remaining in-edges. The vertices removed together in
+    one round form a "level", an antichain with no edges between them, so each level can be scheduled in parallel
+    once all earlier levels are done. Iterative and O(V + E), and a generator so levels can be consumed lazily.
+    :param graph: input Graph
+    :param source: if specified, only the vertices reachable from source are sorted
+    :return: generator of lists of vertices, one list per level, in topological order
+    :raises CycleDetectedException once the levels run out, if some vertices could never be removed (ie the graph,
+            or the part reachable from source, has a cycle)
     """
-    result, visited = [], set()
-    unvisited = [Vertex(v.val) for v in graph.getVertices()]  # Deep copy
-    while nodes_left_to_traverse(graph.getVertices(), visited) and unvisited:
-        add_children_of(graph, next(iter(unvisited)), result, visited, unvisited)
-    return [v.val for v in result]
+    if source is None:
+        vertices = set(graph.getVertices()).union(graph.getEdges())
+    else:
+        vertices, _ = graph.bfsTree([source])
+    inDegree = {v: 0 for v in vertices}
+    for u in vertices:
+        for v in graph[u]:
+            inDegree[v] += 1
 
-def add_children_of(graph, root, result, visited, unvisited=None):
+    level = [v for v in vertices if inDegree[v] == 0]
+    numSorted = 0
+    while level:
+        yield level
+        numSorted += len(level)
+        nextLevel = []
+        for u in level:
+            for v in graph[u]:
+                inDegree[v] -= 1
+                if inDegree[v] == 0:
+                    nextLevel.append(v)
+        level = nextLevel
+
+    if numSorted != len(vertices):
+        raise CycleDetectedException("%d vertices are on or reachable from a cycle" % (len(vertices) - numSorted))
+
+def topological_order(graph, source=None):
     """
-    Prepends the root node before its children in the result list based on DFS ordering
-    Updates visited and unvisited sets to reflect traversal through nodes under root
-    :param graph: input graph
-    :param root: starting node of the traversal
-    :param result: list of nodes meant to be in topological order after this function call
-    :param visited: set of visited nodes
-    :param unvisited: optional to specify which nodes must still be traversed, potentially in a separate tree
+    Lazily yields the vertices of a graph in topologically sorted order, level by level (see topological_levels)
+    :param graph: input Graph
+    :param source: if specified, only the vertices reachable from source are yielded
+    :return: generator of vertices
+    :raises CycleDetectedException once exhausted, if the graph has a cycle
     """
-    visited.add(root)
-    for child in graph[root]:
-        if child not in visited:
-            add_children_of(graph, child, result, visited, unvisited)
+    for level in topological_levels(graph, source):
+        yield from level
 
-    # prepend the node to the front of the topological ordering, in front of its children
-    result.insert(0, root)
-    if unvisited is not None:
-        unvisited.remove(root)
-
-def nodes_left_to_traverse(all_nodes, visited_nodes):
+def topological_sort(graph):
     """
-    Checks if there are nodes left to traverse, given the set of all graph nodes and the current visited set
-    :param all_nodes: graph nodes set
-    :param visited_nodes: visited nodes set
-    :return: true if nodes left, false o/w
+    Conducts a topological ordering of vertices of a graph
+    :param graph: graph input graph as adjacency set, must be a DAG (directed acyclic graph), need not be connected
+    :return: list of graph vertex values in topologically sorted order
+    :raises CycleDetectedException if the graph has a cycle
     """
-    # Uncomment when debugging, ensure that no non-graph nodes are ever added to visited set
-    # assert visitedNodes.issubset(allNodes)
-    return len(all_nodes) != len(visited_nodes)
+    return [v.val for v in topological_order(graph)]
 
 def topological_sort_SS(graph, source):
     """
@@ -59,20 +74,115 @@ def topological_sort_SS(graph, source):
     :param graph: input graph
     :param source: input source
     :return: list of nodes of the graph that are reachable from source in a topological ordering
+    :raises CycleDetectedException if there is a cycle reachable from source
+    """
+    return list(topological_order(graph, source))
+
+class DynamicTopologicalOrder:
     """
-    result, visited = [source], {source}
-    add_children_of(graph, source, result, visited)
-    return result
+    Maintains a topological order of a DAG while edges are inserted one at a time (Pearce & Kelly, 2006), instead of
+    re-sorting the whole graph after every change. All edges must be added through this class' addEdge so the order
+    stays in sync with the underlying Graph.
 
-def SSlongestPathDAG(g, s):
-    g.verifyDAG(s)
+    Each vertex has a position in the order. Inserting (u, v) with pos(u) < pos(v) changes nothing. O/w only the
+    "affected region" pos(v) <= pos(x) <= pos(u) can be out of order: a forward search from v (restricted to that
+    region) finds deltaF, the vertices that must now come after u, and a backward search from u finds deltaB, the
+    vertices that must come before v. If the forward search reaches u, the edge would close a cycle and is rejected.
+    O/w the positions already held by deltaB and deltaF are reassigned, deltaB first then deltaF, each keeping their
+    relative order. The cost is proportional to the edges within the affected region, not the whole graph.
+    """
+    def __init__(self, graph=None):
+        """
+        :param graph: optional initial DAG, which is sorted once with Kahn's algorithm and then wrapped (not copied)
+        :raises CycleDetectedException if the initial graph has a cycle
+        """
+        self.graph = Graph() if graph is None else graph
+        self.order = list(topological_order(self.graph))  # position -> vertex
+        self.position = {v: i for i, v in enumerate(self.order)}  # vertex -> position
+        # In-edges {v: {u1, u2, ...}, ...} for the backward search. Kept here rather than in the graph's optional
+        # reverse index, which would stay switched on for the caller's graph
+        self.parents = {}
+        for u, children in self.graph.edges.items():
+            for v in children:
+                self.parents.setdefault(v, set()).add(u)
+
+    def getOrder(self) -> list:
+        """:return: the current topological order (the internal list itself, do not mutate)"""
+        return self.order
+
+    def getPosition(self, v) -> int:
+        return self.position[v]
+
+    def addVertex(self, x):
+        """Adds an isolated vertex at the end of the order, if not already present. Raw values are wrapped in Vertex"""
+        v = x if isinstance(x, Vertex) else Vertex(x)
+        if v not in self.position:
+            self.graph.getVertices().add(v)
+            self.graph.markModified()  # Added in place, so results cached over the graph (eg SSSPCache) are stale
+            self.position[v] = len(self.order)
+            self.order.append(v)
+        return v
+
+    def addEdge(self, u, v, w=0):
+        """
+        Adds edge (u, v) with weight w to the graph, and updates the topological order locally
+        :raises CycleDetectedException (and leaves the graph unchanged) if the edge would create a cycle
+        """
+        u, v = (x if isinstance(x, Vertex) else Vertex(x) for x in (u, v))
+        if u == v:
+            raise CycleDetectedException("Self loop on %r" % u)
+        # Only an edge between two existing vertices can close a cycle (a new vertex has no edges yet), so that search
+        # runs before either endpoint is added, and raising leaves the graph, its version and the order untouched
+        deltaF = None
+        if u in self.position and v in self.position and self.position[v] < self.position[u]:
+            upper = self.position[u]
+            deltaF = self._search(v, lambda x: self.graph[x], lambda p: p <= upper, u)
+        u, v = self.addVertex(u), self.addVertex(v)
+        lower, upper = self.position[v], self.position[u]
+        if lower < upper:
+            if deltaF is None:  # u is new, so it was appended after v and the search from v cannot reach it
+                deltaF = self._search(v, lambda x: self.graph[x], lambda p: p <= upper, u)
+            deltaB = self._search(u, lambda x: self.parents.get(x, ()), lambda p: p >= lower, None)
+            self._reorder(deltaB, deltaF)
+        self.graph.addEdge(u, v, w)
+        self.parents.setdefault(v, set()).add(u)
+
+    def _search(self, start, neighbors, inRegion, cycleVertex) -> list:
+        """Iterative DFS from start over neighbors within the affected region, raising if cycleVertex is reached"""
+        visited, stack = {start}, [start]
+        while stack:
+            x = stack.pop()
+            for y in neighbors(x):
+                if y == cycleVertex:
+                    raise CycleDetectedException("Edge (%r, %r) would create a cycle" % (cycleVertex, start))
+                if y not in visited and inRegion(self.position[y]):
+                    visited.add(y)
+                    stack.append(y)
+        return list(visited)
+
+    def _reorder(self, deltaB: list, deltaF: list):
+        deltaB.sort(key=self.position.get)
+        deltaF.sort(key=self.position.get)
+        slots = sorted(self.position[x] for x in deltaB + deltaF)
+        for x, p in zip(deltaB + deltaF, slots):
+            self.position[x] = p
+            self.order[p] = x
+
+def SSlongestPathDAG(g, s, order=None):
+    """
+    Finds the single source longest paths between the source s and all other vertices of a DAG
+    :param order: optional topological order of all of g's vertices (eg DynamicTopologicalOrder.getOrder()), to
+                  avoid re-sorting g. O/w the vertices reachable from s are sorted first
+    :return: mapping of vertex u -> longest path weight from s to u, -inf if unreachable
+    :raises CycleDetectedException if there is a cycle reachable from s (only checked when sorting)
+    """
     # Initialize all longest paths to -inf, if by the end any longest path is still -inf then it is unreachable from s
     longestPaths = {s: 0}  # maps vertex u -> LD(s, u) for all vertices u, where LD -> longest distance
     for v in g.vertices:
         if v != s:
             longestPaths[v] = -float('inf')
 
-    sortedVertices = topological_sort_SS(g, s)
+    sortedVertices = topological_sort_SS(g, s) if order is None else order
     for u in sortedVertices:
         if u in g.edges.keys():
             for v in g.edges[u]:
@@ -80,20 +190,22 @@ def SSlongestPathDAG(g, s):
                 longestPaths[v] = max(longestPaths[v], longestPaths[u] + g.edges[u][v])
     return longestPaths
 
-def SSSPTopologicalRelaxation(g, s):
+def SSSPTopologicalRelaxation(g, s, order=None):
     """
     Finds the single source shortest paths between the source s and all other vertices
     The graph must be a DAG for the algorithm to produce the correct SSSP
+    :param order: optional topological order of all of g's vertices (eg DynamicTopologicalOrder.getOrder()), to
+                  avoid re-sorting g. O/w the vertices reachable from s are sorted first
     :return: mapping of vertex pairs to their shortest path weight
+    :raises CycleDetectedException if there is a cycle reachable from s (only checked when sorting)
     """
-    g.verifyDAG(s)
     shortestPaths = {s:0}  # maps vertex u -> d(s, u) for all vertices u
     for v in g.vertices:
         if v != s:
             shortestPaths[v] = float('inf')
 
     # list of graph's vertices reachable from s in topological order
-    verticesSorted = topological_sort_SS(g, s)
+    verticesSorted = topological_sort_SS(g, s) if order is None else order
     for u in verticesSorted:
         if u in g:
             for v in g[u]:
@@ -111,6 +223,7 @@ if __name__ == '__main__':
 
     # {0: {5}, 1:{3,0}, 2: {4}, 3:{2}, 4:{}, 5:{}}
     print(topological_sort(ezGraph))
+    print("Levels: ", [[v.val for v in level] for level in topological_levels(ezGraph)])
 
     a, b, c, d, e = Vertex("a"), Vertex("b"), Vertex("c"), Vertex("d"), Vertex("e")
     g = Graph()
@@ -127,7 +240,7 @@ if __name__ == '__main__':
     try:
         print(SSSPTopologicalRelaxation(g, a))
         print("successfully determined that graph g was a DAG")
-    except AssertionError:
+    except CycleDetectedException:
         print("wasn't supposed to fail...")
 
     g2 = Graph()
@@ -138,7 +251,7 @@ if __name__ == '__main__':
 
     try:
         print(SSSPTopologicalRelaxation(g2, a))
-    except AssertionError:
+    except CycleDetectedException:
         print("successfully detected graph g2 was not a DAG")
 
     print("Longest path dict: ", SSlongestPathDAG(g, a))
@@ -14,72 +14,43 @@ Date: June 4, 2020
 """
 
 from Graph import Graph, Vertex
+from EdgeListReader import loadGraph
 
-def process_input(airports: list, routes: list) -> Graph:
+def process_input(airports: list, routes) -> Graph:
     """
-    Given a list of airports (as str/vertices), a list of routes (as either tuples or lists of str/vertex, return the
+    Given a list of airports (as str/vertices), and routes (as either tuples or lists of str/vertex), return the
     resulting directed Graph that represents the current flight options, where vertices are airports and edges are
-    one-way flights.
+    one-way flights. Routes can be any iterable, eg a generator, and are consumed in one pass via Graph.addEdges.
     """
     V = set(airports)
     G = Graph(V)
-    for s, d in routes:
-        G.addEdge(s, d)
+    G.addEdges(routes)
     return G
 
+def load_routes(path: str, airports: list = (), **kwargs) -> Graph:
+    """
+    Streams a routes file, one "source destination" pair per line (see EdgeListReader for the formats), into the
+    flight Graph chunk by chunk, so route dumps too big for a list can be loaded.
+    @param airports: airports (as str/vertices) to include even if no route mentions them
+    @param kwargs: any EdgeListReader.readEdgeChunks option (delimiter, chunkSize, skipHeader, stats, progress, ...)
+    @return: the flight Graph, as from process_input
+    """
+    G = Graph(a if isinstance(a, Vertex) else Vertex(a) for a in airports)
+    return loadGraph(path, G, **kwargs)
+
 def min_additional_routes(G: Graph, start: Vertex) -> int:
     """
     Given a directed graph of the current airline routes, output the minimum number of additional routes needed to be
-    able to have a path from the start airport to every other airport (ie G.V).
+    able to have a path from the start airport to every other airport (ie G.V). O(|V| + |E|).
     """
-    # 1. Delineate all vertices reachable from each airport/node u, stored in a map<str, int>, remove already visited
-    #    nodes from the search space if re-visited during DFS since that implies that an ancestor must reach >= 1 more
-    #    nodes than the visited node
-    reachable = set()
-    start_reachable_nodes = set()
-
-    def dfs_reachable_nodes(root, visited):
-        if root in visited:
-            return
-        visited.add(root)
-        start_reachable_nodes.add(root)
-        for child in G.getChildren(root):
-            if child not in visited:
-                dfs_reachable_nodes(child, visited)
-
-    dfs_reachable_nodes(start, set())
-    search_space = {v for v in G.vertices if v not in start_reachable_nodes}
-
-    # 2. Find the u with the largest reachable set of nodes, remove all reachable nodes from search space
-    # 3. Repeat step 2. until search space exhausted
-    def dfs_remove(root, visited):
-        # Run DFS from root and remove all child nodes from the search_space
-        visited.add(root)
-        # If it's no longer in the search space, just terminate right here since already DFS removed it + its children
-        if root not in search_space:
-            return
-        search_space.remove(root)
-        for child in G.getChildren(root):
-            if child not in visited:
-                dfs_remove(child, visited)
-
-    def dfs(root, visited):
-        if root in reachable:
-            dfs_remove(root, set())
-            return
-
-        visited.add(root)
-        for child in G.getChildren(root):
-            if child not in visited:
-                dfs(child, visited)
-        reachable.add(root)
-
-    for v in search_space.copy():
-        dfs(v, set())
-
-    # 4. Return number of iterations required
-    return len(search_space)
-
+    # 1. Contract every strongly connected component (airports that can all reach each other) into one vertex of the
+    #    condensation DAG, since one route into a component reaches all of it
+    C, componentOf, _ = G.condensation()
+    # 2. Every component with no incoming routes, other than start's, needs its own new route from start. Those routes
+    #    are also enough: every other component is reachable from some component with no incoming routes
+    hasIncomingRoute = {v for children in C.edges.values() for v in children}
+    startComponent = Vertex(componentOf[start])
+    return sum(1 for c in C.vertices if c not in hasIncomingRoute and c != startComponent)
 
 if __name__ == "__main__":
     a = Vertex("A")
@@ -1,5 +1,11 @@
+import os
+import random
+import tempfile
 import unittest
 from FlowNetwork import *
+from MaxFlow import MAX_FLOW_ALGORITHMS
+from MinCostFlow import InfeasibleFlowException, MIN_COST_FLOW_ALGORITHMS, NegativeCostCycleException
+from Instrumentation import Instrumentation
 from tests.midnights import *
 
 class FlowNetworkTests(unittest.TestCase):
@@ -8,6 +14,7 @@ class FlowNetworkTests(unittest.TestCase):
         - Use checkRep() to ensure that the flow network is valid and expected at all times
         - addEdge(): Edges, vertices, weights, and capacities mappings all properly updated
             - Negative capacity exception properly thrown
+            - Non-integer or 64-bit overflowing capacity/cost rejected, network left unchanged
             - 0, >0 capacity edge
         - getAugmentingPath()
             - No path from S (source) to T (sink)
@@ -20,6 +27,9 @@ class FlowNetworkTests(unittest.TestCase):
         - getMinCostMaxFlow(): (after identifying a feasible max flow, there exists: )
             - 0, 1, >1 negative cost cycles
             - 0, 1, >1 minimum capacity through cycle (if exists)
+        - instrument(): counters/timings for getMaxFlow and getMinCostMaxFlow
+        - Graph views: capacity/flow/residual/cost graphs materialized from the arcs, cached until the network changes
+        - serializeToJSON()/deserialize(): round trip keeps capacities, costs and flow
     """
 
     def testNegativeCapacity(self):
@@ -27,6 +37,17 @@ class FlowNetworkTests(unittest.TestCase):
         G = FlowNetwork(a, b)
         self.assertRaises(NegativeCapacityException, G.addEdge(a, b, -5))
 
+    def testInvalidCapacityOrCost(self):
+        a, b = Vertex("a"), Vertex("b")
+        G = FlowNetwork(a, b)
+        self.assertRaises(TypeError, G.addEdge, a, b, 2.5)
+        self.assertRaises(TypeError, G.addEdge, a, b, 2, 0.5)
+        self.assertRaises(ValueError, G.addEdge, a, b, 2 ** 63)
+        self.assertRaises(ValueError, G.addEdge, a, b, 2, -2 ** 63)
+        self.assertFalse(G.hasEdge(a, b))
+        G.addEdge(a, b, 2 ** 63 - 1, -(2 ** 63 - 1))
+        self.assertTrue(G.hasEdge(a, b))
+
     def testAddNetworkEdgeStartEmpty(self):
         a, b, c, d, e, f = Vertex("a"), Vertex("b"), Vertex("c"), Vertex("d"), Vertex("e"), Vertex("f")
         G = FlowNetwork(a, f)
@@ -89,6 +110,90 @@ class FlowNetworkTests(unittest.TestCase):
         self.assertEqual(minCost, 450)
         self.assertEqual(maxFlow, 30)
 
+    def testInstrumentation(self):
+        s, a, b, t = Vertex("S"), Vertex("a"), Vertex("b"), Vertex("T")
+        G = FlowNetwork(s, t)
+        G.addEdge(s, a, 10, 1)
+        G.addEdge(s, b, 5, 1)
+        G.addEdge(a, b, 10, 1)
+        G.addEdge(a, t, 5, 5)
+        G.addEdge(b, t, 15, 1)
+        runs = []
+        inst = G.instrument(Instrumentation(callback=lambda algorithm, counters, timings: runs.append(algorithm)))
+        self.assertEqual(G.getMinCostMaxFlow(), (40, 15))
+
+        counters, timings = inst.asDict()["counters"], inst.asDict()["timings"]
+        self.assertEqual(runs[-2:], ["getMaxFlow", "getMinCostMaxFlow"])
+        self.assertEqual(counters["getMaxFlow.runs"], 1)
+        self.assertGreaterEqual(counters["getMaxFlow.augmentingPaths"], 2)
+        self.assertGreaterEqual(counters["getMaxFlow.augmentingPathEdges"], 2 * counters["getMaxFlow.augmentingPaths"])
+        self.assertIn("getMinCostMaxFlow.cycleCancellations", counters)
+        for key in ("getMaxFlow.edmondsKarp", "getMinCostMaxFlow.maxFlow", "getMinCostMaxFlow.cycleCancelling"):
+            self.assertGreaterEqual(timings[key], 0)
+
+    def testGraphViews(self):
+        s, a, b, t = Vertex("S"), Vertex("a"), Vertex("b"), Vertex("T")
+        G = FlowNetwork(s, t, [s, a, b, t, Vertex("isolated")])
+        G.addEdge(s, a, 3, 1)
+        G.addEdge(a, b, 2, 2)
+        G.addEdge(b, a, 2, 5)
+        G.addEdge(a, t, 2)
+        G.addEdge(b, t, 4, 1)
+        self.assertEqual(G.capacityGraph.edges, {s: {a: 3}, a: {b: 2, t: 2}, b: {a: 2, t: 4}})
+        self.assertEqual(G.cost, {s: {a: 1}, a: {b: 2}, b: {a: 5, t: 1}})
+        self.assertIn(Vertex("isolated"), G.capacityGraph.vertices)
+        flowGraph = G.flowGraph
+        self.assertIs(G.flowGraph, flowGraph)  # Cached until the network changes
+        self.assertEqual(G.getMaxFlow(), 3)
+        self.assertIsNot(G.flowGraph, flowGraph)
+        self.assertEqual(flowGraph.edges, {s: {a: 0}, a: {b: 0, t: 0}, b: {a: 0, t: 0}})
+        self.assertEqual(G.flowGraph.edges, {s: {a: 3}, a: {b: 1, t: 2}, b: {a: 0, t: 1}})
+        self.assertEqual(G.residualGraph.edges, {a: {s: 3, b: 1}, b: {a: 2 + 1, t: 3}, t: {a: 2, b: 1}})
+        self.assertEqual(G.costGraph.edges, {a: {s: -1, b: 2}, b: {a: -2, t: 1}, t: {a: 0, b: -1}})
+        self.assertEqual((G.getFlowCost(), G.getFlow(a, b)), (1 * 3 + 2 * 1 + 1 * 1, 1))
+        G.checkRep()
+
+        G.resetFlowAndResidualGraph()
+        G.pushAugmentingFlow([s, a, b, t], costsPresent=False)
+        self.assertEqual(G.flowGraph.edges, {s: {a: 2}, a: {b: 2, t: 0}, b: {a: 0, t: 2}})
+        # Going from b to a sends the flow on (a, b) back rather than using the edge (b, a)
+        G.pushAugmentingFlow([a, t, b, a], costsPresent=True)
+        self.assertEqual(G.flowGraph.edges, {s: {a: 2}, a: {b: 0, t: 2}, b: {a: 0, t: 0}})
+        self.assertEqual(G.getFlowCost(), 2)
+        G.checkRep()
+
+    def testNegCostResidualCycle(self):
+        s, a, b, c, t = Vertex("S"), Vertex("a"), Vertex("b"), Vertex("c"), Vertex("T")
+        G = FlowNetwork(s, t)
+        G.addEdge(s, a, 1, 0)
+        G.addEdge(a, t, 1, 0)
+        G.addEdge(b, c, 2, -3)
+        G.addEdge(c, b, 2, 3)  # Away from S and T, so only a search from every vertex finds b -> c -> b
+        self.assertIsNone(G.getNegCostResidualCycle())
+        G.addEdge(c, b, 2, 2)
+        cycle = G.getNegCostResidualCycle()
+        self.assertEqual((len(cycle), cycle[0]), (3, cycle[-1]))
+        self.assertEqual(set(cycle), {b, c})
+        self.assertEqual(G.getMinCostMaxFlow(), (-2, 1))
+        self.assertEqual(G.flowGraph.edges, {s: {a: 1}, a: {t: 1}, b: {c: 2}, c: {b: 2}})
+
+    def testSerializeRoundTrip(self):
+        s, a, b, t = Vertex("S"), Vertex("a"), Vertex("b"), Vertex("T")
+        G = FlowNetwork(s, t, [Vertex("isolated")])
+        for u, v, cp, w in ((s, a, 4, 1), (s, b, 2, 3), (a, b, 3, 1), (b, a, 1, 1), (a, t, 2, 2), (b, t, 5, 1)):
+            G.addEdge(u, v, cp, w)
+        self.assertEqual(G.getMinCostMaxFlow(), (2 * (3 + 1) + 2 * (1 + 2) + 2 * (1 + 1 + 1), 6))
+        with tempfile.TemporaryDirectory() as directory:
+            outPath = os.path.join(directory, "network.json")
+            G.serializeToJSON(outPath)
+            loaded = FlowNetwork.deserialize(outPath)
+        for view in ("capacityGraph", "flowGraph", "residualGraph", "costGraph"):
+            self.assertEqual(getattr(loaded, view).edges, getattr(G, view).edges)
+        self.assertEqual(loaded.cost, G.cost)
+        self.assertEqual(loaded.capacityGraph.vertices, G.capacityGraph.vertices)
+        self.assertEqual((loaded.getFlowCost(), loaded.getFlowValue()), (20, 6))
+        loaded.checkRep()
+
     def testMidnightsMediumComplexity(self):
         inpPath = "midnights.json"
         dayToMidnights, midnightPointValues, midnightsToNumReq, people, dayPreferences, midnightPreferences, progress = extractData(inpPath)
@@ -124,6 +229,327 @@ class FlowNetworkTests(unittest.TestCase):
         # TODO: When a bunch of people are done with their requirement but a few aren't, then ensure they are assigned
         pass
 
+class MaxFlowTests(unittest.TestCase):
+    """
+    Testing Strategy:
+        - getMaxFlow(algorithm=...): same flow value as Edmonds-Karp, and a valid flow and residual state
+            - random networks with/without antiparallel edges, bipartite matching network, no S~~~>T path, long path
+            - flow already in the network, unknown algorithm
+        - getMinCostMaxFlow() on top of the flow found, instrumentation counters
+        - ResidualArcs: paired arcs, pushes, the residual and cost graph views of antiparallel edges
+    """
+
+    @staticmethod
+    def randomNetwork(seed: int, n: int, m: int, antiparallel: bool = False) -> FlowNetwork:
+        """Random network on vertices 0..n-1 (S = 0, T = n-1), with antiparallel edge pairs only if asked for"""
+        rng = random.Random(seed)
+        F = FlowNetwork(Vertex(0), Vertex(n - 1))
+        for _ in range(m):
+            u, v = Vertex(rng.randrange(n)), Vertex(rng.randrange(n))
+            if u != v and (antiparallel or not F.hasEdge(v, u)):
+                F.addEdge(u, v, rng.randint(1, 20), rng.randint(0, 10))
+        return F
+
+    def assertValidMaxFlow(self, F: FlowNetwork, value: int):
+        """Checks capacities and conservation of F's flow, and that its residual graph is exactly c - f + f^R > 0"""
+        flows, balance = F.flowGraph.edges, {}
+        for u, children in F.capacityGraph.edges.items():
+            for v, c in children.items():
+                f = flows[u][v]
+                self.assertTrue(0 <= f <= c)
+                balance[u], balance[v] = balance.get(u, 0) - f, balance.get(v, 0) + f
+                r = c - f + flows.get(v, {}).get(u, 0)
+                self.assertEqual(F.residualGraph.edges.get(u, {}).get(v, 0), r)
+                if v not in F.capacityGraph.edges or u not in F.capacityGraph[v]:
+                    self.assertEqual(F.residualGraph.edges.get(v, {}).get(u, 0), f)
+        for x, b in balance.items():
+            if x not in (F.source, F.sink):
+                self.assertEqual(b, 0)
+        self.assertEqual(balance.get(F.sink, 0), value)
+        self.assertIsNone(F.getAugmentingPath())
+
+    def testRandomNetworksMatchEdmondsKarp(self):
+        for seed in range(20):
+            expected = self.randomNetwork(seed, 12, 40).getMaxFlow()
+            for algorithm in MAX_FLOW_ALGORITHMS:
+                F = self.randomNetwork(seed, 12, 40)
+                self.assertEqual(F.getMaxFlow(algorithm=algorithm), expected)
+                self.assertValidMaxFlow(F, expected)
+
+    def testAntiparallelEdges(self):
+        for seed in range(20):
+            F = self.randomNetwork(seed, 12, 40, antiparallel=True)
+            expected = F.getMaxFlow(algorithm="dinic")
+            self.assertValidMaxFlow(F, expected)
+            for algorithm in MAX_FLOW_ALGORITHMS:
+                F = self.randomNetwork(seed, 12, 40, antiparallel=True)
+                self.assertEqual(F.getMaxFlow(algorithm=algorithm), expected)
+                self.assertValidMaxFlow(F, expected)
+                F.checkRep()
+        s, a, t = Vertex("s"), Vertex("a"), Vertex("t")
+        F = FlowNetwork(s, t)
+        F.addEdge(s, a, 4)
+        F.addEdge(a, s, 2)
+        F.addEdge(a, t, 3)
+        self.assertEqual(F.getMaxFlow(algorithm="dinic"), 3)
+        self.assertEqual(F.flowGraph.edges, {s: {a: 3}, a: {s: 0, t: 3}})
+        F = FlowNetwork(s, t)  # Push-relabel saturates (s, a) first, then has to return the excess to s
+        F.addEdge(s, a, 4)
+        F.addEdge(a, s, 2)
+        F.addEdge(a, t, 3)
+        self.assertEqual(F.getMaxFlow(algorithm="pushRelabel"), 3)
+        self.assertValidMaxFlow(F, 3)
+
+    def testMinCostAfterDinic(self):
+        s, a, b, c, d, e, t = Vertex("S"), Vertex("a"), Vertex("b"), Vertex("c"), Vertex("d"), Vertex("e"), Vertex("T")
+        G = FlowNetwork(s, t)
+        for u, v, cp, w in ((s, a, 20, 4), (s, c, 10, 2), (a, b, 20, 3), (b, c, 5, 1), (b, d, 25, 5), (c, e, 22, 2),
+                            (d, t, 25, 6), (b, t, 10, 20), (e, t, 20, 6)):
+            G.addEdge(u, v, cp, w)
+        self.assertEqual(G.getMinCostMaxFlow(maxFlowAlgorithm="dinic"), (450, 30))
+        for seed in range(10):
+            expected = self.randomNetwork(seed, 10, 30).getMinCostMaxFlow()
+            for algorithm in MAX_FLOW_ALGORITHMS:
+                F = self.randomNetwork(seed, 10, 30)
+                self.assertEqual(F.getMinCostMaxFlow(maxFlowAlgorithm=algorithm), expected)
+
+    def testBipartiteMatching(self):
+        s, t = Vertex("s"), Vertex("t")
+        left, right = [Vertex(("l", i)) for i in range(5)], [Vertex(("r", i)) for i in range(5)]
+        for algorithm in MAX_FLOW_ALGORITHMS:
+            F = FlowNetwork(s, t)
+            for i in range(5):
+                F.addEdge(s, left[i], 1)
+                F.addEdge(right[i], t, 1)
+            for i, j in ((0, 0), (0, 1), (1, 0), (2, 1), (2, 2), (3, 2), (4, 2)):
+                F.addEdge(left[i], right[j], 1)
+            self.assertEqual(F.getMaxFlow(algorithm=algorithm), 3)
+            self.assertValidMaxFlow(F, 3)
+
+    def testNoPathAndLongPath(self):
+        for algorithm in MAX_FLOW_ALGORITHMS:
+            F = FlowNetwork(Vertex("s"), Vertex("t"), [Vertex("s"), Vertex("t")])
+            F.addEdge(Vertex("t"), Vertex("s"), 5)
+            self.assertEqual(F.getMaxFlow(algorithm=algorithm), 0)
+            self.assertEqual(F.flowGraph.edges, {Vertex("t"): {Vertex("s"): 0}})
+
+            n = 5000  # Deeper than the recursion limit
+            F = FlowNetwork(Vertex(0), Vertex(n))
+            for i in range(n):
+                F.addEdge(Vertex(i), Vertex(i + 1), 3 + i % 7)
+            self.assertEqual(F.getMaxFlow(algorithm=algorithm), 3)
+
+    def testExistingFlow(self):
+        expected = self.randomNetwork(3, 12, 40).getMaxFlow()
+        for algorithm in MAX_FLOW_ALGORITHMS:
+            F = self.randomNetwork(3, 12, 40)
+            F.pushAugmentingFlow(F.getAugmentingPath(), costsPresent=False)
+            self.assertEqual(F.getMaxFlow(algorithm=algorithm), expected)
+            self.assertEqual(F.getMaxFlow(algorithm=algorithm), expected)
+        self.assertRaises(ValueError, F.getMaxFlow, algorithm="fordFulkersonDFS")
+
+    def testResidualArcs(self):
+        a, b, c = Vertex("a"), Vertex("b"), Vertex("c")
+        F = FlowNetwork(a, c)
+        F.addEdge(a, b, 4, 2)
+        F.addEdge(b, a, 3, 1)
+        F.addEdge(b, c, 2, 5)
+        arcs = F.arcs
+        self.assertEqual((arcs.numVertices(), arcs.numArcs()), (3, 6))
+        self.assertEqual([arcs.getEdge(u, v) for u, v in ((a, b), (b, a), (b, c), (c, b))], [0, 1, 2, None])
+        for e in range(arcs.numArcs()):
+            self.assertEqual(arcs.cost[e ^ 1], -arcs.cost[e])
+        arcs.push(0, 3)  # a -> b
+        arcs.push(2, 3)  # b -> a, both edges keep their own flow
+        self.assertEqual(F.flowGraph.edges, {a: {b: 3}, b: {a: 3, c: 0}})
+        self.assertEqual(F.residualGraph.edges, {a: {b: 1 + 3}, b: {a: 3, c: 2}})
+        self.assertEqual(F.costGraph.edges, {a: {b: -1}, b: {a: -2, c: 5}})
+        F.checkRep()
+        F.resetFlowAndResidualGraph()
+        self.assertEqual(F.flowGraph.edges, {a: {b: 0}, b: {a: 0, c: 0}})
+        F.addEdge(a, b, 5)  # Replaces the capacity and drops the flow, keeps the cost
+        self.assertEqual((F.getCapacity(a, b), F.getFlow(a, b), F.cost[a][b]), (5, 0, 2))
+        self.assertRaises(ValueError, F.getCapacity, c, b)
+
+    def testInstrumentation(self):
+        F = self.randomNetwork(1, 12, 40)
+        inst = F.instrument(Instrumentation())
+        F.getMaxFlow(algorithm="dinic")
+        counters, timings = inst.asDict()["counters"], inst.asDict()["timings"]
+        self.assertEqual(counters["getMaxFlow.runs"], 1)
+        self.assertGreaterEqual(counters["getMaxFlow.augmentingPaths"], counters["getMaxFlow.phases"])
+        self.assertGreaterEqual(timings["getMaxFlow.dinic"], 0)
+        F = self.randomNetwork(1, 12, 40)
+        inst = F.instrument(Instrumentation())
+        F.getMaxFlow(algorithm="pushRelabel")
+        counters = inst.asDict()["counters"]
+        self.assertGreaterEqual(counters["getMaxFlow.globalRelabels"], 1)
+        self.assertGreater(counters["getMaxFlow.pushes"], 0)
+
+class MinCostFlowTests(unittest.TestCase):
+    """
+    Testing Strategy:
+        - getMinCostMaxFlow(algorithm=...): same (minCost, maxFlow) as cycle cancelling, valid max flow whose residual
+          network has no negative cost cycle
+            - random networks with/without antiparallel edges, the 2 cycles network, midnights instances, costs and
+              capacities up to 10^9
+            - negative costs without/with a negative cost cycle, flow already in the network, unknown algorithm
+        - getMinCostFlow(): transportation problem with transshipment, infeasible/unbalanced supplies, no supplies,
+          supplies at S and T equal to the max flow
+        - instrumentation counters
+    """
+
+    @staticmethod
+    def residualNegativeCycle(F: FlowNetwork) -> bool:
+        """Bellman-Ford from every vertex at once over the residual network of F's flow, rebuilt from scratch"""
+        arcs = []
+        for u, children in F.capacityGraph.edges.items():
+            for v, c in children.items():
+                f = F.flowGraph[u][v]
+                if f < c:
+                    arcs.append((u, v, F.cost[u][v]))
+                if f > 0:
+                    arcs.append((v, u, -F.cost[u][v]))
+        d = {x: 0 for x in F.capacityGraph.vertices.union(F.capacityGraph.edges)}
+        for _ in range(len(d)):
+            relaxed = False
+            for u, v, w in arcs:
+                if d[u] + w < d[v]:
+                    d[v], relaxed = d[u] + w, True
+            if not relaxed:
+                return False
+        return True
+
+    def testRandomNetworks(self):
+        for seed in range(20):
+            expected = MaxFlowTests.randomNetwork(seed, 12, 40).getMinCostMaxFlow()
+            for algorithm in MIN_COST_FLOW_ALGORITHMS:
+                F = MaxFlowTests.randomNetwork(seed, 12, 40)
+                self.assertEqual(F.getMinCostMaxFlow(algorithm=algorithm), expected)
+                MaxFlowTests.assertValidMaxFlow(self, F, expected[1])
+                self.assertFalse(self.residualNegativeCycle(F))
+
+                F = MaxFlowTests.randomNetwork(seed, 12, 40, antiparallel=True)
+                cost, value = F.getMinCostMaxFlow(algorithm=algorithm)
+                MaxFlowTests.assertValidMaxFlow(self, F, value)
+                self.assertEqual(cost, F.getFlowCost())
+                self.assertFalse(self.residualNegativeCycle(F))
+                self.assertEqual((cost, value),
+                                 MaxFlowTests.randomNetwork(seed, 12, 40, antiparallel=True).getMinCostMaxFlow())
+
+    def testMinCostFlow2Cycles(self):
+        s, a, b, c, d, e, t = Vertex("S"), Vertex("a"), Vertex("b"), Vertex("c"), Vertex("d"), Vertex("e"), Vertex("T")
+        for algorithm in MIN_COST_FLOW_ALGORITHMS:
+            G = FlowNetwork(s, t)
+            for u, v, cp, w in ((s, a, 20, 4), (s, c, 10, 2), (a, b, 20, 3), (b, c, 5, 1), (b, d, 25, 5),
+                                (c, e, 22, 2), (d, t, 25, 6), (b, t, 10, 20), (e, t, 20, 6)):
+                G.addEdge(u, v, cp, w)
+            G.getMaxFlow()  # Existing flow is discarded
+            self.assertEqual(G.getMinCostMaxFlow(algorithm=algorithm), (450, 30))
+            self.assertEqual(G.getMinCostMaxFlow(algorithm=algorithm), (450, 30))
+
+    def testNegativeCosts(self):
+        s, a, b, t = Vertex("S"), Vertex("a"), Vertex("b"), Vertex("T")
+        for algorithm in MIN_COST_FLOW_ALGORITHMS:
+            F = FlowNetwork(s, t)
+            F.addEdge(s, a, 3, 1)
+            F.addEdge(s, b, 2, 4)
+            F.addEdge(a, b, 2, -6)
+            F.addEdge(a, t, 2, 2)
+            F.addEdge(b, t, 3, -1)
+            self.assertEqual(F.getMinCostMaxFlow(algorithm=algorithm), (3 * 1 + 2 * 4 + 1 * -6 + 2 * 2 + 3 * -1, 5))
+
+            c = Vertex("c")
+            F.addEdge(b, c, 1, 1)
+            F.addEdge(c, a, 1, 1)  # a -> b -> c -> a costs -4
+            if algorithm == "successiveShortestPaths":
+                self.assertRaises(NegativeCostCycleException, F.getMinCostMaxFlow, algorithm=algorithm)
+            else:  # Circulates 1 more unit around the cycle
+                self.assertEqual(F.getMinCostMaxFlow(algorithm=algorithm), (6 - 4, 5))
+                self.assertFalse(self.residualNegativeCycle(F))
+        self.assertRaises(ValueError, F.getMinCostMaxFlow, algorithm="primalDual")
+
+        d, e = Vertex("d"), Vertex("e")  # A negative cost cycle that S can't reach
+        F = FlowNetwork(s, t)
+        F.addEdge(s, t, 1, 1)
+        F.addEdge(d, e, 1, -2)
+        F.addEdge(e, d, 1, 1)
+        self.assertRaises(NegativeCostCycleException, F.getMinCostMaxFlow, algorithm="successiveShortestPaths")
+        self.assertEqual(F.getMinCostMaxFlow(), (1 - 1, 1))
+
+    def testNegativeCostsWithoutCycle(self):
+        # Acyclic, but FIFO Bellman-Ford improves some vertices more often than there are vertices along one path
+        v = [Vertex(i) for i in range(4)]
+        for algorithm in MIN_COST_FLOW_ALGORITHMS:
+            F = FlowNetwork(v[0], v[3])
+            for x, y, w in ((2, 3, 0), (0, 3, 16), (0, 2, -1), (1, 2, -20), (1, 3, -19), (0, 1, 4)):
+                F.addEdge(v[x], v[y], 1, w)
+            self.assertEqual(F.getMinCostMaxFlow(algorithm=algorithm), (0, 3))
+
+    def testLargeCostsAndCapacities(self):
+        for seed in range(5):
+            results = set()
+            for algorithm in MIN_COST_FLOW_ALGORITHMS:
+                if algorithm == "successiveShortestPaths":  # Some negative costs, so there can be negative cycles
+                    continue
+                rng = random.Random(seed)
+                F = FlowNetwork(Vertex(0), Vertex(29))
+                for _ in range(150):
+                    u, v = Vertex(rng.randrange(30)), Vertex(rng.randrange(30))
+                    if u != v:
+                        F.addEdge(u, v, rng.randint(1, 10 ** 9), rng.randint(-10 ** 6, 10 ** 9))
+                results.add(F.getMinCostMaxFlow(algorithm=algorithm))
+                self.assertFalse(self.residualNegativeCycle(F))
+            self.assertEqual(len(results), 1)
+
+    def testSupplies(self):
+        # Transportation problem: 2 warehouses supplying 3 stores, plus a capacitated transshipment vertex
+        w1, w2, x, s1, s2, s3 = (Vertex(name) for name in ("w1", "w2", "x", "s1", "s2", "s3"))
+        F = FlowNetwork(w1, s3)
+        for u, v, cp, w in ((w1, s1, 10, 4), (w1, s2, 10, 6), (w2, s2, 10, 3), (w2, s3, 2, 2), (w1, x, 5, 1),
+                            (w2, x, 5, 1), (x, s3, 4, 1)):
+            F.addEdge(u, v, cp, w)
+        supplies = {w1: 9, w2: 6, s1: -5, s2: -6, s3: -4}
+        self.assertEqual(F.getMinCostFlow(supplies), 5 * 4 + 6 * 3 + 4 * (1 + 1))
+        for v, b in supplies.items():
+            out = sum(F.flowGraph.edges.get(v, {}).values())
+            into = sum(children.get(v, 0) for children in F.flowGraph.edges.values())
+            self.assertEqual(out - into, b)
+        self.assertFalse(self.residualNegativeCycle(F))
+
+        self.assertRaises(InfeasibleFlowException, F.getMinCostFlow, {w1: 1})
+        self.assertRaises(InfeasibleFlowException, F.getMinCostFlow, {w2: 20, s3: -20})
+        self.assertEqual(F.getMinCostFlow({}), 0)
+
+    def testSuppliesMatchMaxFlow(self):
+        # With supply = demand = the max flow value at S and T, the min cost is the min cost max flow's
+        for seed in range(10):
+            F = MaxFlowTests.randomNetwork(seed, 12, 40)
+            minCost, maxFlow = F.getMinCostMaxFlow()
+            self.assertEqual(F.getMinCostFlow({F.source: maxFlow, F.sink: -maxFlow}), minCost)
+
+    def testMidnights(self):
+        directory = os.path.dirname(os.path.abspath(__file__))
+        for name in ("midnights.json", "midnights0progress.json"):
+            data = extractData(os.path.join(directory, name))
+            expected = generateMidnightsFlowNetwork(*data).getMinCostMaxFlow()
+            for algorithm in MIN_COST_FLOW_ALGORITHMS:
+                G = generateMidnightsFlowNetwork(*data)
+                self.assertEqual(G.getMinCostMaxFlow(algorithm=algorithm), expected)
+
+    def testInstrumentation(self):
+        F = MaxFlowTests.randomNetwork(1, 12, 40)
+        inst = F.instrument(Instrumentation())
+        F.getMinCostMaxFlow(algorithm="successiveShortestPaths")
+        counters, timings = inst.asDict()["counters"], inst.asDict()["timings"]
+        self.assertEqual(counters["getMinCostMaxFlow.runs"], 1)
+        self.assertGreater(counters["getMinCostMaxFlow.augmentations"], 0)
+        self.assertGreaterEqual(timings["getMinCostMaxFlow.successiveShortestPaths"], 0)
+        F.getMinCostMaxFlow(algorithm="costScaling")
+        counters = inst.asDict()["counters"]
+        self.assertEqual(counters["getMinCostMaxFlow.runs"], 2)
+        self.assertGreater(counters["getMinCostMaxFlow.refines"], 0)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,5 +1,38 @@
+import gzip
+import os
+import random
+import tempfile
 import unittest
 from Graph import *
+from IndexedHeap import IndexedDaryHeap
+from Instrumentation import Instrumentation
+from Landmarks import LandmarkIndex
+from ContractionHierarchy import ContractionHierarchy
+from ParallelSSSP import ParallelSSSP
+from Reachability import ReachabilityIndex
+from SSSPCache import SSSPCache
+from airline import load_routes, min_additional_routes, process_input
+from AllPairs import *
+from EdgeListReader import *
+from GraphBenchmarks import *
+from GraphFile import GraphFileException, MappedGraph, readGraph, writeGraph
+
+def randomGraph(seed: int, n: int, m: int, weights: tuple = (0, 20)) -> Graph:
+    """
+    Random graph on the vertices 0..n-1 with m edges (parallel edges keep the last weight), weighted in range(*weights).
+    If weights can be negative, edges only go from lower to higher values, so there are no negative cycles
+    """
+    rng = random.Random(seed)
+    lowest, highest = weights
+    edges = []
+    for _ in range(m):
+        if lowest < 0:
+            u = rng.randrange(n - 1)
+            v = rng.randrange(u + 1, n)
+        else:
+            u, v = rng.randrange(n), rng.randrange(n)
+        edges.append((u, v, rng.randrange(lowest, highest)))
+    return Graph.fromEdgeList(edges, vertices=range(n))
 
 class FlowNetworkTests(unittest.TestCase):
     """
@@ -7,5 +40,960 @@ class FlowNetworkTests(unittest.TestCase):
         -
     """
 
+class BulkEdgeLoadingTests(unittest.TestCase):
+    """
+    Testing Strategy:
+        - addEdges(): weighted and unweighted tuples, raw values and Vertices mixed, existing graph extended
+        - fromEdgeList(): isolated vertices, same result as repeated addEdge
+        - addEdge(): vertex set updated in place, not shared between graphs built from the same vertices
+    """
+
+    def testAddEdgesMatchesAddEdge(self):
+        edges = [(1, 2, 5), (2, 3), (Vertex(3), 1, -2), (1, 3, 7)]
+        G = Graph()
+        for edge in edges:
+            G.addEdge(*edge)
+        self.assertEqual(Graph.fromEdgeList(edges).edges, G.edges)
+        self.assertEqual(Graph.fromEdgeList(edges).vertices, G.vertices)
+
+    def testAddEdgesExtendsGraph(self):
+        G = Graph()
+        G.addEdge(1, 2, 3)
+        G.addEdges([(1, 4, 1), (4, 2)])
+        self.assertEqual(G.edges, {Vertex(1): {Vertex(2): 3, Vertex(4): 1}, Vertex(4): {Vertex(2): 0}})
+        self.assertEqual(G.vertices, {Vertex(1), Vertex(2), Vertex(4)})
+
+    def testFromEdgeListIsolatedVertices(self):
+        G = Graph.fromEdgeList([("a", "b")], vertices=["c", Vertex("d")])
+        self.assertEqual(G.vertices, {Vertex("a"), Vertex("b"), Vertex("c"), Vertex("d")})
+
+    def testVertexSetNotAliased(self):
+        vertices = {Vertex(1)}
+        G, H = Graph(vertices), Graph(vertices)
+        G.addEdge(1, 2)
+        self.assertEqual(H.vertices, {Vertex(1)})
+        self.assertEqual(vertices, {Vertex(1)})
+
+class BfsTreeTests(unittest.TestCase):
+    """
+    Testing Strategy:
+        - bfsTree(): single source, multiple sources, unreachable vertices, early exit on a target set
+        - top-down only vs forced bottom-up expansion give the same distances
+        - forced bottom-up repeated after adding an edge sees the new edge (cached in-edges rebuilt)
+        - bfs(): path exists, no path, start == target
+    """
+
+    def generateGraph(self):
+        # 0 -> 1 -> 2 -> 3 -> 4, plus shortcut 0 -> 3, and 5 -> 4 only reachable from 5
+        return Graph.fromEdgeList([(0, 1), (1, 2), (2, 3), (3, 4), (0, 3), (5, 4)])
+
+    def testSingleSource(self):
+        d, p = self.generateGraph().bfsTree([Vertex(0)])
+        self.assertEqual(d, {Vertex(0): 0, Vertex(1): 1, Vertex(3): 1, Vertex(2): 2, Vertex(4): 2})
+        self.assertEqual(p[Vertex(4)], Vertex(3))
+        self.assertEqual(p[Vertex(0)], Vertex(0))
+
+    def testMultipleSources(self):
+        d, _ = self.generateGraph().bfsTree([Vertex(2), Vertex(5)])
+        self.assertEqual(d, {Vertex(2): 0, Vertex(5): 0, Vertex(3): 1, Vertex(4): 1})
+
+    def testEarlyExit(self):
+        d, p = self.generateGraph().bfsTree([Vertex(0)], [Vertex(3)])
+        self.assertEqual(d[Vertex(3)], 1)
+        self.assertNotIn(Vertex(4), d)
+        d, _ = self.generateGraph().bfsTree([Vertex(0)], [Vertex(0)])
+        self.assertEqual(d, {Vertex(0): 0})
+
+    def testBottomUpMatchesTopDown(self):
+        G = Graph.fromEdgeList([(i, (i * 7 + j) % 50) for i in range(50) for j in range(1, 4)])
+        topDown, _ = G.bfsTree([Vertex(0)], alpha=1e-12)
+        bottomUp, p = G.bfsTree([Vertex(0)], alpha=float('inf'), beta=float('inf'))
+        self.assertEqual(topDown, bottomUp)
+        for v in p:
+            if v != Vertex(0):
+                self.assertEqual(bottomUp[p[v]] + 1, bottomUp[v])
+
+    def testBottomUpAfterMutation(self):
+        G = self.generateGraph()
+        d, _ = G.bfsTree([Vertex(5)], alpha=float('inf'), beta=float('inf'))
+        self.assertEqual(d, {Vertex(5): 0, Vertex(4): 1})
+        G.addEdge(4, 0)
+        d, _ = G.bfsTree([Vertex(5)], alpha=float('inf'), beta=float('inf'))
+        self.assertEqual(d, {Vertex(5): 0, Vertex(4): 1, Vertex(0): 2, Vertex(1): 3, Vertex(3): 3, Vertex(2): 4})
+
+    def testBfsPath(self):
+        G = self.generateGraph()
+        self.assertEqual(G.bfs(Vertex(0), Vertex(4)), [Vertex(0), Vertex(3), Vertex(4)])
+        self.assertIsNone(G.bfs(Vertex(0), Vertex(5)))
+        self.assertEqual(G.bfs(Vertex(0), Vertex(0)), [Vertex(0)])
+
+class DijkstraTests(unittest.TestCase):
+    """
+    Testing Strategy:
+        - IndexedDaryHeap: pops in key order after pushes and decrease-keys, arity 2 and >2
+        - dijkstra_SSSP(): graph with cycles (no DAG restriction), negative weight rejected, target early exit
+        - bidirectionalDijkstra(): same distance as dijkstra_SSSP on random graphs, unreachable target, s == t
+        - cached weight check and in-edges: reused on an unchanged graph, redone after a mutation
+    """
+
+    def testIndexedHeap(self):
+        for arity in (2, 4):
+            H = IndexedDaryHeap(arity)
+            for i, key in enumerate([5, 3, 9, 1, 7, 8]):
+                H.push(i, key)
+            H.decreaseKey(2, 0)
+            self.assertTrue(H.pushOrDecrease(4, 2))
+            self.assertFalse(H.pushOrDecrease(0, 6))
+            self.assertRaises(ValueError, H.push, 1, 4)
+            self.assertEqual([H.pop() for _ in range(len(H))], [(0, 2), (1, 3), (2, 4), (3, 1), (5, 0), (8, 5)])
+
+    def testDijkstraCyclicGraph(self):
+        G = Graph.fromEdgeList([("a", "b", 1), ("b", "a", 1), ("b", "c", 2), ("a", "c", 5)])
+        d, p = G.dijkstra_SSSP(Vertex("a"))
+        self.assertEqual(d, {Vertex("a"): 0, Vertex("b"): 1, Vertex("c"): 3})
+        self.assertEqual(p[Vertex("c")], Vertex("b"))
+
+    def testDijkstraNegativeWeight(self):
+        G = Graph.fromEdgeList([("a", "b", 1), ("b", "c", -2)])
+        self.assertRaises(ValueError, G.dijkstra_SSSP, Vertex("a"))
+
+    def testDijkstraMatchesBellmanFord(self):
+        for seed in range(5):
+            G = randomGraph(seed, 40, 160)
+            _, expected, _ = G.bellmanFord_SSSP(Vertex(0))
+            d, _ = G.dijkstra_SSSP(Vertex(0))
+            self.assertEqual(d, expected)
+
+    def testDijkstraTargetEarlyExit(self):
+        G = Graph.fromEdgeList([(0, 1, 1), (1, 2, 1), (2, 3, 1), (0, 3, 10)])
+        d, p = G.dijkstra_SSSP(Vertex(0), target=Vertex(1))
+        self.assertEqual(d[Vertex(1)], 1)
+        self.assertEqual(d[Vertex(3)], 10)  # Not settled yet, so only a tentative distance
+
+    def testBidirectionalMatchesDijkstra(self):
+        for seed in range(5):
+            G = randomGraph(seed, 40, 160)
+            d, _ = G.dijkstra_SSSP(Vertex(0))
+            for t in range(40):
+                dist, path = G.bidirectionalDijkstra(Vertex(0), Vertex(t))
+                self.assertEqual(dist, d[Vertex(t)])
+                if path is None:
+                    continue
+                self.assertEqual((path[0], path[-1]), (Vertex(0), Vertex(t)))
+                self.assertEqual(sum(G.getWeight(path[i], path[i + 1]) for i in range(len(path) - 1)), dist)
+
+    def testBidirectionalUnreachable(self):
+        G = Graph.fromEdgeList([(0, 1, 1)], vertices=[2])
+        self.assertEqual(G.bidirectionalDijkstra(Vertex(0), Vertex(2)), (float('inf'), None))
+        self.assertEqual(G.bidirectionalDijkstra(Vertex(2), Vertex(2)), (0, [Vertex(2)]))
+
+    def testCachedChecksFollowMutations(self):
+        G = Graph.fromEdgeList([(0, 1, 1), (1, 2, 1)])
+        self.assertEqual(G.bidirectionalDijkstra(Vertex(0), Vertex(2)), (2, [Vertex(0), Vertex(1), Vertex(2)]))
+        reverseEdges = G._reverseAdjacency()
+        self.assertIs(G._reverseAdjacency(), reverseEdges)  # Unchanged graph, so the same in-edges are reused
+        G.addEdge(0, 2, 1)
+        self.assertEqual(G.bidirectionalDijkstra(Vertex(0), Vertex(2)), (1, [Vertex(0), Vertex(2)]))
+        G.addEdge(2, 0, -1)
+        self.assertRaises(ValueError, G.dijkstra_SSSP, Vertex(0))
+        self.assertRaises(ValueError, G.bidirectionalDijkstra, Vertex(0), Vertex(2))
+
+class ReverseIndexTests(unittest.TestCase):
+    """
+    Testing Strategy:
+        - getParents()/inDegree(): index off (scan) and on, vertex with no in-edges, self loop
+        - enableReverseIndex(): on an existing graph, then kept in sync by addEdge, addEdges, __setitem__ (replacing
+          and clearing a vertex's children), overwriting an edge's weight
+        - transpose(): reflects later edges, shares vertices, traversal/SSSP methods give reversed results,
+          transpose of transpose, shares the version (SSSPCache over the view sees changes to the graph)
+    """
+
+    def assertIndexMatches(self, G):
+        for v in G.vertices:
+            self.assertEqual(set(G.getParents(v)), {u for u, children in G.edges.items() if v in children})
+            self.assertEqual(G.inDegree(v), sum(1 for children in G.edges.values() if v in children))
+        for v, parents in G.reverseEdges.items():
+            for u, w in parents.items():
+                self.assertEqual(G.getWeight(u, v), w)
+
+    def testWithoutIndex(self):
+        G = Graph.fromEdgeList([(0, 1), (2, 1), (1, 1)], vertices=[3])
+        self.assertIsNone(G.reverseEdges)
+        self.assertEqual(set(G.getParents(Vertex(1))), {Vertex(0), Vertex(1), Vertex(2)})
+        self.assertEqual((G.inDegree(Vertex(1)), G.inDegree(Vertex(3))), (3, 0))
+
+    def testKeptInSync(self):
+        G = Graph.fromEdgeList([(0, 1, 2), (1, 2, 3)])
+        G.enableReverseIndex()
+        self.assertIndexMatches(G)
+        G.addEdge(0, 2, 5)
+        G.addEdge(0, 1, 7)
+        G.addEdges([(2, 0, 1), (3, 3, 1)])
+        self.assertIndexMatches(G)
+        G[Vertex(0)] = {Vertex(3): 4}
+        self.assertIndexMatches(G)
+        self.assertEqual(list(G.getParents(Vertex(1))), [])
+        G[Vertex(1)] = {}
+        self.assertIndexMatches(G)
+        self.assertEqual(G.inDegree(Vertex(2)), 0)
+
+    def testTranspose(self):
+        G = Graph.fromEdgeList([(0, 1, 1), (1, 2, 2), (0, 2, 5)])
+        T = G.transpose()
+        self.assertIs(T.vertices, G.vertices)
+        self.assertEqual(T.dijkstra_SSSP(Vertex(2))[0], {Vertex(0): 3, Vertex(1): 2, Vertex(2): 0})
+        self.assertEqual(T.bfs(Vertex(2), Vertex(0)), [Vertex(2), Vertex(0)])
+        G.addEdge(2, 3, 1)
+        self.assertEqual(T.getWeight(Vertex(3), Vertex(2)), 1)
+        self.assertEqual(T.transpose().edges, G.edges)
+        self.assertEqual(len(T.stronglyConnectedComponents()[1]), 4)
+
+        cache = SSSPCache(T)
+        self.assertEqual(cache.dijkstra_SSSP(Vertex(3))[0][Vertex(0)], 4)
+        G.addEdge(0, 3, 2)
+        self.assertEqual(T.version, G.version)
+        self.assertEqual(cache.dijkstra_SSSP(Vertex(3))[0][Vertex(0)], 2)
+        T.addEdge(3, 1, 1)  # Edge (1, 3) of G
+        self.assertEqual((T.version, G.getWeight(Vertex(1), Vertex(3))), (G.version, 1))
+
+class InstrumentationTests(unittest.TestCase):
+    """
+    Testing Strategy:
+        - bfsTree(): top-down only, bottom-up levels, early exit at a target
+        - dijkstra_SSSP(): pops/pushes/decrease-keys/edges scanned, with and without a target
+        - bellmanFord_SSSP(): with and without a negative cycle
+        - callback receives per-run counters, counters accumulate across runs, instrument(None) turns it off, reset()
+    """
+
+    def testBfs(self):
+        G = Graph.fromEdgeList([(0, 1), (0, 2), (1, 3), (2, 3)])
+        inst = G.instrument(Instrumentation())
+        G.bfsTree([Vertex(0)], alpha=1e-12)
+        counters = inst.asDict()["counters"]
+        self.assertEqual((counters["bfs.levels"], counters["bfs.edgesScanned"], counters["bfs.verticesDiscovered"]),
+                         (3, 4, 4))
+        self.assertEqual(counters["bfs.bottomUpLevels"], 0)
+        G.bfsTree([Vertex(0)], alpha=float('inf'))
+        self.assertGreater(inst.counters["bfs.bottomUpLevels"], 0)
+        self.assertIn("bfs.inEdges", inst.timings)
+        self.assertEqual(inst.counters["bfs.runs"], 2)
+
+    def testDijkstra(self):
+        G = Graph.fromEdgeList([(0, 1, 5), (0, 2, 1), (2, 1, 1), (1, 3, 1)])
+        runs = []
+        inst = G.instrument(Instrumentation(callback=lambda *run: runs.append(run)))
+        G.dijkstra_SSSP(Vertex(0))
+        algorithm, counters, timings = runs[-1]
+        self.assertEqual(algorithm, "dijkstra_SSSP")
+        self.assertEqual(counters, {"heapPops": 4, "heapPushes": 4, "decreaseKeys": 1, "edgesScanned": 4,
+                                    "relaxations": 4})
+        self.assertEqual(set(timings), {"verify", "search"})
+        G.dijkstra_SSSP(Vertex(0), target=Vertex(2))
+        self.assertEqual(runs[-1][1]["heapPops"], 2)
+        self.assertEqual(inst.counters["dijkstra_SSSP.heapPops"], 6)
+
+        G.instrument(None)
+        G.dijkstra_SSSP(Vertex(0))
+        self.assertEqual(len(runs), 2)
+        inst.reset()
+        self.assertEqual(inst.asDict(), {"counters": {}, "timings": {}})
+
+    def testBellmanFord(self):
+        G = Graph.fromEdgeList([(0, 1, 2), (1, 2, -1)])
+        inst = G.instrument(Instrumentation())
+        G.bellmanFord_SSSP(Vertex(0))
+        self.assertEqual((inst.counters["bellmanFord_SSSP.passes"], inst.counters["bellmanFord_SSSP.relaxCalls"],
+                          inst.counters["bellmanFord_SSSP.relaxations"]), (3, 6, 2))
+        self.assertEqual(inst.counters["bellmanFord_SSSP.negativeCycles"], 0)
+        G.addEdge(2, 1, -1)
+        cycle, _, _ = G.bellmanFord_SSSP(Vertex(0))
+        self.assertIsNotNone(cycle)
+        self.assertEqual(inst.counters["bellmanFord_SSSP.negativeCycles"], 1)
+
+class LandmarkIndexTests(unittest.TestCase):
+    """
+    Testing Strategy:
+        - build(): k < |V|, k >= |V|, disconnected graph
+        - lowerBound(): never exceeds the true distance
+        - query(): same distances as dijkstra_SSSP, valid path, unreachable target, vertices that can't reach the
+          target are never expanded however many edges lead into them
+        - serializeToJSON()/deserialize(): round trip answers queries identically
+    """
+
+    def assertQueriesMatch(self, G, index):
+        for s in range(0, 40, 7):
+            d, _ = G.dijkstra_SSSP(Vertex(s))
+            for t in range(40):
+                self.assertLessEqual(index.lowerBound(Vertex(s), Vertex(t)), d[Vertex(t)])
+                dist, path = index.query(Vertex(s), Vertex(t))
+                self.assertEqual(dist, d[Vertex(t)])
+                if path is not None:
+                    self.assertEqual((path[0], path[-1]), (Vertex(s), Vertex(t)))
+                    self.assertEqual(sum(G.getWeight(path[i], path[i + 1]) for i in range(len(path) - 1)), dist)
+
+    def testQueriesMatchDijkstra(self):
+        for seed in range(3):
+            G = randomGraph(seed, 40, 160)
+            self.assertQueriesMatch(G, LandmarkIndex.build(G, k=4, seed=seed))
+
+    def testMoreLandmarksThanVertices(self):
+        G = Graph.fromEdgeList([(0, 1, 2), (1, 2, 3)])
+        index = LandmarkIndex.build(G, k=10)
+        self.assertEqual(len(index.landmarks), 3)
+        self.assertIsNone(G.reverseEdges)  # Doesn't switch on the graph's reverse index
+        self.assertEqual(index.query(Vertex(0), Vertex(2)), (5, [Vertex(0), Vertex(1), Vertex(2)]))
+
+    def testUnreachable(self):
+        G = Graph.fromEdgeList([(0, 1, 1), (2, 3, 1)])
+        index = LandmarkIndex.build(G, k=2)
+        self.assertEqual(index.query(Vertex(0), Vertex(3)), (float('inf'), None))
+
+    def testDeadEndsNeverExpanded(self):
+        expanded = []
+
+        class ExpansionRecorder(Graph):
+            def __getitem__(self, u):
+                expanded.append(u)
+                return super().__getitem__(u)
+
+        # Only landmark x, which can't reach T, so every bound from S is 0 but T is unreachable from x
+        S, a, x, y, T = (Vertex(name) for name in ("S", "a", "x", "y", "T"))
+        G = ExpansionRecorder()
+        G.addEdges([(S, x, 10), (S, a, 1), (a, x, 1), (x, y, 1)])
+        G.addVertex("T")
+        index = LandmarkIndex(G, [x], [{x: 0, y: 1}], [{S: 2, a: 1, x: 0}])
+        self.assertEqual(index.lowerBound(x, T), float('inf'))
+        self.assertEqual(index.query(S, T), (float('inf'), None))
+        self.assertEqual(expanded, [S, a])  # x is seen twice, and skipped both times
+
+    def testSerializeRoundTrip(self):
+        G = randomGraph(7, 40, 160)
+        index = LandmarkIndex.build(G, k=3)
+        with tempfile.TemporaryDirectory() as tmp:
+            outPath = os.path.join(tmp, "landmarks.json")
+            index.serializeToJSON(outPath)
+            loaded = LandmarkIndex.deserialize(outPath, G)
+        self.assertEqual(loaded.landmarks, index.landmarks)
+        self.assertEqual(loaded.distFrom, index.distFrom)
+        self.assertQueriesMatch(G, loaded)
+
+class ContractionHierarchyTests(unittest.TestCase):
+    """
+    Testing Strategy:
+        - build(): shortcut needed (path graph), witness makes shortcut unnecessary, parallel paths, self loops
+        - query(): same distances as dijkstra_SSSP on random graphs, unpacked path uses only original edges,
+          unreachable target, source == target, vertex not in graph
+    """
+
+    def testQueriesMatchDijkstra(self):
+        for seed in range(4):
+            G = randomGraph(seed, 40, 120, (1, 20))
+            CH = ContractionHierarchy.build(G, witnessSettleLimit=5 if seed % 2 else 64)
+            for s in range(0, 40, 5):
+                d, _ = G.dijkstra_SSSP(Vertex(s))
+                for t in range(40):
+                    dist, path = CH.query(Vertex(s), Vertex(t))
+                    self.assertEqual(dist, d[Vertex(t)])
+                    if path is not None:
+                        self.assertEqual((path[0], path[-1]), (Vertex(s), Vertex(t)))
+                        self.assertEqual(sum(G.getWeight(path[i], path[i + 1]) for i in range(len(path) - 1)), dist)
+
+    def testPathGraph(self):
+        G = Graph.fromEdgeList([(i, i + 1, 1) for i in range(10)] + [(3, 3, 0)])
+        CH = ContractionHierarchy.build(G)
+        self.assertEqual(CH.query(Vertex(0), Vertex(10)), (10, [Vertex(i) for i in range(11)]))
+        self.assertEqual(CH.query(Vertex(10), Vertex(0)), (float('inf'), None))
+        self.assertEqual(CH.query(Vertex(4), Vertex(4)), (0, [Vertex(4)]))
+        self.assertRaises(ValueError, CH.query, Vertex(0), Vertex(11))
+
+    def testWitnessPath(self):
+        # a -> b -> c is bypassed by the cheaper a -> c, so contracting b never needs a shortcut
+        G = Graph.fromEdgeList([("a", "b", 5), ("b", "c", 5), ("a", "c", 1)])
+        CH = ContractionHierarchy.build(G)
+        self.assertEqual(CH.numShortcuts(), 0)
+        self.assertEqual(CH.query(Vertex("a"), Vertex("c")), (1, [Vertex("a"), Vertex("c")]))
+
+class StronglyConnectedComponentsTests(unittest.TestCase):
+    """
+    Testing Strategy:
+        - stronglyConnectedComponents(): empty graph, isolated vertices, self loop, one big cycle, nested cycles,
+          long chain (no recursion limit), vertices only present as edge endpoints, random graphs vs reachability
+        - condensation(): DAG with topologically ordered ids, min weight of parallel inter-component edges
+        - airline.min_additional_routes(): start in a cycle, sources with/without cycles, long chain
+        - airline.process_input()/load_routes(): routes from a generator, streamed from a CSV file
+    """
+
+    def testSmallCases(self):
+        self.assertEqual(Graph().stronglyConnectedComponents(), ({}, []))
+        G = Graph.fromEdgeList([(0, 0, 1)], vertices=[1])
+        componentOf, components = G.stronglyConnectedComponents()
+        self.assertEqual(sorted(map(len, components)), [1, 1])
+        self.assertNotEqual(componentOf[Vertex(0)], componentOf[Vertex(1)])
+
+        G = Graph(edges={Vertex(0): {Vertex(1): 1}, Vertex(1): {Vertex(2): 1}, Vertex(2): {Vertex(0): 1}})
+        componentOf, components = G.stronglyConnectedComponents()
+        self.assertEqual(len(components), 1)
+        self.assertEqual(set(components[0]), {Vertex(0), Vertex(1), Vertex(2)})
+
+    def testLongChain(self):
+        n = 20000
+        G = Graph.fromEdgeList([(i, i + 1) for i in range(n)] + [(n, 0)])
+        self.assertEqual(len(G.stronglyConnectedComponents()[1]), 1)
+        G = Graph.fromEdgeList([(i, i + 1) for i in range(n)])
+        componentOf, components = G.stronglyConnectedComponents()
+        self.assertEqual(len(components), n + 1)
+        self.assertTrue(all(componentOf[Vertex(i)] < componentOf[Vertex(i + 1)] for i in range(n)))
+
+    def testRandomGraphs(self):
+        for seed in range(5):
+            rng = random.Random(seed)
+            G = Graph.fromEdgeList([(rng.randrange(25), rng.randrange(25)) for _ in range(40)], vertices=range(25))
+            reach = {u: set(G.bfsTree([u])[0]) for u in G.vertices}
+            componentOf, components = G.stronglyConnectedComponents()
+            for u in G.vertices:
+                for v in G.vertices:
+                    mutual = v in reach[u] and u in reach[v]
+                    self.assertEqual(componentOf[u] == componentOf[v], mutual)
+            C, componentOf, components = G.condensation()
+            self.assertEqual(len(C.vertices), len(components))
+            for a, children in C.edges.items():
+                for b in children:
+                    self.assertLess(a.val, b.val)
+
+    def testCondensationWeights(self):
+        G = Graph.fromEdgeList([(0, 1, 5), (1, 0, 5), (0, 2, 4), (1, 2, 3), (2, 3, 7)])
+        C, componentOf, _ = G.condensation()
+        a, b, c = (Vertex(componentOf[Vertex(x)]) for x in (0, 2, 3))
+        self.assertEqual(C.edges, {a: {b: 3}, b: {c: 7}})
+
+    def testMinAdditionalRoutes(self):
+        airports = [Vertex(x) for x in "ABCDEFGH"]
+        a, b, c, d, e, f, g, h = airports
+        routes = [(a, c), (b, c), (d, f), (e, h), (d, e), (c, g), (a, f)]
+        self.assertEqual(min_additional_routes(process_input(airports, routes), a), 2)
+        # B <-> D is a cycle with no incoming routes, so one route reaches both of them
+        routes += [(b, d), (d, b), (h, a)]
+        self.assertEqual(min_additional_routes(process_input(airports, routes), a), 1)
+        # Start is inside a cycle
+        self.assertEqual(min_additional_routes(process_input(airports, routes + [(c, a)]), a), 1)
+        self.assertEqual(min_additional_routes(process_input(airports, routes), b), 0)
+        self.assertEqual(process_input(airports, iter(routes)).edges, process_input(airports, routes).edges)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "routes.csv")
+            with open(path, "w") as out:
+                out.write("source,destination\n" + "".join("%s,%s\n" % (u.val, v.val) for u, v in routes))
+            G = load_routes(path, airports, delimiter="csv", skipHeader=True, chunkSize=3)
+        self.assertEqual(G.vertices, set(airports))
+        self.assertEqual(G.edges, process_input(airports, routes).edges)
+        self.assertEqual(min_additional_routes(G, a), 1)
+        n = 20000
+        G = Graph.fromEdgeList([(i, i + 1) for i in range(n)])
+        self.assertEqual(min_additional_routes(G, Vertex(0)), 0)
+        self.assertEqual(min_additional_routes(G, Vertex(n)), 1)
+
+class ReachabilityIndexTests(unittest.TestCase):
+    """
+    Testing Strategy:
+        - reachable(): same component, ancestor/descendant components, unrelated components, self, missing vertex
+        - reachableMask()/verticesOf()/reachableFrom(): one source, several sources, empty sources, mask ops
+        - complementMask(): the components a mask leaves out, stays non-negative
+        - random graphs vs BFS, empty graph, isCurrent() after a mutation, memoryBytes()
+    """
+
+    def testRandomGraphs(self):
+        for seed in range(4):
+            rng = random.Random(seed)
+            G = Graph.fromEdgeList([(rng.randrange(40), rng.randrange(40)) for _ in range(55)], vertices=range(40))
+            index = ReachabilityIndex.build(G)
+            for u in G.vertices:
+                reach = set(G.bfsTree([u])[0])
+                self.assertEqual(index.reachableFrom([u]), reach)
+                for v in G.vertices:
+                    self.assertEqual(index.reachable(u, v), v in reach)
+
+    def testMasks(self):
+        G = Graph.fromEdgeList([(0, 1), (1, 0), (1, 2), (3, 2), (4, 4)])
+        index = ReachabilityIndex.build(G)
+        self.assertEqual(index.numComponents(), 4)
+        self.assertTrue(index.reachable(Vertex(1), Vertex(0)))
+        self.assertFalse(index.reachable(Vertex(2), Vertex(1)))
+        self.assertTrue(index.reachable(Vertex(4), Vertex(4)))
+        self.assertEqual(index.reachableFrom([Vertex(0), Vertex(3)]), {Vertex(x) for x in range(4)})
+        self.assertEqual(index.reachableFrom([]), set())
+        both = index.reachableMask([Vertex(0)]) & index.reachableMask([Vertex(3)])
+        self.assertEqual(index.verticesOf(both), [Vertex(2)])
+        rest = index.complementMask(index.reachableMask([Vertex(3)]))
+        self.assertEqual(set(index.verticesOf(rest)), {Vertex(0), Vertex(1), Vertex(4)})
+        self.assertEqual(index.complementMask(0), (1 << index.numComponents()) - 1)
+        self.assertRaises(ValueError, index.reachable, Vertex(0), Vertex(5))
+        self.assertEqual(index.memoryBytes(), 4)
+
+        self.assertTrue(index.isCurrent(G))
+        G.addEdge(2, 4)
+        self.assertFalse(index.isCurrent(G))
+        self.assertEqual(ReachabilityIndex.build(Graph()).memoryBytes(), 0)
+
+class SPFATests(unittest.TestCase):
+    """
+    Testing Strategy:
+        - spfa_SSSP(): same distances as bellmanFord_SSSP with negative weights and no negative cycle,
+          unreachable vertices, negative cycle reachable from source (cycle is a closed negative walk of graph edges),
+          negative cycle not reachable from source, negative self loop
+    """
+
+    def assertNegativeCycle(self, G, cycle):
+        self.assertEqual(cycle[0], cycle[-1])
+        self.assertLess(sum(G.getWeight(cycle[i], cycle[i + 1]) for i in range(len(cycle) - 1)), 0)
+
+    def testMatchesBellmanFord(self):
+        for seed in range(5):
+            rng = random.Random(seed)
+            # Edges only go from lower to higher values, so negative weights can't form a cycle
+            G = Graph.fromEdgeList([(u, rng.randrange(u + 1, 31), rng.randrange(-10, 20))
+                                    for u in (rng.randrange(30) for _ in range(100))], vertices=range(31))
+            expected = G.bellmanFord_SSSP(Vertex(0))
+            cycle, d, p = G.spfa_SSSP(Vertex(0))
+            self.assertIsNone(cycle)
+            self.assertEqual(d, expected[1])
+            for v in p:
+                self.assertEqual(d[p[v]] + G.getWeight(p[v], v), d[v])
+
+    def testNegativeCycle(self):
+        a, b, c, d, e = Vertex("a"), Vertex("b"), Vertex("c"), Vertex("d"), Vertex("e")
+        cycleG = Graph()
+        cycleG.addEdge(a, b, 2)
+        cycleG.addEdge(d, a, 2)
+        cycleG.addEdge(a, c, -1)
+        cycleG.addEdge(c, e, -2)
+        cycleG.addEdge(e, a, 1)
+        cycle, dist, p = cycleG.spfa_SSSP(d)
+        self.assertEqual((dist, p), (None, None))
+        self.assertEqual(set(cycle), {a, c, e})
+        self.assertNegativeCycle(cycleG, cycle)
+
+        for seed in range(5):
+            rng = random.Random(seed)
+            G = Graph.fromEdgeList([(rng.randrange(20), rng.randrange(20), rng.randrange(-5, 20)) for _ in range(80)])
+            G.addEdges([(0, 1, 1), (1, 2, 1), (2, 0, -3)])
+            cycle, _, _ = G.spfa_SSSP(Vertex(0))
+            self.assertNegativeCycle(G, cycle)
+
+    def testUnreachableNegativeCycle(self):
+        G = Graph.fromEdgeList([(0, 1, 4), (2, 3, -1), (3, 2, -1)])
+        cycle, d, _ = G.spfa_SSSP(Vertex(0))
+        self.assertIsNone(cycle)
+        self.assertEqual(d, {Vertex(0): 0, Vertex(1): 4, Vertex(2): float('inf'), Vertex(3): float('inf')})
+
+    def testNegativeSelfLoop(self):
+        G = Graph.fromEdgeList([(0, 1, 1), (1, 1, -1)])
+        self.assertEqual(G.spfa_SSSP(Vertex(0))[0], [Vertex(1), Vertex(1)])
+
+class SSSPCacheTests(unittest.TestCase):
+    """
+    Testing Strategy:
+        - Graph.version: bumped by addEdge, addEdges, addVertex, __setitem__, markModified; not by queries
+        - query(): hit, miss, different algorithm/source, invalidated by a mutation, LRU eviction order,
+          unknown algorithm, every algorithm matches the uncached Graph method
+        - getStats()
+    """
+
+    def testVersion(self):
+        G = Graph()
+        versions = [G.version]
+        G.addEdge(0, 1, 2)
+        versions.append(G.version)
+        G.addEdges([(1, 2, 3)])
+        versions.append(G.version)
+        G.addVertex(5)
+        versions.append(G.version)
+        G[Vertex(5)] = {Vertex(0): 1}
+        versions.append(G.version)
+        G.markModified()
+        versions.append(G.version)
+        G.dijkstra_SSSP(Vertex(0))
+        G.bfs(Vertex(0), Vertex(2))
+        versions.append(G.version)
+        self.assertTrue(all(versions[i] < versions[i + 1] for i in range(5)))
+        self.assertEqual(versions[-1], versions[-2])
+
+    def testHitsAndInvalidation(self):
+        G = Graph.fromEdgeList([(0, 1, 4), (1, 2, 1), (0, 2, 7)])
+        cache = SSSPCache(G)
+        first = cache.dijkstra_SSSP(Vertex(0))
+        self.assertIs(cache.dijkstra_SSSP(Vertex(0)), first)
+        self.assertEqual(first, G.dijkstra_SSSP(Vertex(0)))
+        cache.bellmanFord_SSSP(Vertex(0))
+        cache.dijkstra_SSSP(Vertex(1))
+        self.assertEqual((cache.hits, cache.misses), (1, 3))
+
+        G.addEdge(0, 2, 1)
+        d, _ = cache.dijkstra_SSSP(Vertex(0))
+        self.assertEqual(d[Vertex(2)], 1)
+        stats = cache.getStats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["invalidations"], stats["size"]), (1, 4, 3, 1))
+        self.assertEqual(stats["hitRate"], 1 / 5)
+
+    def testEviction(self):
+        G = Graph.fromEdgeList([(i, i + 1, 1) for i in range(5)])
+        cache = SSSPCache(G, maxSize=2)
+        cache.dijkstra_SSSP(Vertex(0))
+        cache.dijkstra_SSSP(Vertex(1))
+        cache.dijkstra_SSSP(Vertex(0))  # 1 is now least recently used
+        cache.dijkstra_SSSP(Vertex(2))
+        self.assertEqual((len(cache), cache.evictions), (2, 1))
+        cache.dijkstra_SSSP(Vertex(0))
+        self.assertEqual(cache.hits, 2)
+        cache.dijkstra_SSSP(Vertex(1))
+        self.assertEqual(cache.misses, 4)
+        self.assertRaises(ValueError, SSSPCache, G, 0)
+        self.assertRaises(ValueError, cache.query, "floydWarshall", Vertex(0))
+
+    def testAlgorithmsMatch(self):
+        G = Graph.fromEdgeList([(0, 1, 3), (0, 2, -1), (2, 1, 2), (1, 3, 1)])
+        cache = SSSPCache(G)
+        self.assertEqual(cache.bellmanFord_SSSP(Vertex(0))[1], G.bellmanFord_SSSP(Vertex(0))[1])
+        self.assertEqual(cache.spfa_SSSP(Vertex(0))[1], G.spfa_SSSP(Vertex(0))[1])
+        self.assertEqual(cache.SSSPTopologicalRelaxation(Vertex(0)), {Vertex(0): 0, Vertex(1): 1, Vertex(2): -1,
+                                                                      Vertex(3): 2})
+
+class ParallelSSSPTests(unittest.TestCase):
+    """
+    Testing Strategy:
+        - dijkstraRows(): subset of sources, all sources (all-pairs), rows match dijkstra_SSSP, unreachable is inf
+        - dijkstraDistances(): Vertex-keyed result
+        - Negative weights rejected, graph with no edges
+    """
+
+    def testMatchesDijkstra(self):
+        rng = random.Random(0)
+        G = Graph.fromEdgeList([(rng.randrange(30), rng.randrange(30), rng.randrange(20)) for _ in range(90)],
+                               vertices=range(31))
+        with ParallelSSSP(G, processes=2) as engine:
+            vertices = engine.getVertices()
+            rows = dict(engine.dijkstraRows())
+            self.assertEqual(set(rows), set(vertices))
+            for s, row in rows.items():
+                self.assertEqual(dict(zip(vertices, row)), G.dijkstra_SSSP(s)[0])
+            distances = engine.dijkstraDistances([Vertex(0), Vertex(30)])
+        self.assertEqual(distances[Vertex(0)], G.dijkstra_SSSP(Vertex(0))[0])
+        self.assertEqual(distances[Vertex(30)][Vertex(0)], float('inf'))
+
+    def testEdgeCases(self):
+        self.assertRaises(ValueError, ParallelSSSP, Graph.fromEdgeList([(0, 1, -1)]), 1)
+        with ParallelSSSP(Graph.fromEdgeList([], vertices=[0]), processes=1) as engine:
+            self.assertEqual(engine.dijkstraDistances(), {Vertex(0): {Vertex(0): 0}})
+
+class AllPairsTests(unittest.TestCase):
+    """
+    Testing Strategy:
+        - floydWarshall()/johnson(): match bellmanFord_SSSP from every source, with and without negative weights,
+          unreachable pairs, graph smaller and larger than the block size, negative cycle raises
+        - allPairsShortestPaths(): dense and sparse graphs, empty graph
+    """
+
+    def assertMatchesBellmanFord(self, G, result):
+        distances = toDict(*result)
+        for s in G.getVertices():
+            _, expected, _ = G.bellmanFord_SSSP(s)
+            self.assertEqual(distances[s], expected)
+
+    def testMatchesBellmanFord(self):
+        for seed, lowest in ((0, 0), (1, -10)):
+            G = randomGraph(seed, 25, 120, (lowest, 20))
+            self.assertMatchesBellmanFord(G, floydWarshall(G, blockSize=4))
+            self.assertMatchesBellmanFord(G, floydWarshall(G))
+            self.assertMatchesBellmanFord(G, johnson(G))
+
+    def testNegativeCycle(self):
+        G = Graph.fromEdgeList([(0, 1, 1), (1, 2, -3), (2, 0, 1), (3, 0, 1)])
+        self.assertRaises(NegativeCycleException, floydWarshall, G)
+        with self.assertRaises(NegativeCycleException) as context:
+            johnson(G)
+        self.assertEqual(set(context.exception.cycle), {Vertex(0), Vertex(1), Vertex(2)})
+
+    def testAutomaticChoice(self):
+        dense = Graph.fromEdgeList([(u, v, abs(u - v)) for u in range(10) for v in range(10)])
+        sparse = randomGraph(2, 40, 60, (-5, 20))
+        self.assertMatchesBellmanFord(dense, allPairsShortestPaths(dense))
+        self.assertMatchesBellmanFord(sparse, allPairsShortestPaths(sparse))
+        vertices, D = allPairsShortestPaths(Graph())
+        self.assertEqual((vertices, len(D)), ([], 0))
+
+class EdgeListReaderTests(unittest.TestCase):
+    """
+    Testing Strategy:
+        - readEdgeChunks(): csv/tsv/whitespace, gzip, comments/blank lines/header, 2 and 3 fields, int/float/str
+          values, chunkSize smaller than/larger than the edge count, malformed line, progress callback
+        - loadGraph(): into a new and an existing Graph, repeated edge keeps the last weight
+        - CompactGraphBuilder/loadCompactGraph(): same graph as Graph.freeze(), mixed raw values and Vertices
+    """
+
+    def writeFile(self, tmp, contents, compress=False):
+        path = os.path.join(tmp, "edges")
+        with (gzip.open(path, "wt") if compress else open(path, "w")) as f:
+            f.write(contents)
+        return path
+
+    def testDelimiters(self):
+        expected = [(1, 2, 5), ("a", 3, 0.5), (3, 1, 0)]
+        files = {"csv": "1,2,5\na, 3,0.5\n3,1\n", "tsv": "1\t2\t5\na\t3\t0.5\n3\t1\n",
+                 "whitespace": "1 2   5\n a\t3 0.5\n3 1\n"}
+        with tempfile.TemporaryDirectory() as tmp:
+            for delimiter, contents in files.items():
+                for compress in (False, True):
+                    path = self.writeFile(tmp, contents, compress)
+                    edges = [e for chunk in readEdgeChunks(path, delimiter=delimiter) for e in chunk]
+                    self.assertEqual(edges, expected)
+
+    def testCommentsHeaderAndChunks(self):
+        contents = "# comment\nsrc,dst,w\n\n" + "".join("%d,%d,%d\n" % (i, i + 1, i) for i in range(10))
+        chunkSizes, reports = [], []
+        with tempfile.TemporaryDirectory() as tmp:
+            path = self.writeFile(tmp, contents)
+            for chunk in readEdgeChunks(path, delimiter="csv", chunkSize=4, skipHeader=True,
+                                        progress=lambda stats: reports.append(stats.edges)):
+                chunkSizes.append(len(chunk))
+            self.assertEqual(chunkSizes, [4, 4, 2])
+            self.assertEqual(reports, [4, 8, 10])
+            stats = IngestStats()
+            self.assertEqual(len(loadGraph(path, delimiter="csv", skipHeader=True, stats=stats).getEdges()), 10)
+            self.assertEqual((stats.edges, stats.lines, stats.bytesRead), (10, 13, len(contents)))
+
+    def testMalformedLine(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            for contents in ("1 2\n3\n", "1 2 3 4\n", "1 2 x\n"):
+                path = self.writeFile(tmp, contents)
+                self.assertRaises(EdgeListFormatException, loadGraph, path)
+
+    def testLoadGraph(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = self.writeFile(tmp, "1 2 3\n2 3 4\n1 2 7\n")
+            G = loadGraph(path, chunkSize=1)
+            self.assertEqual(G.getEdges(), {Vertex(1): {Vertex(2): 7}, Vertex(2): {Vertex(3): 4}})
+            H = Graph.fromEdgeList([(3, 4, 1)])
+            self.assertIs(loadGraph(path, H), H)
+            self.assertEqual(H.getWeight(Vertex(3), Vertex(4)), 1)
+            self.assertEqual(H.getWeight(Vertex(1), Vertex(2)), 7)
+
+    def testCompactGraphBuilder(self):
+        rng = random.Random(5)
+        edges = [(rng.randrange(30), rng.randrange(30), rng.randrange(-5, 50)) for _ in range(200)]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = self.writeFile(tmp, "".join("%d %d %d\n" % edge for edge in edges), compress=True)
+            C = loadCompactGraph(path, chunkSize=16)
+        G = Graph.fromEdgeList(edges)
+        self.assertEqual(C.numEdges(), G.freeze().numEdges())
+        for u in G.getEdges():
+            self.assertEqual({v: C.getWeight(u, v) for v in C.getChildren(u)}, G.getEdges()[u])
+
+        builder = CompactGraphBuilder()
+        builder.addVertex(Vertex("x"))
+        builder.addEdges([("x", 1), (Vertex(1), "x", 2.5)])
+        C = builder.build()
+        self.assertEqual((C.numVertices(), C.numEdges()), (2, 2))
+        self.assertEqual(C.weights.typecode, 'd')
+        self.assertEqual(C.getWeight(Vertex(1), Vertex("x")), 2.5)
+
+class GraphBenchmarksTests(unittest.TestCase):
+    """
+    Testing Strategy:
+        - generators: reproducible for a seed, expected vertex/edge counts, no self loops, layered DAG is acyclic,
+          G(n,p) with p = 0 and p = 1, flow networks keep every edge, antiparallel ones too
+        - compareResults(): slower/more memory past the threshold, within the threshold, missing from baseline
+    """
+
+    def testGenerators(self):
+        self.assertEqual(gnpEdgeList(200, 0.05, seed=1), gnpEdgeList(200, 0.05, seed=1))
+        self.assertEqual(gnpEdgeList(50, 0), [])
+        complete = gnpEdgeList(6, 1)
+        self.assertEqual(sorted((u, v) for u, v, _ in complete), [(u, v) for u in range(6) for v in range(6) if u != v])
+        edges = gnpEdgeList(300, 0.1)
+        self.assertTrue(all(u != v for u, v, _ in edges))
+        self.assertEqual(len({(u, v) for u, v, _ in edges}), len(edges))
+        self.assertLess(abs(len(edges) - 0.1 * 300 * 299), 0.1 * 0.1 * 300 * 299)
+
+        edges = powerLawEdgeList(500, degree=3)
+        self.assertEqual(len({u for u, _, _ in edges} | {v for _, v, _ in edges}), 500)
+        self.assertTrue(all(u > v for u, v, _ in edges))
+
+        G = Graph.fromEdgeList(layeredDAGEdgeList(5, 10, degree=3))
+        self.assertEqual(sum(len(children) for children in G.edges.values()), 120)
+        self.assertEqual(len(G.stronglyConnectedComponents()[1]), len(G.vertices))
+
+        F = bipartiteFlowNetwork(10, 10, 1.0)
+        self.assertEqual(F.getMaxFlow(), 10)
+        edges = gnpEdgeList(20, 0.5)
+        capacities = denseFlowNetwork(20).capacityGraph.edges
+        self.assertEqual(sum(len(children) for children in capacities.values()), len(edges))
+        self.assertTrue(any(u in capacities.get(v, {}) for u in capacities for v in capacities[u]))
+        self.assertEqual(layeredFlowNetwork(4, 8).getMaxFlow(), layeredFlowNetwork(4, 8).getMaxFlow("pushRelabel"))
+
+    def testCompareResults(self):
+        result = lambda algorithm, seconds, memory: {"generator": "grid", "size": "small", "algorithm": algorithm,
+                                                     "seconds": seconds, "peakMemoryBytes": memory}
+        baseline = [result("bfs", 1.0, 100), result("dijkstra", 1.0, 100)]
+        results = [result("bfs", 1.2, 200), result("dijkstra", 2.0, None), result("mst", 5.0, 100)]
+        self.assertEqual(compareResults(baseline, results),
+                         [("grid", "small", "bfs", "peakMemoryBytes", 100, 200),
+                          ("grid", "small", "dijkstra", "seconds", 1.0, 2.0)])
+        self.assertEqual(compareResults(baseline, results, threshold=3), [])
+
+class GraphFileTests(unittest.TestCase):
+    """
+    Testing Strategy:
+        - writeGraph()/readGraph(): empty graph, int/float/large weights, isolated vertices, tuple/str/int vertex values
+        - MappedGraph: getChildren/getWeight/__contains__ without a full load, toCompactGraph, not a graph file
+            - getId(): binary search over mixed vertex values, missing vertices before/between/after all of them,
+              numbers of another type than written (1.0/True for 1, 2 for 2.0, inside tuples too)
+        - Graph.serialize()/deserialize(): JSON round trip keeps weights
+    """
+
+    def roundTrip(self, G):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "graph.csrg")
+            writeGraph(G, path)
+            return readGraph(path)
+
+    def assertSameGraph(self, G, H):
+        self.assertEqual(G.getVertices().union(G.getEdges()), H.getVertices().union(H.getEdges()))
+        self.assertEqual({u: children for u, children in G.getEdges().items() if children}, H.getEdges())
+
+    def testRoundTripEmpty(self):
+        self.assertSameGraph(Graph(), self.roundTrip(Graph()))
+
+    def testRoundTripWeights(self):
+        for weights in ([3, -7, 0], [0.5, 2, -1.25], [2 ** 40, -2 ** 40, 1]):
+            G = Graph.fromEdgeList([(0, 1, weights[0]), (1, 2, weights[1]), (2, 0, weights[2])], vertices=[5])
+            H = self.roundTrip(G)
+            self.assertSameGraph(G, H)
+            self.assertEqual(H.getWeight(Vertex(1), Vertex(2)), weights[1])
+
+    def testRoundTripVertexValues(self):
+        G = Graph.fromEdgeList([((0, 1), "a", 1), ("a", 3, 2), (3, ((1, 2), "b"), 4), ("\u00e9", (0, 1), 0)])
+        self.assertSameGraph(G, self.roundTrip(G))
+
+    def testMappedQueries(self):
+        rng = random.Random(3)
+        G = Graph.fromEdgeList([(rng.randrange(30), rng.randrange(30), rng.randrange(50)) for _ in range(120)])
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "graph.csrg")
+            writeGraph(G, path)
+            with MappedGraph(path) as M:
+                self.assertEqual(M.numEdges(), sum(len(children) for children in G.getEdges().values()))
+                self.assertNotIn(Vertex(30), M)
+                for u in G.getEdges():
+                    self.assertEqual(set(M.getChildren(u)), set(G.getChildren(u)))
+                    for v in G.getChildren(u):
+                        self.assertEqual(M.getWeight(u, v), G.getWeight(u, v))
+                C = M.toCompactGraph()
+            d, _ = G.dijkstra_SSSP(Vertex(0))
+            self.assertEqual(C.dijkstra_SSSP(Vertex(0))[0], d)
+
+    def testMappedGetId(self):
+        G = Graph.fromEdgeList([((0, 1), "a", 1), ("a", 3, 2), (3, ((1, 2), "b"), 4), ("\u00e9", (0, 1), 0)],
+                               vertices=range(10, 40, 3))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "graph.csrg")
+            writeGraph(G, path)
+            with MappedGraph(path) as M:
+                for i in range(M.numVertices()):
+                    self.assertEqual(M.getId(M.getVertex(i)), i)
+                for missing in (Vertex(0), Vertex("b"), Vertex((0, 2)), Vertex(100), "a"):
+                    self.assertNotIn(missing, M)
+                    self.assertRaises(ValueError, M.getId, missing)
+
+    def testMappedGetIdNormalizesNumbers(self):
+        G = Graph.fromEdgeList([(1, 2.0, 1), ((0, 1), "x", 2), (2.5, False, 3)])
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "graph.csrg")
+            writeGraph(G, path)
+            with MappedGraph(path) as M:
+                for written, other in ((1, 1.0), (1, True), (2.0, 2), ((0, 1), (0.0, True)), (False, 0), (2.5, 2.5)):
+                    self.assertEqual(M.getId(Vertex(other)), M.getId(Vertex(written)))
+                self.assertNotIn(Vertex(1.5), M)
+
+    def testNotAGraphFile(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            for contents in (b"", b"{}", b"\0" * 200):
+                path = os.path.join(tmp, "bad")
+                with open(path, "wb") as f:
+                    f.write(contents)
+                self.assertRaises(GraphFileException, MappedGraph, path)
+
+    def testJSONRoundTrip(self):
+        G = Graph.fromEdgeList([("a", "b", 3), ("b", "c", -2)])
+        self.assertSameGraph(G, Graph.deserialize(G.serialize()))
+
+class CompactGraphTests(unittest.TestCase):
+    """
+    Testing Strategy:
+        - freeze(): vertex/edge counts match, isolated vertices and edge-only endpoints are interned
+        - bfs()/dfs(): path exists, no path
+        - dijkstra_SSSP(): same distances as Graph, negative weights rejected
+        - bellmanFord_SSSP(): no negative cycle (same distances), negative cycle reachable from source
+    """
+
+    def generateGraph(self):
+        a, b, c, d, e = Vertex("a"), Vertex("b"), Vertex("c"), Vertex("d"), Vertex("e")
+        G = Graph()
+        G.addEdge(a, b, 3)
+        G.addEdge(a, c, 1)
+        G.addEdge(c, b, 1)
+        G.addEdge(b, d, 4)
+        G.addEdge(c, e, 5)
+        G.addEdge(d, e, 4)
+        G.addVertex("f")
+        return G
+
+    def testFreeze(self):
+        G = self.generateGraph()
+        C = G.freeze()
+        self.assertEqual(C.numVertices(), 6)
+        self.assertEqual(C.numEdges(), 6)
+        self.assertEqual(set(C.getChildren(Vertex("c"))), {Vertex("b"), Vertex("e")})
+        self.assertEqual(C.getWeight(Vertex("d"), Vertex("e")), 4)
+        self.assertIn(Vertex("f"), C)
+
+    def testBfsDfs(self):
+        C = self.generateGraph().freeze()
+        a, e, f = Vertex("a"), Vertex("e"), Vertex("f")
+        self.assertEqual(C.bfs(a, e), [a, Vertex("c"), e])
+        path = C.dfs(a, e)
+        self.assertEqual((path[0], path[-1]), (a, e))
+        self.assertIsNone(C.bfs(a, f))
+        self.assertIsNone(C.dfs(a, f))
+
+    def testDijkstraMatchesGraph(self):
+        G = self.generateGraph()
+        a = Vertex("a")
+        d, p = G.dijkstra_SSSP(a)
+        cd, cp = G.freeze().dijkstra_SSSP(a)
+        self.assertEqual(d, cd)
+        self.assertEqual(cp[Vertex("b")], Vertex("c"))
+
+    def testDijkstraNegativeWeight(self):
+        G = Graph()
+        G.addEdge(1, 2, -1)
+        self.assertRaises(ValueError, G.freeze().dijkstra_SSSP, Vertex(1))
+
+    def testBellmanFord(self):
+        G = self.generateGraph()
+        a = Vertex("a")
+        cycle, d, p = G.freeze().bellmanFord_SSSP(a)
+        self.assertIsNone(cycle)
+        self.assertEqual(d, G.dijkstra_SSSP(a)[0])
+
+        a, b, c, d, e = Vertex("a"), Vertex("b"), Vertex("c"), Vertex("d"), Vertex("e")
+        cycleG = Graph()
+        cycleG.addEdge(a, b, 2)
+        cycleG.addEdge(d, a, 2)
+        cycleG.addEdge(a, c, -1)
+        cycleG.addEdge(c, e, -2)
+        cycleG.addEdge(e, a, 1)
+        cycle, _, _ = cycleG.freeze().bellmanFord_SSSP(d)
+        self.assertEqual(cycle[0], cycle[-1])
+        self.assertEqual(set(cycle), {a, c, e})
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,156 @@
+import random
+import unittest
+from Topological_Sort import *
+from SSSPCache import SSSPCache
+
+class TopologicalSortTests(unittest.TestCase):
+    """
+    Testing Strategy:
+        - topological_sort(): every edge (u, v) has u before v, disconnected DAG, cycle raises
+        - topological_levels(): no edges within a level, level of v is one more than its deepest parent,
+          only vertices reachable from source when specified
+        - topological_order(): lazy, consuming a prefix doesn't raise even if there is a cycle later on
+        - Deep DAG (longer than the recursion limit)
+        - SSSPTopologicalRelaxation()/SSlongestPathDAG(): cycle reachable from source raises
+    """
+
+    def assertTopologicalOrder(self, G, order):
+        position = {v: i for i, v in enumerate(order)}
+        self.assertEqual(len(position), len(order))
+        for u in G.edges:
+            for v in G.edges[u]:
+                self.assertLess(position[u], position[v])
+
+    def testTopologicalSort(self):
+        G = Graph.fromEdgeList([(0, 5), (1, 3), (1, 0), (2, 4), (3, 2), (6, 7)])
+        order = topological_sort(G)
+        self.assertEqual(sorted(order), list(range(8)))
+        self.assertTopologicalOrder(G, [Vertex(x) for x in order])
+
+    def testCycleRaises(self):
+        G = Graph.fromEdgeList([(0, 1), (1, 2), (2, 1), (3, 0)])
+        self.assertRaises(CycleDetectedException, topological_sort, G)
+        self.assertRaises(CycleDetectedException, topological_sort_SS, G, Vertex(0))
+        G.addEdge(4, 5)
+        self.assertEqual(topological_sort_SS(G, Vertex(4)), [Vertex(4), Vertex(5)])
+
+    def testLevels(self):
+        G = Graph.fromEdgeList([("a", "b"), ("a", "c"), ("b", "d"), ("c", "d"), ("d", "e"), ("a", "e"), ("f", "c")])
+        levels = [set(level) for level in topological_levels(G)]
+        self.assertEqual(levels, [{Vertex("a"), Vertex("f")}, {Vertex("b"), Vertex("c")}, {Vertex("d")}, {Vertex("e")}])
+        levels = [set(level) for level in topological_levels(G, Vertex("c"))]
+        self.assertEqual(levels, [{Vertex("c")}, {Vertex("d")}, {Vertex("e")}])
+
+    def testLazyPrefix(self):
+        G = Graph.fromEdgeList([(0, 1), (1, 2), (2, 3), (3, 2)])
+        order = topological_order(G)
+        self.assertEqual([next(order), next(order)], [Vertex(0), Vertex(1)])
+        self.assertRaises(CycleDetectedException, list, order)
+
+    def testDeepDAG(self):
+        n = 50000
+        G = Graph.fromEdgeList([(i, i + 1, 1) for i in range(n)])
+        self.assertEqual(topological_sort(G), list(range(n + 1)))
+        self.assertEqual(SSSPTopologicalRelaxation(G, Vertex(0))[Vertex(n)], n)
+
+    def testShortestAndLongestPaths(self):
+        a, b, c, d, e = Vertex("a"), Vertex("b"), Vertex("c"), Vertex("d"), Vertex("e")
+        g = Graph.fromEdgeList([(a, b, 1), (a, c, -1), (b, d, 4), (b, c, 2), (c, d, 5), (a, e, 10), (e, d, -7)])
+        self.assertEqual(SSSPTopologicalRelaxation(g, a), {a: 0, b: 1, c: -1, d: 3, e: 10})
+        self.assertEqual(SSlongestPathDAG(g, a), {a: 0, b: 1, c: 3, d: 8, e: 10})
+        g.addEdge(d, a, 4)
+        self.assertRaises(CycleDetectedException, SSSPTopologicalRelaxation, g, a)
+        self.assertRaises(CycleDetectedException, SSlongestPathDAG, g, a)
+
+class DynamicTopologicalOrderTests(unittest.TestCase):
+    """
+    Testing Strategy:
+        - Constructor: empty graph, existing DAG, existing graph with a cycle
+        - addEdge(): edge already consistent with order, edge forcing a reorder, new vertices, self loop,
+          edge closing a cycle or self loop on a new vertex (rejected, graph, version and order unchanged), random insertion sequences stay valid
+        - SSSPTopologicalRelaxation()/SSlongestPathDAG() with a maintained order match the re-sorting versions
+        - addVertex()/addEdge() invalidate an SSSPCache over the same graph
+    """
+
+    def assertValidOrder(self, D):
+        order = D.getOrder()
+        self.assertEqual(set(order), D.graph.getVertices())
+        for i, v in enumerate(order):
+            self.assertEqual(D.getPosition(v), i)
+        for u in D.graph.getEdges():
+            for v in D.graph[u]:
+                self.assertLess(D.getPosition(u), D.getPosition(v))
+
+    def testConstructor(self):
+        self.assertEqual(DynamicTopologicalOrder().getOrder(), [])
+        D = DynamicTopologicalOrder(Graph.fromEdgeList([(2, 1), (1, 0)]))
+        self.assertEqual(D.getOrder(), [Vertex(2), Vertex(1), Vertex(0)])
+        D.addEdge(0, 3)
+        self.assertIsNone(D.graph.reverseEdges)  # Keeps its own in-edges rather than the graph's reverse index
+        self.assertRaises(CycleDetectedException, DynamicTopologicalOrder, Graph.fromEdgeList([(0, 1), (1, 0)]))
+
+    def testReorder(self):
+        D = DynamicTopologicalOrder()
+        D.addEdge(0, 1)
+        D.addEdge(2, 3)
+        D.addEdge(3, 0)  # 3 was after 0, so 2 and 3 must move in front of 0 and 1
+        self.assertValidOrder(D)
+        self.assertRaises(CycleDetectedException, D.addEdge, 1, 2)
+        self.assertRaises(CycleDetectedException, D.addEdge, 4, 4)
+        self.assertNotIn(Vertex(2), D.graph[Vertex(1)])
+        self.assertValidOrder(D)
+
+    def testRejectedEdgeLeavesGraphUnchanged(self):
+        D = DynamicTopologicalOrder(Graph.fromEdgeList([(0, 1), (1, 2)]))
+        edges, vertices = {u: dict(children) for u, children in D.graph.edges.items()}, set(D.graph.getVertices())
+        version, order = D.graph.version, list(D.getOrder())
+        for u, v in [(2, 0), (5, 5), (1, 1)]:
+            self.assertRaises(CycleDetectedException, D.addEdge, u, v)
+            self.assertEqual(D.graph.edges, edges)
+            self.assertEqual(D.graph.getVertices(), vertices)
+            self.assertEqual(D.graph.version, version)
+            self.assertEqual(D.getOrder(), order)
+
+    def testNewTailVertex(self):
+        D = DynamicTopologicalOrder(Graph.fromEdgeList([(0, 1), (1, 2)]))
+        D.addEdge(3, 1)  # 3 is new and appended after 1 and 2, which must then move behind it
+        self.assertValidOrder(D)
+        self.assertLess(D.getPosition(Vertex(0)), D.getPosition(Vertex(1)))
+
+    def testRandomInsertions(self):
+        rng = random.Random(0)
+        D = DynamicTopologicalOrder()
+        for _ in range(400):
+            u, v = Vertex(rng.randrange(40)), Vertex(rng.randrange(40))
+            createsCycle = u == v or (v in D.graph.getVertices() and u in D.graph.bfsTree([v])[0])
+            if createsCycle:
+                self.assertRaises(CycleDetectedException, D.addEdge, u, v)
+            else:
+                D.addEdge(u, v, rng.randrange(-5, 10))
+            self.assertValidOrder(D)
+
+    def testPathsWithMaintainedOrder(self):
+        rng = random.Random(1)
+        D = DynamicTopologicalOrder()
+        for _ in range(200):
+            try:
+                D.addEdge(rng.randrange(30), rng.randrange(30), rng.randrange(-5, 10))
+            except CycleDetectedException:
+                pass
+        s = D.getOrder()[0]
+        self.assertEqual(SSSPTopologicalRelaxation(D.graph, s, D.getOrder()), SSSPTopologicalRelaxation(D.graph, s))
+        self.assertEqual(SSlongestPathDAG(D.graph, s, D.getOrder()), SSlongestPathDAG(D.graph, s))
+
+    def testSSSPCacheInvalidation(self):
+        D = DynamicTopologicalOrder(Graph.fromEdgeList([(0, 1, 2)]))
+        cache = SSSPCache(D.graph)
+        self.assertNotIn(Vertex(2), cache.dijkstra_SSSP(Vertex(0))[0])
+        D.addVertex(2)
+        self.assertEqual(cache.dijkstra_SSSP(Vertex(0))[0][Vertex(2)], float('inf'))
+        D.addEdge(1, 2, 3)
+        self.assertEqual(cache.SSSPTopologicalRelaxation(Vertex(0))[Vertex(2)], 5)
+        self.assertEqual(cache.dijkstra_SSSP(Vertex(0))[0][Vertex(2)], 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -244,7 +244,8 @@ def generateMidnightsFlowNetwork(dayToMidnights: dict,
 
     return G
 
-def generateMinCostMaxFlowAssignments(G: FlowNetwork, people: list, midnightPointValues: dict, outPath: str):
+def generateMinCostMaxFlowAssignments(G: FlowNetwork, people: list, midnightPointValues: dict, outPath: str,
+                                      algorithm: str = "networkSimplex"):
     """
     Finds the min-cost max flow given a Flow Network, G, and writes the results to a JSON file w format:
         "cost": min cost max flow total cost
@@ -255,8 +256,9 @@ def generateMinCostMaxFlowAssignments(G: FlowNetwork, people: list, midnightPoin
     @param people: list of people
     @param midnightPointValues: mapping of midnights to their corresponding point values
     @param outPath: path to output file - output file will be created/overwritten
+    @param algorithm: min cost flow algorithm, see FlowNetwork.getMinCostMaxFlow
     """
-    cost, maxFlow = G.getMinCostMaxFlow()
+    cost, maxFlow = G.getMinCostMaxFlow(algorithm=algorithm)
     peopleMidnightMap = getMidnightAssignments(G, people)
     dayToMidnightAssignmentsMap = getPeopleMidnightsToDayAssignments(peopleMidnightMap)
     peoplePointsGain = getPeoplePointsGain(dayToMidnightAssignmentsMap, midnightPointValues)